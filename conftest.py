@@ -1,42 +1,427 @@
+import functools
+import glob
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 import allure
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+
+# Браузерный стек (Selenium, webdriver_manager, страницы) импортируется внутри фикстур,
+# поэтому запуск только юнит-тестов его не загружает
+from utils.allure_results import merge_results
+from utils.config import get_base_url, set_base_url
+from utils.data_pool import DEFAULT_SEED, DEFAULT_SIZE
+from utils.dependency_index import affected_tests
+from utils.duration_db import DEFAULT_THRESHOLD, DEFAULT_WINDOW, HISTORY_FILE, DurationHistoryPlugin, \
+    load_history_durations, top_level_steps
+from utils.failure_artifacts import IMAGE_FORMATS, failure_artifacts
+from utils.logger import ensure_logger
+from utils.profiler import ProfileSummary, profiler
+from utils.reporting import FULL, STEP_MODES, set_step_mode
+from utils.retry import configure as configure_retries, retry_budget, retry_policy
+from utils.scheduling import balance_groups, expected_duration
+from utils.wait_stats import WaitStats, timeout_profile, wait_stats
+from utils.workers import get_worker_id, is_xdist_worker, worker_file_name
+
+WAIT_STATS_FILE = os.path.join("logs", "wait_stats.json")
+PROFILE_FILE = os.path.join("logs", "profile.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("driver pool")
+    group.addoption("--driver-pool-size", type=int, default=1,
+                    help="Количество теплых браузеров в пуле на один процесс")
+    group.addoption("--driver-max-uses", type=int, default=50,
+                    help="Количество тестов, после которого браузер из пула пересоздается")
+    group.addoption("--lean-browser", action="store_true", default=False,
+                    help="Запускать все тесты в облегченном профиле браузера (см. маркер lean)")
+
+    group = parser.getgroup("application")
+    group.addoption("--app-url", default=None,
+                    help="Базовый URL тестируемого приложения (по умолчанию https://www.saucedemo.com/)")
+    group.addoption("--stand-in", action="store_true", default=False,
+                    help="Запустить локальную копию SauceDemo и тестировать ее вместо публичного сайта")
+
+    group = parser.getgroup("parallel run")
+    group.addoption("--balance-durations", action="store_true", default=False,
+                    help="При запуске с -n распределять тесты по воркерам по ожидаемой длительности")
+    group.addoption("--slowest-first", action="store_true", default=False,
+                    help="Запускать тесты от самых долгих по истории прогонов к самым быстрым")
+    group.addoption("--regression-threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="Замедление теста или шага относительно медианы прошлых прогонов, "
+                         "после которого выводится регрессия (0.3 = на 30%%)")
+    group.addoption("--regression-window", type=int, default=DEFAULT_WINDOW,
+                    help="Сколько последних прогонов учитывать в базовой длительности")
+
+    group = parser.getgroup("failure artifacts")
+    group.addoption("--screenshot-format", choices=sorted(IMAGE_FORMATS), default="jpeg",
+                    help="Формат скриншотов при падении (jpeg и webp требуют Pillow, иначе сохраняется png)")
+    group.addoption("--screenshot-quality", type=int, default=70,
+                    help="Качество сжатия скриншотов при падении от 1 до 100")
+
+    group = parser.getgroup("allure")
+    group.addoption("--allure-steps", choices=STEP_MODES, default=FULL,
+                    help="Детализация шагов отчета: minimal скрывает низкоуровневые шаги BasePage")
+    group.addoption("--allure-worker-dirs", action="store_true", default=False,
+                    help="При запуске с -n каждый воркер пишет результаты Allure в свой каталог, "
+                         "которые объединяются в --alluredir в конце сессии")
+
+    group = parser.getgroup("waits")
+    group.addoption("--wait-profile", default=None,
+                    help="JSON-файл с таймаутами ожиданий для страниц и локаторов")
+    group.addoption("--retry-attempts", type=int, default=retry_policy.attempts,
+                    help="Попыток взаимодействия с элементом при устаревшем или перекрытом элементе")
+    group.addoption("--retry-budget", type=float, default=retry_policy.budget,
+                    help="Общий бюджет времени на повторы взаимодействий за тест, сек")
+    group.addoption("--affected-since", default=None, metavar="REV",
+                    help="Запустить только тесты, затронутые изменениями страниц и тестов с ревизии git")
+    group.addoption("--data-seed", type=int, default=DEFAULT_SEED,
+                    help="Seed генератора тестовых данных; тот же seed воспроизводит те же данные")
+    group.addoption("--data-pool-size", type=int, default=DEFAULT_SIZE,
+                    help="Количество заранее сгенерированных записей тестовых данных")
+
+
+def pytest_configure(config):
+    config._driver_pools = {}
+    if config.getoption("--app-url"):
+        set_base_url(config.getoption("--app-url"))
+    if config.getoption("--wait-profile"):
+        timeout_profile.load(config.getoption("--wait-profile"))
+    failure_artifacts.configure(config.getoption("--screenshot-format"), config.getoption("--screenshot-quality"))
+    set_step_mode(config.getoption("--allure-steps"))
+    configure_retries(config.getoption("--retry-attempts"), config.getoption("--retry-budget"))
+    if is_xdist_worker():
+        if config.option.allure_report_dir and config.getoption("--allure-worker-dirs"):
+            # Свой каталог воркера очищается при старте и переносится в общий в конце сессии
+            config.option.allure_report_dir = _allure_worker_dir(config.option.allure_report_dir, get_worker_id())
+            config.option.clean_alluredir = True
+        else:
+            # Каталог allure-results уже очищен главным процессом; воркеры пишут в него файлы
+            # с уникальными именами и не должны удалять результаты друг друга
+            config.option.clean_alluredir = False
+        return
+    config.pluginmanager.register(
+        DurationHistoryPlugin(str(config.rootpath / HISTORY_FILE), config.getoption("--regression-window"),
+                              config.getoption("--regression-threshold")), "duration_history")
+    for path in glob.glob(_worker_files_pattern(WAIT_STATS_FILE)) + glob.glob(_worker_files_pattern(PROFILE_FILE)):
+        os.remove(path)
+    if config.getoption("--balance-durations") and config.getoption("numprocesses", None):
+        # Группы из pytest_collection_modifyitems раздаются воркерам целиком
+        config.option.dist = "loadgroup"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Хук для отбора тестов, затронутых изменениями (--affected-since), порядка от самых долгих тестов
+    (--slowest-first) и группировки тестов по ожидаемой длительности, чтобы воркеры заканчивали одновременно.
+    """
+    if config.getoption("--affected-since"):
+        _deselect_unaffected(config, items)
+    balance = getattr(config.option, "loadgroup", False)
+    if not balance and not config.getoption("--slowest-first"):
+        return
+    durations = load_history_durations(str(config.rootpath / HISTORY_FILE), config.getoption("--regression-window"))
+    if config.getoption("--slowest-first"):
+        items.sort(key=lambda item: -expected_duration(item, durations))
+    if not balance:
+        return
+    workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    groups = balance_groups({item.nodeid: expected_duration(item, durations) for item in items}, workers)
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(f"balanced_{groups[item.nodeid]}"))
+
+
+def _deselect_unaffected(config, items):
+    """
+    Оставляет только тесты, зависящие от страниц, методов и локаторов, измененных с ревизии.
+    Тесты, которых нет в графе зависимостей, не отбрасываются.
+    """
+    rev = config.getoption("--affected-since")
+    try:
+        affected, index = affected_tests(str(config.rootpath), rev)
+    except subprocess.CalledProcessError as e:
+        raise pytest.UsageError(f"--affected-since: не удалось получить изменения с {rev}: {e.stderr.strip()}")
+    except SyntaxError:
+        # Исходник не разбирается: ошибку покажет импорт модуля, отбор тестов не выполняется
+        return
+    if affected is None:
+        return
+    selected, deselected = [], []
+    for item in items:
+        # Параметризованные тесты индексируются по имени функции
+        nodeid = item.nodeid.split("[", 1)[0]
+        (deselected if nodeid in index["tests"] and nodeid not in affected else selected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.fixture(scope="session")
+def base_url(request):
+    """
+    Фикстура базового URL приложения. С опцией --stand-in один раз за сессию (на воркер)
+    запускает локальную копию SauceDemo на свободном порту.
+    """
+    ensure_logger()
+    if not request.config.getoption("--stand-in"):
+        yield get_base_url()
+        return
+
+    from utils.stand_in.server import StandInServer
+
+    server = StandInServer().start()
+    set_base_url(server.url)
+
+    yield server.url
+
+    server.stop()
+
+
+def _driver_pool_fixture(request, lean):
+    from utils.browser import create_chrome_driver
+    from utils.driver_pool import DriverPool
+
+    # Отдельный каталог профилей Chrome на каждый воркер
+    profile_root = tempfile.mkdtemp(prefix=f"chrome-profiles-{get_worker_id()}-")
+    pool = DriverPool(functools.partial(create_chrome_driver, profile_root=profile_root, lean=lean),
+                      size=request.config.getoption("--driver-pool-size"),
+                      max_uses=request.config.getoption("--driver-max-uses"))
+    request.config._driver_pools["lean" if lean else "default"] = pool
+
+    yield pool
+
+    pool.close()
+    shutil.rmtree(profile_root, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, base_url):
+    """
+    Фикстура пула браузеров, общего для всей сессии (или для воркера xdist).
+    """
+    yield from _driver_pool_fixture(request, lean=False)
+
+
+@pytest.fixture(scope="session")
+def lean_driver_pool(request, base_url):
+    """
+    Фикстура пула браузеров в облегченном профиле: без картинок, шрифтов, аналитики
+    и фоновых служб Chrome, с eager-загрузкой страниц.
+    """
+    yield from _driver_pool_fixture(request, lean=True)
+
 
 @pytest.fixture(scope="function")
-def driver():
-    """
-    Фикстура для создания и закрытия экземпляра веб-драйвера.
-    """
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    
-    # Используем webdriver_manager для автоматической установки драйвера
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    
+def driver(request):
+    """
+    Фикстура, выдающая тесту браузер из пула и возвращающая его в пул после теста.
+    Облегченный браузер выдается при опции --lean-browser или маркере lean.
+    """
+    from pages.registry import page_registry
+
+    lean = request.config.getoption("--lean-browser") or request.node.get_closest_marker("lean") is not None
+    pool = request.getfixturevalue("lean_driver_pool" if lean else "driver_pool")
+    driver = pool.acquire()
+
     yield driver
-    
-    driver.quit()
+
+    # Страницы и кэши элементов не переходят к следующему тесту на этом браузере
+    page_registry(driver).reset()
+    pool.release(driver)
+
+
+@pytest.fixture(scope="function")
+def pages(driver):
+    """
+    Фикстура реестра страниц: страницы создаются при первом обращении (pages.get(CartPage))
+    и переиспользуются в пределах теста.
+    """
+    from pages.registry import page_registry
+
+    return page_registry(driver)
+
+
+@pytest.fixture(scope="function")
+def fast_login(driver):
+    """
+    Фикстура быстрого входа без UI. Возвращает функцию, принимающую имя пользователя
+    (по умолчанию standard_user) и пароль. Сессия каждого пользователя снимается один раз
+    за процесс и затем переносится в браузер через cookies и localStorage.
+    """
+    from pages.login_page import LoginPage
+    from pages.registry import page_registry
+
+    def login(username="standard_user", password=LoginPage.DEFAULT_PASSWORD):
+        page_registry(driver).get(LoginPage).fast_login(username, password)
+
+    return login
+
+
+@pytest.fixture(scope="session")
+def user_data_pool(request):
+    """
+    Фикстура пула данных пользователей. Записи генерируются один раз за сессию.
+    """
+    from utils.data_pool import UserDataPool
+
+    return UserDataPool(request.config.getoption("--data-seed"), request.config.getoption("--data-pool-size"))
+
+
+@pytest.fixture(scope="function")
+def user_data(request, user_data_pool):
+    """
+    Фикстура данных пользователя для чекаута. Запись закреплена за тестом по его nodeid,
+    поэтому при том же seed тест получает те же данные независимо от порядка и воркера.
+    """
+    return user_data_pool.for_key(request.node.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Хук для профилирования вызовов страниц в теле теста. Дерево вызовов с длительностями
+    и сводка по методам и локаторам прикладываются к отчету Allure в формате JSON,
+    а суммарное время каждого шага страницы, вызванного из тела теста, попадает в историю длительностей.
+    Профилируются только тесты с настоящим браузером (фикстура driver): вызовы страниц
+    с поддельными драйверами в unit-тестах не попадают ни в профиль сессии, ни в историю.
+    """
+    if "driver" not in item.fixturenames:
+        yield
+        return
+    profiler.start_test()
+
+    yield
+
+    profile = profiler.finish_test()
+    item._step_durations = top_level_steps(profile["tree"])
+    if profile["tree"]:
+        allure.attach(json.dumps(profile, indent=2, ensure_ascii=False),
+                      name="profile", attachment_type=allure.attachment_type.JSON)
+
+
+def pytest_runtest_setup(item):
+    """
+    Хук для сброса артефактов падения и бюджета повторов перед каждым тестом.
+    """
+    failure_artifacts.start_test()
+    retry_budget.start_test()
+
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
-    Хук для добавления скриншота в отчет Allure при падении теста.
+    Хук для снятия артефактов падения: скриншота, DOM и логов консоли браузера.
+    Если страница уже сняла их при ошибке ожидания, повторно они не снимаются.
+    Длительности шагов страниц и признак теста с браузером прикладываются к отчету,
+    чтобы при запуске через xdist они дошли до истории длительностей в главном процессе.
     """
     outcome = yield
     rep = outcome.get_result()
+    if rep.when == 'call':
+        rep.step_durations = getattr(item, "_step_durations", {})
+        rep.uses_driver = "driver" in item.fixturenames
     if rep.when == 'call' and rep.failed:
-        try:
-            driver = item.funcargs['driver']
-            allure.attach(driver.get_screenshot_as_png(),
-                          name='screenshot_on_failure',
-                          attachment_type=allure.attachment_type.PNG)
-        except Exception as e:
-            print(f"Failed to take screenshot: {e}")
+        driver = item.funcargs.get('driver')
+        if driver is not None:
+            failure_artifacts.capture(driver, 'screenshot_on_failure')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    """
+    Хук для записи артефактов падения в отчет Allure одной пачкой в конце теста.
+    Тест в отчете еще открыт, поэтому вложения попадают в него.
+    """
+    yield
+
+    failure_artifacts.flush()
+
+
+def _allure_worker_dir(report_dir, worker_id):
+    return f"{os.path.normpath(report_dir)}-{worker_id}"
+
+
+def _worker_files_pattern(file_name):
+    root, ext = os.path.splitext(file_name)
+    return f"{root}_gw*{ext}"
+
+
+def _merged_profile():
+    """
+    Объединяет профиль текущего процесса с профилями, выгруженными воркерами xdist.
+    :return: ProfileSummary
+    """
+    summary = ProfileSummary()
+    summary.merge(profiler.session.to_dict(samples=True))
+    for path in glob.glob(_worker_files_pattern(PROFILE_FILE)):
+        with open(path, encoding="utf-8") as f:
+            summary.merge(json.load(f))
+    return summary
+
+
+def pytest_sessionfinish(session):
+    """
+    Хук для сохранения статистики ожиданий и профиля сессии. При параллельном запуске
+    каждый воркер пишет свои файлы, а главный процесс собирает общий профиль в logs/profile.json
+    и, с опцией --allure-worker-dirs, переносит результаты Allure воркеров в общий каталог.
+    """
+    failure_artifacts.shutdown()
+    if wait_stats.summary():
+        wait_stats.export_json(worker_file_name(WAIT_STATS_FILE))
+    if is_xdist_worker():
+        if profiler.session.methods:
+            profiler.export_json(worker_file_name(PROFILE_FILE))
+        return
+    report_dir = session.config.option.allure_report_dir
+    if report_dir and session.config.getoption("--allure-worker-dirs"):
+        merge_results(sorted(glob.glob(_allure_worker_dir(report_dir, "gw*"))), report_dir, move=True)
+    summary = _merged_profile()
+    if summary.methods:
+        os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
+        with open(PROFILE_FILE, "w", encoding="utf-8") as f:
+            json.dump(summary.to_dict(), f, indent=2, ensure_ascii=False)
+        session.config._profile_summary = summary
+
+
+def pytest_report_header(config):
+    """
+    Хук, выводящий seed тестовых данных для воспроизведения прогона.
+    """
+    return f"test data seed: {config.getoption('--data-seed')}"
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Хук для вывода статистики пула браузеров и самых медленных ожиданий в конце сессии.
+    """
+    for name, pool in getattr(config, "_driver_pools", {}).items():
+        terminalreporter.write_sep("-", f"driver pool ({name})")
+        for line in pool.stats.summary_lines():
+            terminalreporter.write_line(line)
+
+    stats = WaitStats()
+    stats.merge(wait_stats.to_dict())
+    for path in glob.glob(_worker_files_pattern(WAIT_STATS_FILE)):
+        with open(path, encoding="utf-8") as f:
+            stats.merge(json.load(f))
+    summary = getattr(config, "_profile_summary", None)
+    if summary is not None:
+        terminalreporter.write_sep("-", "page-object profile")
+        terminalreporter.write_line(f"self time: waits {summary.wait_self:.2f} s, driver {summary.driver_self:.2f} s")
+        if summary.retry_count:
+            terminalreporter.write_line(f"retries: {summary.retry_count}, time lost {summary.retry_time:.2f} s")
+        methods = sorted(summary.to_dict()["methods"].items(), key=lambda pair: -pair[1]["total"])
+        for name, row in methods[:5]:
+            terminalreporter.write_line(f"{row['total']:8.2f} s  x{row['count']:<4} p50 {row['p50'] * 1000:.0f} ms  "
+                                        f"p95 {row['p95'] * 1000:.0f} ms  {name}")
 
+    slowest = stats.summary()[:5]
+    if slowest:
+        terminalreporter.write_sep("-", "slowest waits (p95)")
+        for row in slowest:
+            terminalreporter.write_line(f"{row['p95'] * 1000:8.0f} ms  x{row['count']:<4} "
+                                        f"timeouts: {row['timeouts']}  {row['locator']}")
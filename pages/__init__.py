@@ -0,0 +1,30 @@
+"""
+Классы PageObject. Модули страниц загружаются при первом обращении к имени
+(from pages import LoginPage), поэтому импорт пакета не тянет Selenium и Allure.
+"""
+import importlib
+
+_EXPORTS = {
+    "BasePage": "pages.base_page",
+    "LoginPage": "pages.login_page",
+    "InventoryPage": "pages.inventory_page",
+    "CartPage": "pages.cart_page",
+    "CheckoutStepOnePage": "pages.checkout_step_one_page",
+    "CheckoutStepTwoPage": "pages.checkout_step_two_page",
+    "CheckoutCompletePage": "pages.checkout_complete_page",
+    "CheckoutUserData": "pages.models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,107 +1,265 @@
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-import allure
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 
+from pages.registry import page_registry
+from utils.config import get_base_url
+from utils.dom_query import QUERY_ALL_SCRIPT, to_js_fields, to_js_locator
+from utils.failure_artifacts import failure_artifacts
 from utils.logger import log_decorator
+from utils.reporting import detail_step
+from utils.retry import with_retry
+from utils.wait_engine import WaitEngine, timeout_profile
+
+# Временные сбои взаимодействия: элемент перерисован, перекрыт или еще не готов к вводу
+RETRYABLE_ERRORS = (StaleElementReferenceException, ElementClickInterceptedException, ElementNotInteractableException)
+
 
 class BasePage:
     """
     Базовый класс для всех страниц. Содержит общие методы для взаимодействия с элементами.
     """
-    
-    def __init__(self, driver, url):
+    # Таймаут ожиданий страницы по умолчанию и таймауты отдельных локаторов в секундах.
+    # Могут быть переопределены в наследниках и в профиле таймаутов (--wait-profile).
+    DEFAULT_TIMEOUT = 10
+    TIMEOUTS = {}
+    # Путь страницы относительно базового URL приложения
+    PATH = ""
+    # Локаторы элементов, которые не пересоздаются, пока страница открыта. Найденные элементы
+    # кэшируются до следующей навигации или до StaleElementReferenceException.
+    STATIC_ELEMENTS = ()
+
+    def __init__(self, driver, url=None):
         """
         Конструктор класса BasePage.
         :param driver: экземпляр веб-драйвера
-        :param url: URL-адрес страницы
+        :param url: URL-адрес страницы; по умолчанию базовый URL приложения и PATH
         """
         self.driver = driver
-        self.url = url
+        self.url = url if url is not None else get_base_url() + self.PATH
+        self.waits = WaitEngine(driver, self.__class__.__name__)
+        self._elements = {}
+        self._elements_epoch = None
+
+    @property
+    def pages(self):
+        """
+        Реестр страниц браузера: кэш страниц и события навигации.
+        """
+        return page_registry(self.driver)
+
+    def _cached_element(self, locator, time=None, clickable=False):
+        """
+        Возвращает элемент из STATIC_ELEMENTS из кэша страницы или находит и кэширует его.
+        Кэш сбрасывается, если после его заполнения была навигация.
+        """
+        epoch = self.pages.epoch
+        if self._elements_epoch != epoch:
+            self._elements.clear()
+            self._elements_epoch = epoch
+        element = self._elements.get(locator)
+        if element is None:
+            element = self._resolve(locator, time, clickable)
+            self._elements[locator] = element
+        return element
+
+    def _resolve(self, locator, time=None, clickable=False, limit=None):
+        timeout = self.timeout_for(locator, time)
+        if limit is not None:
+            timeout = min(timeout, limit)
+        return self.waits.clickable(locator, timeout) if clickable else self.waits.visible(locator, timeout)
+
+    def _with_element(self, locator, action, time=None, clickable=False):
+        """
+        Выполняет действие над элементом. Для STATIC_ELEMENTS элемент берется из кэша.
+        При временном сбое (RETRYABLE_ERRORS) элемент находится заново и повторяется только действие,
+        в пределах числа попыток и бюджета повторов теста (utils.retry).
+        :param action: функция от веб-элемента
+        :return: результат действия
+        """
+        static = locator in self.STATIC_ELEMENTS
+
+        def resolve(limit):
+            if static and limit is None:
+                return self._cached_element(locator, time, clickable)
+            element = self._resolve(locator, time, clickable, limit)
+            if static:
+                self._elements[locator] = element
+            return element
+
+        return with_retry(resolve, action, RETRYABLE_ERRORS, locator,
+                          invalidate=lambda: self._elements.pop(locator, None))
+
+    def timeout_for(self, locator=None, time=None):
+        """
+        Возвращает таймаут ожидания для локатора с учетом профиля таймаутов.
+        :param locator: кортеж (By, 'selector') или None для ожиданий без локатора
+        :param time: явно переданный таймаут; если задан, используется он
+        :return: таймаут в секундах
+        """
+        if time is not None:
+            return time
+        return timeout_profile.resolve(self.__class__.__name__, locator, self.DEFAULT_TIMEOUT, self.TIMEOUTS)
 
     @log_decorator
-    @allure.step("Открыть страницу")
+    @detail_step("Открыть страницу")
     def open(self):
         """
         Открывает URL страницы в браузере.
         """
         self.driver.get(self.url)
+        self.pages.navigated(self.__class__)
 
     @log_decorator
-    @allure.step("Найти видимый элемент {locator}")
-    def find_element(self, locator, time=10):
+    @detail_step("Найти видимый элемент {locator}")
+    def find_element(self, locator, time=None):
         """
         Находит один видимый элемент на странице.
         :param locator: кортеж (By, 'selector')
-        :param time: время ожидания элемента в секундах
+        :param time: время ожидания элемента в секундах; по умолчанию из профиля таймаутов
         :return: найденный веб-элемент
         :raises: TimeoutException если элемент не найден
         """
         try:
-            return WebDriverWait(self.driver, time).until(EC.visibility_of_element_located(locator))
+            if locator in self.STATIC_ELEMENTS:
+                return self._cached_element(locator, time)
+            return self.waits.visible(locator, self.timeout_for(locator, time))
         except TimeoutException:
-            allure.attach(self.driver.get_screenshot_as_png(), name="screenshot_on_error", attachment_type=allure.attachment_type.PNG)
+            failure_artifacts.capture(self.driver, "screenshot_on_error")
             raise
 
     @log_decorator
-    @allure.step("Найти все видимые элементы {locator}")
-    def find_elements(self, locator, time=10):
+    @detail_step("Найти все видимые элементы {locator}")
+    def find_elements(self, locator, time=None):
         """
         Находит все видимые элементы на странице.
         :param locator: кортеж (By, 'selector')
-        :param time: время ожидания элементов в секундах
+        :param time: время ожидания элементов в секундах; по умолчанию из профиля таймаутов
         :return: список найденных веб-элементов
         :raises: TimeoutException если элементы не найдены
         """
         try:
-            return WebDriverWait(self.driver, time).until(EC.visibility_of_all_elements_located(locator))
+            return self.waits.until(EC.visibility_of_all_elements_located(locator),
+                                    self.timeout_for(locator, time), locator)
         except TimeoutException:
-            allure.attach(self.driver.get_screenshot_as_png(), name="screenshot_on_error", attachment_type=allure.attachment_type.PNG)
+            failure_artifacts.capture(self.driver, "screenshot_on_error")
             raise
 
     @log_decorator
-    @allure.step("Кликнуть по элементу {locator}")
-    def click_element(self, locator, time=10):
+    @detail_step("Кликнуть по элементу {locator}")
+    def click_element(self, locator, time=None):
         """
         Находит и кликает по элементу.
         :param locator: кортеж (By, 'selector')
-        :param time: время ожидания элемента в секундах
+        :param time: время ожидания элемента в секундах; по умолчанию из профиля таймаутов
         """
-        element = WebDriverWait(self.driver, time).until(EC.element_to_be_clickable(locator))
-        element.click()
+        self._with_element(locator, lambda element: element.click(), time, clickable=True)
 
     @log_decorator
-    @allure.step("Ввести текст '{text}' в элемент {locator}")
-    def enter_text(self, locator, text, time=10):
+    @detail_step("Ввести текст '{text}' в элемент {locator}")
+    def enter_text(self, locator, text, time=None):
         """
         Находит элемент и вводит в него текст.
         :param locator: кортеж (By, 'selector')
         :param text: текст для ввода
-        :param time: время ожидания элемента в секундах
+        :param time: время ожидания элемента в секундах; по умолчанию из профиля таймаутов
+        """
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
+
+        self._with_element(locator, type_text, time, clickable=True)
+
+    @log_decorator
+    @detail_step("Заполнить форму: {fields}")
+    def fill_form(self, fields, real_keys=False, time=None):
+        """
+        Заполняет несколько полей формы. По умолчанию вся форма заполняется одним вызовом WebDriver:
+        значения записываются скриптом с событиями input и change, как при вводе пользователем.
+        Если скрипт не может выполниться на странице, поля заполняются через enter_text.
+        :param fields: словарь {локатор: значение} в порядке заполнения
+        :param real_keys: вводить значения настоящими нажатиями клавиш (enter_text), когда важна
+                          точность поведения: обработчики keydown/keyup, маски ввода, автодополнение
+        :param time: время ожидания полей в секундах; по умолчанию наибольший таймаут полей из профиля
+        :raises: TimeoutException если поля не стали доступны для ввода
         """
-        element = WebDriverWait(self.driver, time).until(EC.element_to_be_clickable(locator))
-        element.clear()
-        element.send_keys(text)
+        if not real_keys:
+            timeout = max(self.timeout_for(locator, time) for locator in fields)
+            try:
+                missing = self.waits.fill(fields, timeout)
+            except (JavascriptException, ValueError):
+                missing = None
+            if missing == []:
+                return
+            if missing:
+                failure_artifacts.capture(self.driver, "screenshot_on_error")
+                raise TimeoutException(f"Поля {missing} не стали доступны для ввода за {timeout} сек")
+        for locator, value in fields.items():
+            self.enter_text(locator, value, time)
 
     @log_decorator
-    @allure.step("Получить текст из элемента {locator}")
-    def get_text(self, locator, time=10):
+    @detail_step("Получить текст из элемента {locator}")
+    def get_text(self, locator, time=None):
         """
         Находит элемент и возвращает его текст.
         :param locator: кортеж (By, 'selector')
-        :param time: время ожидания элемента в секундах
+        :param time: время ожидания элемента в секундах; по умолчанию из профиля таймаутов
         :return: текст элемента
         """
-        element = self.find_element(locator, time)
-        return element.text
+        try:
+            return self._with_element(locator, lambda element: element.text, time)
+        except TimeoutException:
+            failure_artifacts.capture(self.driver, "screenshot_on_error")
+            raise
 
     @log_decorator
-    @allure.step("Кликнуть по элементу {locator} с помощью JavaScript")
-    def js_click_element(self, locator, time=10):
+    @detail_step("Кликнуть по элементу {locator} с помощью JavaScript")
+    def js_click_element(self, locator, time=None):
         """
-        Находит и кликает по элементу с помощью JavaScript.
+        Находит и кликает по элементу с помощью JavaScript. Ожидание и клик выполняются одним вызовом WebDriver.
         :param locator: кортеж (By, 'selector')
-        :param time: время ожидания элемента в секундах
+        :param time: время ожидания элемента в секундах; по умолчанию из профиля таймаутов
+        """
+        try:
+            self.waits.click(locator, self.timeout_for(locator, time))
+        except TimeoutException:
+            failure_artifacts.capture(self.driver, "screenshot_on_error")
+            raise
+
+    @log_decorator
+    @detail_step("Дождаться перехода на страницу '{url_part}'")
+    def wait_for_url(self, url_part, time=None):
+        """
+        Ожидает, пока текущий URL не будет содержать заданную подстроку.
+        :param url_part: ожидаемая часть URL
+        :param time: время ожидания в секундах; по умолчанию таймаут страницы
+        :raises: TimeoutException если переход не произошел
+        """
+        self.waits.until(EC.url_contains(url_part), self.timeout_for(None, time))
+
+    @log_decorator
+    @detail_step("Получить данные всех элементов {container}")
+    def query_all(self, container, fields, time=None, visible_only=True):
+        """
+        Находит все элементы-контейнеры и за один вызов execute_script собирает тексты
+        и атрибуты их дочерних элементов. Заменяет find_elements с последующим
+        обращением к каждому элементу, которое стоит отдельного запроса к WebDriver.
+        :param container: кортеж (By, 'selector') для контейнеров
+        :param fields: словарь {имя поля: локатор | (локатор, атрибут) | (None, атрибут)}
+        :param time: время ожидания появления хотя бы одного контейнера в секундах
+        :param visible_only: учитывать только видимые контейнеры
+        :return: список словарей {имя поля: значение}
+        :raises: TimeoutException если контейнеры не найдены
         """
-        element = self.find_element(locator, time)
-        self.driver.execute_script("arguments[0].click();", element)
+        args = (to_js_locator(container), to_js_fields(fields), visible_only)
+        try:
+            return self.waits.until(lambda driver: driver.execute_script(QUERY_ALL_SCRIPT, *args) or False,
+                                    self.timeout_for(container, time), container)
+        except TimeoutException:
+            failure_artifacts.capture(self.driver, "screenshot_on_error")
+            raise
@@ -1,5 +1,6 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from pages.registry import navigates
 import allure
 
 from utils.logger import log_decorator
@@ -12,12 +13,15 @@ class CartPage(BasePage):
     _CART_ITEMS = (By.CLASS_NAME, "cart_item")
     _ITEM_NAME = (By.CLASS_NAME, "inventory_item_name")
 
+    PATH = "cart.html"
+    STATIC_ELEMENTS = (_CHECKOUT_BUTTON,)
+
     def __init__(self, driver):
         """
         Конструктор класса CartPage.
         :param driver: экземпляр веб-драйвера
         """
-        super().__init__(driver, driver.current_url)
+        super().__init__(driver)
 
     @log_decorator
     @allure.step("Получить количество товаров в корзине")
@@ -26,10 +30,11 @@ class CartPage(BasePage):
         Возвращает количество товаров, отображаемых в корзине.
         :return: количество товаров
         """
-        return len(self.find_elements(self._CART_ITEMS))
+        return len(self.query_all(self._CART_ITEMS, {}))
 
     @log_decorator
     @allure.step("Перейти к оформлению заказа")
+    @navigates("CheckoutStepOnePage")
     def proceed_to_checkout(self):
         """
         Нажимает на кнопку 'Checkout'.
@@ -43,6 +48,5 @@ class CartPage(BasePage):
         Возвращает список названий всех товаров в корзине.
         :return: список названий товаров
         """
-        items = self.find_elements(self._CART_ITEMS)
-        item_names = [item.find_element(*self._ITEM_NAME).text for item in items]
-        return item_names
+        items = self.query_all(self._CART_ITEMS, {"name": self._ITEM_NAME})
+        return [item["name"] for item in items]
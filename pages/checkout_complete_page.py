@@ -10,12 +10,15 @@ class CheckoutCompletePage(BasePage):
     """
     _COMPLETE_HEADER = (By.CLASS_NAME, "complete-header")
 
+    PATH = "checkout-complete.html"
+    STATIC_ELEMENTS = (_COMPLETE_HEADER,)
+
     def __init__(self, driver):
         """
         Конструктор класса CheckoutCompletePage.
         :param driver: экземпляр веб-драйвера
         """
-        super().__init__(driver, driver.current_url)
+        super().__init__(driver)
 
     @log_decorator
     @allure.step("Получить сообщение о завершении заказа")
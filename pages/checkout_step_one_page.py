@@ -1,18 +1,11 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
-from pydantic import BaseModel, Field
+from pages.registry import navigates
 import allure
 
+from pages.models import CheckoutUserData
 from utils.logger import log_decorator
 
-class CheckoutUserData(BaseModel):
-    """
-    Модель данных для валидации информации о пользователе при чекауте.
-    """
-    first_name: str = Field(..., min_length=1)
-    last_name: str = Field(..., min_length=1)
-    postal_code: str = Field(..., min_length=1)
-
 class CheckoutStepOnePage(BasePage):
     """
     Страница первого шага оформления заказа (ввод данных пользователя).
@@ -22,29 +15,34 @@ class CheckoutStepOnePage(BasePage):
     _POSTAL_CODE_INPUT = (By.ID, "postal-code")
     _CONTINUE_BUTTON = (By.ID, "continue")
 
+    PATH = "checkout-step-one.html"
+    STATIC_ELEMENTS = (_FIRST_NAME_INPUT, _LAST_NAME_INPUT, _POSTAL_CODE_INPUT)
+
     def __init__(self, driver):
         """
         Конструктор класса CheckoutStepOnePage.
         :param driver: экземпляр веб-драйвера
         """
-        super().__init__(driver, driver.current_url)
+        super().__init__(driver)
 
     @log_decorator
     @allure.step("Заполнить информацию о пользователе: {user_data}")
-    def fill_user_information(self, user_data: CheckoutUserData):
+    def fill_user_information(self, user_data: CheckoutUserData, real_keys=False):
         """
-        Заполняет форму с данными пользователя.
-        :param user_data: Pydantic модель с данными пользователя
+        Заполняет форму с данными пользователя одним вызовом WebDriver.
+        :param user_data: Pydantic модель с данными пользователя; валидируется при создании
+                          (CheckoutUserData(...) или пакетно в UserDataPool), повторно не проверяется
+        :param real_keys: вводить данные настоящими нажатиями клавиш
         """
-        # Валидация данных перед использованием
-        validated_data = CheckoutUserData(**user_data.model_dump())
-        
-        self.enter_text(self._FIRST_NAME_INPUT, validated_data.first_name)
-        self.enter_text(self._LAST_NAME_INPUT, validated_data.last_name)
-        self.enter_text(self._POSTAL_CODE_INPUT, validated_data.postal_code)
+        self.fill_form({
+            self._FIRST_NAME_INPUT: user_data.first_name,
+            self._LAST_NAME_INPUT: user_data.last_name,
+            self._POSTAL_CODE_INPUT: user_data.postal_code,
+        }, real_keys)
 
     @log_decorator
     @allure.step("Отправить форму с данными пользователя")
+    @navigates("CheckoutStepTwoPage")
     def click_continue(self):
         """
         Отправляет форму, симулируя нажатие на 'Continue'.
@@ -1,5 +1,6 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from pages.registry import navigates
 import allure
 
 from utils.logger import log_decorator
@@ -11,12 +12,15 @@ class CheckoutStepTwoPage(BasePage):
     _FINISH_BUTTON = (By.ID, "finish")
     _PAGE_TITLE = (By.CLASS_NAME, "title")
 
+    PATH = "checkout-step-two.html"
+    STATIC_ELEMENTS = (_FINISH_BUTTON, _PAGE_TITLE)
+
     def __init__(self, driver):
         """
         Конструктор класса CheckoutStepTwoPage.
         :param driver: экземпляр веб-драйвера
         """
-        super().__init__(driver, driver.current_url)
+        super().__init__(driver)
 
     @log_decorator
     @allure.step("Проверить, что страница обзора заказа открыта")
@@ -29,6 +33,7 @@ class CheckoutStepTwoPage(BasePage):
 
     @log_decorator
     @allure.step("Завершить оформление заказа")
+    @navigates("CheckoutCompletePage")
     def click_finish(self):
         """
         Нажимает на кнопку 'Finish'.
@@ -1,5 +1,6 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from pages.registry import navigates
 import allure
 
 from utils.logger import log_decorator
@@ -11,13 +12,27 @@ class InventoryPage(BasePage):
     _ADD_TO_CART_BUTTON = (By.XPATH, "//button[text()='Add to cart']")
     _CART_ICON = (By.ID, "shopping_cart_container")
     _PAGE_TITLE = (By.CLASS_NAME, "title")
+    _INVENTORY_ITEM = (By.CLASS_NAME, "inventory_item")
+    _ITEM_NAME = (By.CLASS_NAME, "inventory_item_name")
+    _ITEM_PRICE = (By.CLASS_NAME, "inventory_item_price")
+    _ITEM_BUTTON = (By.TAG_NAME, "button")
+    _CART_BADGE = (By.CLASS_NAME, "shopping_cart_badge")
+
+    # Количество товаров на значке корзины; значка нет, пока корзина пуста
+    _CART_BADGE_COUNT_SCRIPT = """
+const badge = document.querySelector(".shopping_cart_badge");
+return badge ? parseInt(badge.textContent, 10) || 0 : 0;
+"""
+
+    PATH = "inventory.html"
+    STATIC_ELEMENTS = (_CART_ICON, _PAGE_TITLE)
 
     def __init__(self, driver):
         """
         Конструктор класса InventoryPage.
         :param driver: экземпляр веб-драйвера
         """
-        super().__init__(driver, driver.current_url)
+        super().__init__(driver)
 
     @log_decorator
     @allure.step("Проверить, что страница каталога открыта")
@@ -28,6 +43,19 @@ class InventoryPage(BasePage):
         """
         return "Products" in self.get_text(self._PAGE_TITLE)
 
+    @log_decorator
+    @allure.step("Получить список товаров")
+    def get_products(self):
+        """
+        Возвращает данные всех товаров каталога, собранные за один запрос к браузеру.
+        :return: список словарей с ключами name, price, button
+        """
+        return self.query_all(self._INVENTORY_ITEM, {
+            "name": self._ITEM_NAME,
+            "price": self._ITEM_PRICE,
+            "button": self._ITEM_BUTTON,
+        })
+
     @log_decorator
     @allure.step("Добавить товар в корзину по индексу: {index}")
     def add_item_to_cart_by_index(self, index=0):
@@ -41,8 +69,64 @@ class InventoryPage(BasePage):
         else:
             raise IndexError("Индекс товара выходит за пределы диапазона")
 
+    @log_decorator
+    @allure.step("Добавить товары в корзину: {items}")
+    def add_items_to_cart(self, items):
+        """
+        Добавляет в корзину несколько товаров за один проход: данные каталога и кнопки
+        запрашиваются по одному разу, клики выполняются в порядке каталога, а результат
+        подтверждается одним ожиданием счетчика на значке корзины.
+        В отличие от add_item_to_cart_by_index индекс - это позиция товара в каталоге,
+        он не сдвигается, когда кнопки меняются на "Remove". Товары, уже лежащие в корзине, пропускаются.
+        :param items: индексы товаров в каталоге (начиная с 0) и/или их названия
+        :return: количество товаров в корзине после добавления
+        :raises: IndexError если индекс выходит за пределы каталога
+        :raises: ValueError если товар с таким названием не найден
+        """
+        products = self.get_products()
+        positions = self._resolve_positions(products, items)
+        expected = sum(1 for product in products if product["button"] == "Remove")
+        # Кнопки "Add to cart" идут в порядке каталога без товаров, уже лежащих в корзине,
+        # поэтому номер кнопки товара - число таких же товаров перед ним
+        add_indexes, add_index = {}, 0
+        for position, product in enumerate(products):
+            if product["button"] != "Remove":
+                add_indexes[position] = add_index
+                add_index += 1
+        to_click = [add_indexes[position] for position in positions if position in add_indexes]
+        if to_click:
+            add_buttons = self.driver.find_elements(*self._ADD_TO_CART_BUTTON)
+            for index in to_click:
+                add_buttons[index].click()
+            expected += len(to_click)
+        self.waits.until(lambda driver: driver.execute_script(self._CART_BADGE_COUNT_SCRIPT) == expected,
+                         self.timeout_for(self._CART_BADGE), self._CART_BADGE,
+                         f"Счетчик корзины не дошел до {expected}")
+        return expected
+
+    @staticmethod
+    def _resolve_positions(products, items):
+        """
+        Переводит индексы и названия товаров в отсортированные позиции каталога без повторов.
+        """
+        by_name = {product["name"]: position for position, product in enumerate(products)}
+        positions, missing = set(), []
+        for item in items:
+            if isinstance(item, int):
+                if not 0 <= item < len(products):
+                    raise IndexError("Индекс товара выходит за пределы диапазона")
+                positions.add(item)
+            elif item in by_name:
+                positions.add(by_name[item])
+            else:
+                missing.append(item)
+        if missing:
+            raise ValueError(f"Товары не найдены в каталоге: {', '.join(missing)}")
+        return sorted(positions)
+
     @log_decorator
     @allure.step("Перейти в корзину")
+    @navigates("CartPage")
     def go_to_cart(self):
         """
         Нажимает на иконку корзины для перехода на страницу корзины.
@@ -1,8 +1,11 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from pages.registry import navigates
 import allure
 
-from utils.logger import log_decorator
+from utils.config import get_base_url
+from utils.logger import log_decorator, logger
+from utils.session_cache import capture_session, inject_session, session_cache
 
 class LoginPage(BasePage):
     """
@@ -12,13 +15,15 @@ class LoginPage(BasePage):
     _PASSWORD_INPUT = (By.ID, "password")
     _LOGIN_BUTTON = (By.ID, "login-button")
     _ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
+    _LANDING_PAGE = "inventory.html"
+    DEFAULT_PASSWORD = "secret_sauce"
 
     def __init__(self, driver):
         """
         Конструктор класса LoginPage.
         :param driver: экземпляр веб-драйвера
         """
-        super().__init__(driver, "https://www.saucedemo.com/")
+        super().__init__(driver, get_base_url())
 
     @log_decorator
     @allure.step("Ввести имя пользователя: {username}")
@@ -40,6 +45,7 @@ class LoginPage(BasePage):
 
     @log_decorator
     @allure.step("Нажать кнопку 'Login'")
+    @navigates()
     def click_login_button(self):
         """
         Нажимает на кнопку входа.
@@ -67,3 +73,30 @@ class LoginPage(BasePage):
         :return: текст ошибки
         """
         return self.get_text(self._ERROR_MESSAGE)
+
+    @log_decorator
+    @allure.step("Выполнить быстрый вход с именем пользователя '{username}'")
+    def fast_login(self, username, password=DEFAULT_PASSWORD):
+        """
+        Выполняет вход без UI: при первом вызове для пользователя входит через форму
+        и сохраняет сессию (cookies и localStorage), при последующих переносит сохраненную
+        сессию в браузер и сразу открывает страницу каталога. Если приложение не приняло
+        сохраненную сессию, она удаляется из кэша, а вход выполняется через форму заново.
+        Тесты, проверяющие саму форму входа, должны использовать login().
+        :param username: имя пользователя
+        :param password: пароль
+        """
+        landing_url = self.url + self._LANDING_PAGE
+        session = session_cache.get(self.url, username)
+        if session is not None:
+            if inject_session(self.driver, self.url, landing_url, session):
+                self.pages.navigated("InventoryPage")
+                return
+            logger.warning("Сохраненная сессия пользователя %s не принята приложением, вход через форму", username)
+            session_cache.discard(self.url, username)
+            self.driver.delete_all_cookies()
+
+        self.login(username, password)
+        self.wait_for_url(self._LANDING_PAGE)
+        self.pages.navigated("InventoryPage")
+        session_cache.put(self.url, username, capture_session(self.driver))
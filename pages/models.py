@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class CheckoutUserData(BaseModel):
+    """
+    Модель данных для валидации информации о пользователе при чекауте.
+    """
+    first_name: str = Field(..., min_length=1)
+    last_name: str = Field(..., min_length=1)
+    postal_code: str = Field(..., min_length=1)
@@ -0,0 +1,92 @@
+import importlib
+from functools import wraps
+
+
+class PageRegistry:
+    """
+    Реестр страниц одного браузера. Страницы создаются при первом обращении и переиспользуются,
+    а текущая страница отслеживается по событиям навигации (open, переходы из методов страниц),
+    без запросов current_url. Каждая навигация увеличивает epoch, что сбрасывает кэши элементов страниц.
+    """
+
+    def __init__(self, driver):
+        """
+        :param driver: экземпляр веб-драйвера
+        """
+        self.driver = driver
+        self.current = None
+        self.epoch = 0
+        self._pages = {}
+
+    def get(self, page_class):
+        """
+        Возвращает страницу заданного класса, создавая ее при первом обращении.
+        :param page_class: класс страницы или его имя из пакета pages
+        :return: экземпляр страницы
+        """
+        page_class = _resolve(page_class)
+        page = self._pages.get(page_class)
+        if page is None:
+            page = self._pages[page_class] = page_class(self.driver)
+        return page
+
+    def navigated(self, page_class=None):
+        """
+        Событие навигации: браузер перешел на другую страницу, ссылки на элементы устарели.
+        :param page_class: класс (или имя класса) открытой страницы; None, если страница неизвестна
+        """
+        self.current = _resolve(page_class) if page_class is not None else None
+        self.epoch += 1
+
+    def reset(self):
+        """
+        Забывает созданные страницы и текущую страницу, например перед возвратом браузера в пул.
+        """
+        self._pages.clear()
+        self.navigated(None)
+
+
+# Атрибут драйвера, в котором хранится его реестр. Реестр и его страницы ссылаются на драйвер,
+# поэтому в словаре со слабыми ключами драйвер никогда не освобождался бы; ссылки драйвер -> реестр -> страницы
+# -> драйвер образуют цикл, который сборщик мусора удаляет вместе с драйвером
+_REGISTRY_ATTRIBUTE = "_page_registry"
+
+
+def page_registry(driver):
+    """
+    Возвращает реестр страниц браузера; реестр живет, пока жив драйвер.
+    :param driver: экземпляр веб-драйвера
+    :return: PageRegistry
+    """
+    registry = vars(driver).get(_REGISTRY_ATTRIBUTE)
+    if registry is None:
+        registry = PageRegistry(driver)
+        setattr(driver, _REGISTRY_ATTRIBUTE, registry)
+    return registry
+
+
+def navigates(page_class=None):
+    """
+    Декоратор метода страницы, после которого браузер переходит на другую страницу.
+    Если метод упал, страница считается неизвестной.
+    :param page_class: имя класса страницы, на которую ведет метод; None, если она заранее неизвестна
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                result = func(self, *args, **kwargs)
+            except Exception:
+                self.pages.navigated(None)
+                raise
+            self.pages.navigated(page_class)
+            return result
+        return wrapper
+    return decorator
+
+
+def _resolve(page_class):
+    if isinstance(page_class, str):
+        # Имя класса разрешается через пакет pages, чтобы страницы не импортировали друг друга
+        return getattr(importlib.import_module("pages"), page_class)
+    return page_class
@@ -0,0 +1,134 @@
+import asyncio
+import textwrap
+
+import pytest
+
+from utils.ai_code_review.batch import format_report, review_chunks, review_paths, ChunkReview
+from utils.ai_code_review.chunking import chunk_source
+from utils.ai_code_review.engine import ReviewEngine
+from utils.ai_code_review.providers import StubProvider
+
+SOURCE = textwrap.dedent('''\
+    import os
+
+    LIMIT = 10
+
+
+    def first():
+        return 1
+
+
+    class Page:
+        """Страница."""
+
+        def open(self):
+            return os.getcwd()
+
+        def close(self):
+            return None
+    ''')
+
+
+class CountingProvider(StubProvider):
+    def __init__(self, delay=0.0):
+        super().__init__(name="counting", delay=delay)
+        self.active = 0
+        self.peak = 0
+        self.texts = []
+
+    async def stream(self, text, usage):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.texts.append(text)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        yield f"ревью {len(self.texts)}"
+
+
+@pytest.mark.unit
+def test_chunks_follow_definitions_and_cover_whole_file():
+    """
+    Тест проверяет, что код делится по определениям и фрагменты вместе содержат весь файл.
+    """
+    chunks = chunk_source(SOURCE, 1000)
+
+    assert [chunk.name for chunk in chunks] == ["module", "first", "Page"]
+    assert "".join(chunk.text for chunk in chunks) == SOURCE
+
+
+@pytest.mark.unit
+def test_large_class_is_split_into_methods():
+    """
+    Тест проверяет, что класс больше лимита делится на заголовок и методы, а ни один фрагмент не превышает лимит.
+    """
+    chunks = chunk_source(SOURCE, 60)
+
+    assert [chunk.name for chunk in chunks] == ["module", "first", "Page", "Page.open", "Page.close"]
+    assert all(len(chunk.text) <= 60 for chunk in chunks)
+    assert "".join(chunk.text for chunk in chunks) == SOURCE
+
+
+@pytest.mark.unit
+def test_invalid_python_is_split_by_lines():
+    """
+    Тест проверяет, что текст с синтаксической ошибкой делится по строкам без потери содержимого.
+    """
+    source = "def broken(:\n" + "x = 1\n" * 30
+
+    chunks = chunk_source(source, 50)
+
+    assert chunks[0].name == "lines[1]"
+    assert "".join(chunk.text for chunk in chunks) == source
+
+
+@pytest.mark.unit
+def test_only_changed_chunks_are_reviewed_again(tmp_path):
+    """
+    Тест проверяет, что при повторном запуске на ревью уходит только измененная функция,
+    а ответы по остальным берутся из файла состояния.
+    """
+    module = tmp_path / "src" / "module.py"
+    module.parent.mkdir()
+    module.write_text(SOURCE, encoding="utf-8")
+    state = str(tmp_path / "state.json")
+    provider = CountingProvider()
+    engine = ReviewEngine([provider], "{code}")
+
+    first = asyncio.run(review_paths(engine, [str(tmp_path / "src")], "first", 1000, state_path=state))
+    module.write_text(SOURCE.replace("return 1", "return 2"), encoding="utf-8")
+    second = asyncio.run(review_paths(engine, [str(tmp_path / "src")], "first", 1000, state_path=state))
+
+    assert len(provider.texts) == len(first) + 1
+    assert "return 2" in provider.texts[-1]
+    assert [item.reused for item in second] == [True, False, True]
+
+
+@pytest.mark.unit
+def test_review_pool_is_bounded():
+    """
+    Тест проверяет, что одновременно выполняется не больше заданного количества запросов.
+    """
+    provider = CountingProvider(delay=0.01)
+    items = [ChunkReview("f.py", chunk, None) for chunk in chunk_source(SOURCE * 3, 40)]
+
+    asyncio.run(review_chunks(ReviewEngine([provider], "{code}"), items, "first", workers=2))
+
+    assert provider.peak == 2
+    assert all(item.review for item in items)
+
+
+@pytest.mark.unit
+def test_report_groups_reviews_by_file():
+    """
+    Тест проверяет, что отчет содержит сводку и разделы по файлам и фрагментам, включая ошибки.
+    """
+    chunk = chunk_source(SOURCE, 1000)[1]
+    report = format_report([ChunkReview("a.py", chunk, "замечания"),
+                            ChunkReview("b.py", chunk, None, error="таймаут")])
+
+    assert "Фрагментов: 2, проверено: 1, без изменений: 0, ошибок: 1" in report
+    assert "## a.py" in report and "## b.py" in report
+    assert "### first, строки 6-7" in report
+    assert "❌ Ошибка: таймаут" in report
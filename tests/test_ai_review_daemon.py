@@ -0,0 +1,138 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from utils.ai_code_review.daemon import ReviewDaemon
+from utils.ai_code_review.protocol import is_running, request, supported
+
+pytestmark = pytest.mark.skipif(not supported(), reason="Unix-сокеты недоступны")
+
+CONFIG = {"review": {"providers": ["stub"]}, "stub": {}, "cache": {"enabled": False}}
+
+
+@pytest.fixture
+def daemon():
+    # Короткий путь: длина пути Unix-сокета ограничена
+    directory = tempfile.mkdtemp(prefix="air-")
+    daemon = ReviewDaemon(CONFIG, "{code}", os.path.join(directory, "d.sock"))
+    thread = threading.Thread(target=asyncio.run, args=(daemon.serve(),), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not is_running(daemon.socket_path) and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    yield daemon
+
+    if is_running(daemon.socket_path):
+        list(request(daemon.socket_path, {"type": "shutdown"}))
+    thread.join(5)
+    os.rmdir(directory)
+
+
+@pytest.mark.unit
+def test_review_is_streamed_back_through_socket(daemon):
+    """
+    Тест проверяет, что демон возвращает ответ по частям и завершает его сообщением с метриками.
+    """
+    provider = daemon.engine_for(None, True).providers[0]
+    provider.response = "замечаний нет"
+
+    replies = list(request(daemon.socket_path, {"type": "review", "code": "x = 1"}))
+
+    assert [reply["text"] for reply in replies if reply["type"] == "token"] == ["замечаний ", "нет"]
+    assert replies[-1]["type"] == "done"
+    assert replies[-1]["metrics"][0].startswith("stub: первый токен")
+
+
+@pytest.mark.unit
+def test_engine_and_clients_are_reused_between_requests(daemon):
+    """
+    Тест проверяет, что движок и провайдер создаются один раз и обслуживают последующие запросы.
+    """
+    list(request(daemon.socket_path, {"type": "review", "code": "a = 1"}))
+    list(request(daemon.socket_path, {"type": "review", "code": "b = 2"}))
+
+    assert len(daemon._engines) == 1
+    assert daemon.engine_for(None, True).providers[0].calls == 2
+
+
+@pytest.mark.unit
+def test_provider_error_is_reported_and_daemon_keeps_running(daemon):
+    """
+    Тест проверяет, что ошибка провайдера возвращается клиенту, а демон продолжает принимать запросы.
+    """
+    daemon.engine_for(None, True).providers[0].error = RuntimeError("нет ключа")
+
+    replies = list(request(daemon.socket_path, {"type": "review", "code": "x = 1"}))
+
+    assert replies[0]["type"] == "error" and "нет ключа" in replies[0]["message"]
+    assert is_running(daemon.socket_path)
+
+
+@pytest.mark.unit
+def test_shutdown_removes_socket(daemon):
+    """
+    Тест проверяет, что после остановки демон удаляет файл сокета.
+    """
+    list(request(daemon.socket_path, {"type": "shutdown"}))
+    deadline = time.monotonic() + 5
+    while os.path.exists(daemon.socket_path) and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert not os.path.exists(daemon.socket_path)
+
+
+@pytest.mark.unit
+def test_socket_is_private(daemon):
+    """
+    Тест проверяет, что сокет доступен только владельцу.
+    """
+    assert os.stat(daemon.socket_path).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.unit
+def test_chunked_review_reports_metrics_of_this_request_only(daemon):
+    """
+    Тест проверяет, что при ревью по фрагментам демон возвращает метрики только текущего запроса,
+    а не накопленные за время работы.
+    """
+    daemon.cfg = {**CONFIG, "limits": {"max_code_length": 1000}}
+    code = "\n".join(f"value_{index} = {index}" for index in range(200))
+
+    list(request(daemon.socket_path, {"type": "review", "code": code}))
+    second = list(request(daemon.socket_path, {"type": "review", "code": code}))
+
+    chunks = daemon.engine_for(None, True).providers[0].calls // 2
+    assert chunks > 1
+    assert second[-1]["metrics"][0].startswith(f"stub: запросов {chunks},")
+
+
+@pytest.mark.unit
+def test_config_is_reloaded_when_files_change(tmp_path):
+    """
+    Тест проверяет, что после изменения файла конфига демон загружает его заново и пересоздает движки.
+    """
+    config_file = tmp_path / "config.json"
+    config_file.write_text("{}")
+    loads = []
+
+    def reload():
+        loads.append(config_file.read_text())
+        return {**CONFIG, "review": {"providers": ["stub"], "strategy": "merge"}}, "new {code}"
+
+    daemon = ReviewDaemon(CONFIG, "{code}", str(tmp_path / "d.sock"), reload=reload, watch_files=[str(config_file)])
+    engine = daemon.engine_for(None, True)
+
+    assert not daemon.reload_if_changed()
+    config_file.write_text('{"changed": true}')
+    os.utime(config_file, (time.time() + 10, time.time() + 10))
+
+    assert daemon.reload_if_changed()
+    assert (daemon.prompt, daemon.cfg["review"]["strategy"]) == ("new {code}", "merge")
+    assert daemon.engine_for(None, True) is not engine
+    assert not daemon.reload_if_changed()
+    assert len(loads) == 1
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from utils.ai_code_review.cache import ReviewCache, cache_key
+from utils.ai_code_review.engine import FIRST, MERGE, ReviewEngine, ReviewError
+from utils.ai_code_review.providers import StubProvider
+
+PROMPT = "Проверь код:\n{code}"
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.mark.unit
+def test_first_strategy_returns_fastest_answer():
+    """
+    Тест проверяет, что в режиме first возвращается ответ самого быстрого провайдера, а медленный не ждут.
+    """
+    slow = StubProvider(name="slow", response="медленно", delay=5)
+    fast = StubProvider(name="fast", response="быстро", delay=0.01)
+    engine = ReviewEngine([slow, fast], PROMPT)
+
+    start = time.perf_counter()
+    result = run(engine.review("x = 1", FIRST))
+
+    assert (result.text, result.providers, result.cached) == ("быстро", ["fast"], False)
+    assert time.perf_counter() - start < 1
+
+
+@pytest.mark.unit
+def test_first_strategy_skips_failed_and_timed_out_providers():
+    """
+    Тест проверяет, что ошибка или таймаут одного провайдера не мешают получить ответ другого.
+    """
+    broken = StubProvider(name="broken", error=RuntimeError("500"))
+    hanging = StubProvider({"timeout": 0.05}, name="hanging", delay=5)
+    working = StubProvider(name="working", response="ок", delay=0.1)
+    engine = ReviewEngine([broken, hanging, working], PROMPT)
+
+    result = run(engine.review("x = 1", FIRST))
+
+    assert result.text == "ок"
+    assert result.errors == {"broken": "RuntimeError: 500", "hanging": "таймаут"}
+
+
+@pytest.mark.unit
+def test_merge_strategy_combines_answers():
+    """
+    Тест проверяет, что в режиме merge ответы всех провайдеров объединяются по порядку.
+    """
+    engine = ReviewEngine([StubProvider(name="a", response="первый"), StubProvider(name="b", response="второй"),
+                           StubProvider(name="c", error=ValueError("нет ключа"))], PROMPT)
+
+    result = run(engine.review("x = 1", MERGE))
+
+    assert result.text == "### a\n\nпервый\n\n### b\n\nвторой"
+    assert result.providers == ["a", "b"]
+    assert "c" in result.errors
+
+
+@pytest.mark.unit
+def test_all_providers_failing_raises():
+    """
+    Тест проверяет, что если не ответил ни один провайдер, бросается ReviewError с причинами.
+    """
+    engine = ReviewEngine([StubProvider(name="a", error=RuntimeError("сеть"))], PROMPT)
+
+    with pytest.raises(ReviewError, match="сеть"):
+        run(engine.review("x = 1"))
+
+
+@pytest.mark.unit
+def test_repeat_review_is_served_from_cache(tmp_path):
+    """
+    Тест проверяет, что повторное ревью того же кода берется из кэша без обращения к провайдеру,
+    а измененный код отправляется заново.
+    """
+    provider = StubProvider(name="stub", response="замечания")
+    engine = ReviewEngine([provider], PROMPT, ReviewCache(str(tmp_path)))
+
+    first = run(engine.review("x = 1"))
+    second = run(engine.review("x = 1"))
+    run(engine.review("x = 2"))
+
+    assert (first.cached, second.cached) == (False, True)
+    assert second.text == "замечания"
+    assert provider.calls == 2
+
+
+@pytest.mark.unit
+def test_cache_key_depends_on_model_and_params():
+    """
+    Тест проверяет, что ключ кэша меняется при смене модели или параметров запроса.
+    """
+    base = cache_key("code", PROMPT, "openai", "gpt-4o-mini", {"temperature": 0.2})
+
+    assert base == cache_key("code", PROMPT, "openai", "gpt-4o-mini", {"temperature": 0.2})
+    assert base != cache_key("code", PROMPT, "openai", "gpt-4o", {"temperature": 0.2})
+    assert base != cache_key("code", PROMPT, "openai", "gpt-4o-mini", {"temperature": 0.7})
+
+
+@pytest.mark.unit
+def test_cache_expires_entries_after_ttl(tmp_path):
+    """
+    Тест проверяет, что устаревшая запись кэша не возвращается и удаляется.
+    """
+    cache = ReviewCache(str(tmp_path), ttl=0)
+    cache.put("key", "ответ")
+    time.sleep(0.01)
+
+    assert cache.get("key") is None
+    assert not os.listdir(tmp_path)
+
+
+@pytest.mark.unit
+def test_cache_evicts_least_recently_used_over_size_limit(tmp_path):
+    """
+    Тест проверяет, что при превышении размера удаляются записи, к которым дольше всего не обращались.
+    """
+    cache = ReviewCache(str(tmp_path), max_bytes=10 ** 6)
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 100)
+    now = time.time()
+    for offset, key in enumerate(("b", "a", "c")):
+        os.utime(tmp_path / f"{key}.json", (now + offset, now + offset))
+    # Размер записей различается на длину метки времени, поэтому лимит равен размеру двух оставшихся
+    cache.max_bytes = os.path.getsize(tmp_path / "a.json") + os.path.getsize(tmp_path / "c.json")
+
+    assert cache.evict() == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 100
+
+
+@pytest.mark.unit
+def test_cache_scans_directory_only_when_over_size_limit(tmp_path, monkeypatch):
+    """
+    Тест проверяет, что запись не обходит каталог кэша, пока его размер не превысил предел:
+    каталог считается один раз при первой записи и затем только при превышении max_bytes.
+    """
+    cache = ReviewCache(str(tmp_path), max_bytes=10 ** 6)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or evict())
+
+    for key in ("a", "b", "c", "a"):
+        cache.put(key, "x" * 100)
+    assert len(scans) == 1
+
+    cache.max_bytes = os.path.getsize(tmp_path / "a.json") * 3
+    cache.put("d", "x" * 100)
+
+    assert len(scans) == 2
+    assert len(os.listdir(tmp_path)) == 3
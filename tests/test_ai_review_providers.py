@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from utils.ai_code_review.engine import ReviewEngine
+from utils.ai_code_review.metrics import CallMetrics, ProviderMetrics
+from utils.ai_code_review.providers import Provider, StubProvider
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class PooledProvider(Provider):
+    name = "pooled"
+
+    def __init__(self):
+        super().__init__({"model": "fake"})
+        self.created = []
+
+    def _create_client(self):
+        self.created.append(FakeClient())
+        return self.created[-1]
+
+    async def stream(self, text, usage):
+        self.client()
+        usage["output_tokens"] = 2
+        yield "ответ "
+        yield "модели"
+
+
+class FailingMidStream(StubProvider):
+    async def stream(self, text, usage):
+        yield "начало "
+        raise ConnectionError("обрыв")
+
+
+@pytest.mark.unit
+def test_tokens_are_forwarded_as_they_arrive():
+    """
+    Тест проверяет, что ответ передается по частям в порядке генерации, а результат помечен как выведенный.
+    """
+    tokens = []
+    engine = ReviewEngine([StubProvider(response="раз два три", token_delay=0.01)], "{code}")
+
+    result = asyncio.run(engine.review("x = 1", on_token=tokens.append))
+
+    assert tokens == ["раз ", "два ", "три"]
+    assert result.text == "раз два три"
+    assert result.streamed is True
+
+
+@pytest.mark.unit
+def test_metrics_record_time_to_first_token_and_speed():
+    """
+    Тест проверяет, что для запроса записываются время до первого токена, общее время и количество токенов.
+    """
+    engine = ReviewEngine([StubProvider(response="a b c d", delay=0.05, token_delay=0.01)], "{code}")
+
+    result = asyncio.run(engine.review("x = 1"))
+    metrics = result.metrics[0]
+
+    assert metrics.ttft >= 0.05
+    assert metrics.total >= metrics.ttft + 0.03
+    assert (metrics.tokens, metrics.estimated) == (4, False)
+    assert metrics.tokens_per_second > 0
+    assert engine.metrics.summary()["stub"]["total"]["count"] == 1
+
+
+@pytest.mark.unit
+def test_fallback_answer_is_not_marked_as_streamed():
+    """
+    Тест проверяет, что если начавший вывод провайдер упал, ответ другого провайдера не считается выведенным.
+    """
+    tokens = []
+    engine = ReviewEngine([FailingMidStream(name="broken"), StubProvider(name="backup", response="ок", delay=0.05)],
+                          "{code}")
+
+    result = asyncio.run(engine.review("x = 1", on_token=tokens.append))
+
+    assert tokens == ["начало "]
+    assert (result.text, result.streamed) == ("ок", False)
+    assert "обрыв" in result.errors["broken"]
+
+
+@pytest.mark.unit
+def test_streaming_provider_answer_wins_over_faster_finisher():
+    """
+    Тест проверяет, что возвращается ответ провайдера, начавшего вывод, даже если другой провайдер
+    закончил раньше: выведенный текст и результат не расходятся.
+    """
+    tokens = []
+    streaming = StubProvider(name="streaming", response="раз два три", token_delay=0.05)
+    faster = StubProvider(name="faster", response="готово", delay=0.02)
+    engine = ReviewEngine([streaming, faster], "{code}")
+
+    result = asyncio.run(engine.review("x = 1", on_token=tokens.append))
+
+    assert (result.text, result.providers, result.streamed) == ("раз два три", ["streaming"], True)
+    assert "".join(tokens) == result.text
+
+
+@pytest.mark.unit
+def test_client_is_reused_within_event_loop_and_closed():
+    """
+    Тест проверяет, что клиент SDK создается один раз на цикл событий и закрывается через aclose.
+    """
+    provider = PooledProvider()
+    engine = ReviewEngine([provider], "{code}")
+
+    async def reviews():
+        for code in ("a", "b", "c"):
+            await engine.review(code)
+        await engine.aclose()
+
+    asyncio.run(reviews())
+    asyncio.run(engine.review("d"))
+
+    assert len(provider.created) == 2
+    assert provider.created[0].closed is True
+
+
+@pytest.mark.unit
+def test_metrics_summary_lines():
+    """
+    Тест проверяет сводку метрик по провайдеру.
+    """
+    metrics = ProviderMetrics()
+    metrics.record(CallMetrics("openai", ttft=0.5, total=2.5, tokens=100))
+    metrics.record(CallMetrics("openai", ttft=1.0, total=3.0, tokens=100))
+
+    assert metrics.summary()["openai"]["ttft"]["p50"] == 0.5
+    assert metrics.summary_lines()[0].startswith("openai: запросов 2, первый токен p50 0.50 сек")
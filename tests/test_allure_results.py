@@ -0,0 +1,42 @@
+import pytest
+
+from utils.allure_results import merge_results
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_merge_moves_worker_results(tmp_path):
+    """
+    Тест проверяет, что результаты воркеров переносятся в общий каталог, а каталоги воркеров удаляются.
+    """
+    write(tmp_path / "gw0" / "a-result.json", "{}")
+    write(tmp_path / "gw0" / "b-attachment.jpg", "jpg")
+    write(tmp_path / "gw1" / "c-result.json", "{}")
+    write(tmp_path / "gw1" / "d-result.json.tmp", "{")
+
+    merged = merge_results([tmp_path / "gw0", tmp_path / "gw1"], tmp_path / "all", move=True)
+
+    assert merged == 3
+    assert sorted(p.name for p in (tmp_path / "all").iterdir()) == ["a-result.json", "b-attachment.jpg",
+                                                                     "c-result.json"]
+    assert not (tmp_path / "gw0").exists() and not (tmp_path / "gw1").exists()
+
+
+@pytest.mark.unit
+def test_merge_keeps_first_global_file_and_sources_when_copying(tmp_path):
+    """
+    Тест проверяет, что из общих файлов запуска остается первый, а при копировании исходники не трогаются.
+    """
+    write(tmp_path / "all" / "environment.properties", "base=first")
+    write(tmp_path / "gw0" / "environment.properties", "base=second")
+    write(tmp_path / "gw0" / "a-result.json", "{}")
+
+    merged = merge_results([tmp_path / "all", tmp_path / "gw0"], tmp_path / "all")
+
+    assert merged == 1
+    assert (tmp_path / "all" / "environment.properties").read_text(encoding="utf-8") == "base=first"
+    assert (tmp_path / "gw0" / "a-result.json").exists()
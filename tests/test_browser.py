@@ -0,0 +1,92 @@
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+
+from utils import browser
+from utils.browser import LEAN_ARGUMENTS, LEAN_BLOCKED_URLS, block_requests, build_chrome_options
+from utils.driver_provisioning import DriverBinary
+from utils.lean_benchmark import format_report
+
+
+class CdpRecorder:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+
+
+@pytest.mark.unit
+def test_default_profile_is_unchanged():
+    """
+    Тест проверяет, что стандартный профиль не содержит настроек облегченного режима.
+    """
+    options = build_chrome_options()
+
+    assert "--window-size=1920,1080" in options.arguments
+    assert not set(LEAN_ARGUMENTS) & set(options.arguments)
+    assert options.page_load_strategy == "normal"
+
+
+@pytest.mark.unit
+def test_lean_profile_disables_extras_and_uses_eager_load():
+    """
+    Тест проверяет, что облегченный профиль отключает картинки и фоновые службы и использует eager-загрузку.
+    """
+    options = build_chrome_options(user_data_dir="/tmp/profile", lean=True)
+
+    assert set(LEAN_ARGUMENTS) <= set(options.arguments)
+    assert "--user-data-dir=/tmp/profile" in options.arguments
+    assert options.page_load_strategy == "eager"
+    assert options.experimental_options["prefs"] == {"profile.managed_default_content_settings.images": 2}
+
+
+@pytest.mark.unit
+def test_block_requests_uses_cdp():
+    """
+    Тест проверяет блокировку лишних запросов через CDP.
+    """
+    driver = CdpRecorder()
+
+    block_requests(driver)
+
+    assert driver.commands == [("Network.enable", {}),
+                               ("Network.setBlockedURLs", {"urls": list(LEAN_BLOCKED_URLS)})]
+
+
+@pytest.mark.unit
+def test_benchmark_report_shows_relative_delta():
+    """
+    Тест проверяет формирование сравнительной таблицы бенчмарка.
+    """
+    stats = {"p50": 200.0, "p95": 400.0}
+    lean_stats = {"p50": 100.0, "p95": 300.0}
+    report = format_report({"standard": {"load_ms": stats}, "lean": {"load_ms": lean_stats}})
+
+    assert "load_ms p50" in report and "-50%" in report and "-25%" in report
+
+
+@pytest.mark.unit
+def test_session_not_created_refreshes_chromedriver_once(monkeypatch):
+    """
+    Тест проверяет, что при несовпадении версий chromedriver ищется заново и запуск повторяется один раз.
+    """
+    resolved = []
+
+    def resolve(refresh=False):
+        resolved.append(refresh)
+        return DriverBinary(f"/drivers/{refresh}", "1", "env")
+
+    monkeypatch.setattr(browser, "resolve_chromedriver", resolve)
+    started = []
+
+    def start(binary, user_data_dir, lean):
+        started.append(binary.path)
+        if len(started) == 1:
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 120")
+        return "driver"
+
+    monkeypatch.setattr(browser, "_start_chrome", start)
+
+    assert browser.create_chrome_driver() == "driver"
+    assert resolved == [False, True]
+    assert started == ["/drivers/False", "/drivers/True"]
@@ -0,0 +1,70 @@
+import pytest
+
+from pages.models import CheckoutUserData
+from utils.data_pool import UserDataPool
+
+
+@pytest.mark.unit
+def test_same_seed_replays_same_records():
+    """
+    Тест проверяет, что пул с тем же seed воспроизводит те же данные, а с другим - другие.
+    """
+    first = UserDataPool(seed=42, size=20)
+    second = UserDataPool(seed=42, size=20)
+
+    assert first.records == second.records
+    assert first.records != UserDataPool(seed=7, size=20).records
+
+
+@pytest.mark.unit
+def test_records_are_generated_once_and_handed_out_without_validation(monkeypatch):
+    """
+    Тест проверяет, что записи генерируются один раз, а модели выдаются без повторной валидации.
+    """
+    pool = UserDataPool(seed=1, size=5)
+    records = pool.records
+
+    constructed = []
+    model_construct = CheckoutUserData.model_construct
+
+    def fail_validation(*args, **kwargs):
+        raise AssertionError("модель валидируется повторно")
+
+    def spy_construct(*args, **kwargs):
+        constructed.append(kwargs)
+        return model_construct(*args, **kwargs)
+
+    # CheckoutUserData(**...) валидирует через __init__, model_validate - напрямую
+    monkeypatch.setattr(CheckoutUserData, "__init__", fail_validation)
+    monkeypatch.setattr(CheckoutUserData, "model_validate", fail_validation)
+    monkeypatch.setattr(CheckoutUserData, "model_construct", spy_construct)
+    user = pool.take()
+
+    assert pool.records is records
+    assert len(constructed) == 1
+    assert isinstance(user, CheckoutUserData)
+    assert (user.first_name, user.last_name, user.postal_code) == records[0]
+    assert all(user.first_name and user.last_name and user.postal_code for user in map(pool.get, range(5)))
+
+
+@pytest.mark.unit
+def test_take_cycles_and_for_key_is_stable():
+    """
+    Тест проверяет выдачу записей по кругу и закрепление записи за ключом.
+    """
+    pool = UserDataPool(seed=3, size=2)
+
+    taken = [pool.take() for _ in range(3)]
+
+    assert taken[0] == taken[2] != taken[1]
+    assert pool.for_key("tests/test_saucedemo.py::test_a") == UserDataPool(seed=3, size=2).for_key(
+        "tests/test_saucedemo.py::test_a")
+
+
+@pytest.mark.unit
+def test_pool_size_must_be_positive():
+    """
+    Тест проверяет, что пустой пул не создается.
+    """
+    with pytest.raises(ValueError):
+        UserDataPool(size=0)
@@ -0,0 +1,200 @@
+import os
+import subprocess
+
+import pytest
+
+from utils.dependency_index import INDEX_FILE, affected_tests, build_index, load_index
+
+BASE_PAGE = '''
+from selenium.webdriver.common.by import By
+
+
+class BasePage:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click_element(self, locator):
+        self.driver.find_element(*locator).click()
+
+    def get_text(self, locator):
+        return self.driver.find_element(*locator).text
+'''
+
+LOGIN_PAGE = '''
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+
+class LoginPage(BasePage):
+    _LOGIN_BUTTON = (By.ID, "login-button")
+    _ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
+
+    def click_login_button(self):
+        self.click_element(self._LOGIN_BUTTON)
+
+    def get_error_message(self):
+        return self.get_text(self._ERROR_MESSAGE)
+'''
+
+CART_PAGE = '''
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+
+
+class CartPage(BasePage):
+    _CHECKOUT_BUTTON = (By.ID, "checkout")
+
+    def proceed_to_checkout(self):
+        self.click_element(self._CHECKOUT_BUTTON)
+'''
+
+TESTS = '''
+from pages.cart_page import CartPage
+from pages.login_page import LoginPage
+
+
+class TestShop:
+    def test_failed_login(self, pages):
+        login_page = pages.get(LoginPage)
+        login_page.click_login_button()
+        assert login_page.get_error_message()
+
+    def test_checkout(self, driver, fast_login):
+        fast_login()
+        CartPage(driver).proceed_to_checkout()
+'''
+
+CONFTEST = '''
+import pytest
+
+
+@pytest.fixture
+def fast_login(driver):
+    from pages.login_page import LoginPage
+
+    def login():
+        LoginPage(driver).click_login_button()
+
+    return login
+'''
+
+SOURCES = {
+    os.path.join("pages", "base_page.py"): BASE_PAGE,
+    os.path.join("pages", "login_page.py"): LOGIN_PAGE,
+    os.path.join("pages", "cart_page.py"): CART_PAGE,
+    os.path.join("tests", "test_shop.py"): TESTS,
+    "conftest.py": CONFTEST,
+}
+FAILED_LOGIN = "tests/test_shop.py::TestShop::test_failed_login"
+CHECKOUT = "tests/test_shop.py::TestShop::test_checkout"
+
+
+def write_sources(root, sources):
+    for path, text in sources.items():
+        os.makedirs(os.path.join(root, os.path.dirname(path) or "."), exist_ok=True)
+        with open(os.path.join(root, path), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def git(root, *args):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+@pytest.mark.unit
+def test_index_resolves_page_methods_locators_and_fixtures():
+    """
+    Тест проверяет, что граф учитывает вызовы методов, локаторы, наследование и фикстуры.
+    """
+    tests = build_index(SOURCES)["tests"]
+
+    failed_login = tests[FAILED_LOGIN]["dependencies"]
+    assert "LoginPage._ERROR_MESSAGE" in failed_login
+    assert "BasePage.get_text" in failed_login
+    assert not any(dependency.startswith("CartPage.") for dependency in failed_login)
+    # Вход через фикстуру fast_login учитывается как зависимость от LoginPage
+    assert {"CartPage._CHECKOUT_BUTTON", "LoginPage._LOGIN_BUTTON"} <= set(tests[CHECKOUT]["dependencies"])
+    assert "LoginPage._ERROR_MESSAGE" not in tests[CHECKOUT]["dependencies"]
+
+
+@pytest.mark.unit
+def test_index_is_cached_until_sources_change(tmp_path):
+    """
+    Тест проверяет, что граф берется из кэша, пока не изменился ни один исходник.
+    """
+    write_sources(tmp_path, SOURCES)
+    first = load_index(str(tmp_path))
+    cache = tmp_path / INDEX_FILE
+    mtime = cache.stat().st_mtime_ns
+
+    assert load_index(str(tmp_path)) == first
+    assert cache.stat().st_mtime_ns == mtime
+
+    write_sources(tmp_path, {os.path.join("pages", "cart_page.py"): CART_PAGE.replace('"checkout"', '"checkout-btn"')})
+    assert load_index(str(tmp_path)) != first
+
+
+@pytest.mark.unit
+def test_changed_locator_selects_only_dependent_tests(tmp_path):
+    """
+    Тест проверяет выбор тестов по изменениям с ревизии: изменение локатора затрагивает только
+    зависящие от него тесты, изменение утилит - все тесты.
+    """
+    write_sources(tmp_path, SOURCES)
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+
+    write_sources(tmp_path, {os.path.join("pages", "cart_page.py"): CART_PAGE.replace('"checkout"', '"checkout-btn"')})
+    assert affected_tests(str(tmp_path), "HEAD")[0] == {CHECKOUT}
+
+    write_sources(tmp_path, {os.path.join("pages", "login_page.py"):
+                             LOGIN_PAGE.replace("h3[data-test='error']", "[data-test='error']")})
+    assert affected_tests(str(tmp_path), "HEAD")[0] == {CHECKOUT, FAILED_LOGIN}
+
+    write_sources(tmp_path, {os.path.join("utils", "config.py"): "BASE_URL = ''\n"})
+    assert affected_tests(str(tmp_path), "HEAD")[0] is None
+
+
+POOL_TESTS = '''
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+def test_pool_quits_drivers():
+    FakeDriver().quit()
+
+
+class TestPoolStats:
+    def make_driver(self):
+        return FakeDriver()
+
+    def test_stats(self):
+        assert self.make_driver()
+'''
+POOL = "tests/test_pool.py::test_pool_quits_drivers"
+POOL_STATS = "tests/test_pool.py::TestPoolStats::test_stats"
+
+
+@pytest.mark.unit
+def test_changed_helper_in_test_module_selects_its_tests(tmp_path):
+    """
+    Тест проверяет, что изменение фейка или хелпера в модуле тестов затрагивает все тесты этого модуля,
+    а изменение одного теста - только его.
+    """
+    pool_tests = os.path.join("tests", "test_pool.py")
+    write_sources(tmp_path, {**SOURCES, pool_tests: POOL_TESTS})
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+
+    write_sources(tmp_path, {pool_tests: POOL_TESTS.replace("        pass", "        self.closed = True")})
+    assert affected_tests(str(tmp_path), "HEAD")[0] == {POOL, POOL_STATS}
+
+    write_sources(tmp_path, {pool_tests: POOL_TESTS.replace("return FakeDriver()", "return FakeDriver() or None")})
+    assert affected_tests(str(tmp_path), "HEAD")[0] == {POOL, POOL_STATS}
+
+    write_sources(tmp_path, {pool_tests: POOL_TESTS.replace("assert self.make_driver()",
+                                                            "assert self.make_driver() is not None")})
+    assert affected_tests(str(tmp_path), "HEAD")[0] == {POOL_STATS}
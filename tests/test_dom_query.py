@@ -0,0 +1,77 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from pages.cart_page import CartPage
+from utils.dom_query import to_js_fields, to_js_locator
+
+
+class ScriptDriver:
+    """
+    Заглушка веб-драйвера, возвращающая заранее заданный результат execute_script.
+    """
+
+    def __init__(self, result):
+        self.result = result
+        self.current_url = "https://app/cart.html"
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        return self.result
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("locator, expected", [
+    ((By.ID, "checkout"), ["css", '[id="checkout"]']),
+    ((By.CLASS_NAME, "cart_item"), ["css", '[class~="cart_item"]']),
+    ((By.NAME, "user"), ["css", '[name="user"]']),
+    ((By.TAG_NAME, "button"), ["css", "button"]),
+    ((By.CSS_SELECTOR, "h3[data-test='error']"), ["css", "h3[data-test='error']"]),
+    ((By.XPATH, "//button[text()='Add to cart']"), ["xpath", "//button[text()='Add to cart']"]),
+])
+def test_to_js_locator(locator, expected):
+    """
+    Тест проверяет перевод локаторов Selenium в CSS/XPath для пакетного запроса.
+    """
+    assert to_js_locator(locator) == expected
+
+
+@pytest.mark.unit
+def test_to_js_locator_rejects_link_text():
+    """
+    Тест проверяет, что неподдерживаемая стратегия поиска приводит к понятной ошибке.
+    """
+    with pytest.raises(ValueError):
+        to_js_locator((By.LINK_TEXT, "Checkout"))
+
+
+@pytest.mark.unit
+def test_to_js_fields_supports_text_and_attributes():
+    """
+    Тест проверяет разбор описаний полей: текст дочернего элемента, атрибут дочернего элемента
+    и атрибут самого контейнера.
+    """
+    fields = {
+        "name": (By.CLASS_NAME, "inventory_item_name"),
+        "button_id": ((By.TAG_NAME, "button"), "id"),
+        "item_class": (None, "class"),
+    }
+
+    assert to_js_fields(fields) == [
+        ["name", ["css", '[class~="inventory_item_name"]'], "text"],
+        ["button_id", ["css", "button"], "id"],
+        ["item_class", None, "class"],
+    ]
+
+
+@pytest.mark.unit
+def test_cart_item_names_use_single_round_trip():
+    """
+    Тест проверяет, что названия товаров корзины собираются одним вызовом execute_script.
+    """
+    driver = ScriptDriver([{"name": f"Item {index}"} for index in range(100)])
+
+    names = CartPage(driver).get_item_names_in_cart()
+
+    assert names == [f"Item {index}" for index in range(100)]
+    assert len(driver.scripts) == 1
@@ -0,0 +1,96 @@
+import pytest
+
+from utils.driver_pool import DriverPool
+
+
+class FakeDriver:
+    """
+    Заглушка веб-драйвера, запоминающая вызовы сброса состояния.
+    """
+
+    def __init__(self, fail_on_reset=False):
+        self.fail_on_reset = fail_on_reset
+        self.calls = []
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if self.fail_on_reset:
+            raise RuntimeError("browser crashed")
+        self.calls.append("execute_script")
+
+    def delete_all_cookies(self):
+        self.calls.append("delete_all_cookies")
+
+    def get(self, url):
+        self.calls.append(f"get {url}")
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.mark.unit
+def test_driver_pool_reuses_browser_between_tests():
+    """
+    Тест проверяет, что браузер переиспользуется и сбрасывается между тестами.
+    """
+    created = []
+    pool = DriverPool(lambda: created.append(FakeDriver()) or created[-1], size=1)
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert first is second
+    assert len(created) == 1
+    assert first.calls == ["execute_script", "delete_all_cookies", "get about:blank"]
+    assert (pool.stats.hits, pool.stats.misses, pool.stats.resets) == (1, 1, 1)
+
+
+@pytest.mark.unit
+def test_driver_pool_recycles_after_max_uses():
+    """
+    Тест проверяет, что браузер пересоздается после исчерпания лимита использований.
+    """
+    pool = DriverPool(FakeDriver, size=1, max_uses=2)
+
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)
+
+    assert first.quit_called
+    assert pool.acquire() is not first
+    assert pool.stats.recycled_by_uses == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("fail_on_reset, broken", [(True, False), (False, True)])
+def test_driver_pool_recycles_crashed_browser(fail_on_reset, broken):
+    """
+    Тест проверяет, что упавший браузер не возвращается в пул.
+    """
+    pool = DriverPool(lambda: FakeDriver(fail_on_reset=fail_on_reset), size=1)
+
+    first = pool.acquire()
+    pool.release(first, broken=broken)
+
+    assert first.quit_called
+    assert pool.acquire() is not first
+    assert pool.stats.recycled_by_crash == 1
+
+
+@pytest.mark.unit
+def test_driver_pool_close_quits_all_browsers():
+    """
+    Тест проверяет, что закрытие пула завершает и свободные, и занятые браузеры.
+    """
+    pool = DriverPool(FakeDriver, size=2)
+    idle = pool.acquire()
+    busy = pool.acquire()
+    pool.release(idle)
+
+    pool.close()
+
+    assert idle.quit_called and busy.quit_called
+    with pytest.raises(RuntimeError):
+        pool.acquire()
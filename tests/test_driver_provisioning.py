@@ -0,0 +1,137 @@
+import json
+import os
+import stat
+
+import pytest
+
+from utils import driver_provisioning
+from utils.driver_provisioning import DriverProvisioningError, file_lock, resolve_chromedriver
+
+
+@pytest.fixture
+def fake_chromedriver(tmp_path):
+    """
+    Фикстура создает исполняемую заглушку chromedriver, печатающую свою версию.
+    """
+    path = tmp_path / "chromedriver"
+    path.write_text("#!/bin/sh\necho 'ChromeDriver 120.0.6099.109 (abc)'\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch):
+    """
+    Фикстура сбрасывает кэш процесса и переменные окружения провижининга
+    и скрывает установленный Chrome, чтобы результат не зависел от машины.
+    """
+    monkeypatch.setattr(driver_provisioning, "_resolved", None)
+    monkeypatch.setattr(driver_provisioning, "browser_version", lambda: "unknown")
+    for name in (driver_provisioning.ENV_DRIVER_PATH, driver_provisioning.ENV_OFFLINE,
+                 driver_provisioning.ENV_MANIFEST, driver_provisioning.ENV_REFRESH):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.unit
+def test_resolve_from_env_writes_manifest(tmp_path, monkeypatch, fake_chromedriver):
+    """
+    Тест проверяет, что путь из окружения сохраняется в манифест вместе с версией.
+    """
+    manifest = tmp_path / "drivers" / "chromedriver.json"
+    monkeypatch.setenv(driver_provisioning.ENV_DRIVER_PATH, fake_chromedriver)
+
+    binary = resolve_chromedriver(str(manifest))
+
+    assert (binary.path, binary.version, binary.source) == (fake_chromedriver, "120.0.6099.109", "env")
+    assert json.loads(manifest.read_text())["path"] == fake_chromedriver
+    assert not os.path.exists(f"{manifest}.lock")
+
+
+@pytest.mark.unit
+def test_resolve_uses_manifest_without_lookup(tmp_path, monkeypatch, fake_chromedriver):
+    """
+    Тест проверяет, что при валидном манифесте chromedriver не ищется повторно.
+    """
+    manifest = tmp_path / "chromedriver.json"
+    manifest.write_text(json.dumps({"path": fake_chromedriver, "version": "1.0", "source": "system"}))
+    monkeypatch.setattr(driver_provisioning, "_locate", lambda: pytest.fail("manifest was ignored"))
+
+    binary = resolve_chromedriver(str(manifest))
+
+    assert binary.version == "1.0"
+    assert resolve_chromedriver() is binary
+
+
+@pytest.mark.unit
+def test_manifest_is_refreshed_after_chrome_update(tmp_path, monkeypatch, fake_chromedriver):
+    """
+    Тест проверяет, что после обновления Chrome до новой основной версии chromedriver ищется заново,
+    а в манифест записывается новая версия браузера.
+    """
+    manifest = tmp_path / "chromedriver.json"
+    manifest.write_text(json.dumps({"path": fake_chromedriver, "version": "120.0.6099.109", "source": "system",
+                                    "browser_version": "120.0.6099.130"}))
+    monkeypatch.setattr(driver_provisioning, "browser_version", lambda: "121.0.6167.85")
+    located = driver_provisioning.DriverBinary(fake_chromedriver, "121.0.6167.85", "webdriver_manager")
+    monkeypatch.setattr(driver_provisioning, "_locate", lambda: located)
+
+    binary = resolve_chromedriver(str(manifest))
+
+    assert (binary.version, binary.browser_version) == ("121.0.6167.85", "121.0.6167.85")
+    assert json.loads(manifest.read_text())["browser_version"] == "121.0.6167.85"
+
+
+@pytest.mark.unit
+def test_manifest_is_kept_within_chrome_major_version(tmp_path, monkeypatch, fake_chromedriver):
+    """
+    Тест проверяет, что обновление Chrome внутри основной версии не сбрасывает манифест.
+    """
+    manifest = tmp_path / "chromedriver.json"
+    manifest.write_text(json.dumps({"path": fake_chromedriver, "version": "120.0.6099.109", "source": "system",
+                                    "browser_version": "120.0.6099.130"}))
+    monkeypatch.setattr(driver_provisioning, "browser_version", lambda: "120.0.6099.224")
+    monkeypatch.setattr(driver_provisioning, "_locate", lambda: pytest.fail("manifest was ignored"))
+
+    assert resolve_chromedriver(str(manifest)).version == "120.0.6099.109"
+
+
+@pytest.mark.unit
+def test_refresh_env_ignores_manifest_once(tmp_path, monkeypatch, fake_chromedriver):
+    """
+    Тест проверяет, что CHROMEDRIVER_REFRESH=1 заставляет найти chromedriver заново при первом поиске в процессе.
+    """
+    manifest = tmp_path / "chromedriver.json"
+    manifest.write_text(json.dumps({"path": fake_chromedriver, "version": "1.0", "source": "system"}))
+    monkeypatch.setenv(driver_provisioning.ENV_REFRESH, "1")
+    calls = []
+    monkeypatch.setattr(driver_provisioning, "_locate",
+                        lambda: calls.append(1) or driver_provisioning.DriverBinary(fake_chromedriver, "2.0", "system"))
+
+    assert resolve_chromedriver(str(manifest)).version == "2.0"
+    assert resolve_chromedriver(str(manifest)).version == "2.0"
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_resolve_offline_without_binary_fails(tmp_path, monkeypatch):
+    """
+    Тест проверяет, что в офлайн-режиме без бинарника возникает понятная ошибка, а не сетевой запрос.
+    """
+    monkeypatch.setenv(driver_provisioning.ENV_OFFLINE, "1")
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    with pytest.raises(DriverProvisioningError):
+        resolve_chromedriver(str(tmp_path / "chromedriver.json"))
+
+
+@pytest.mark.unit
+def test_file_lock_times_out_when_held(tmp_path):
+    """
+    Тест проверяет, что занятая блокировка не захватывается повторно.
+    """
+    lock_path = str(tmp_path / "manifest.lock")
+    with file_lock(lock_path):
+        with pytest.raises(DriverProvisioningError):
+            with file_lock(lock_path, timeout=0.1):
+                pass
+    assert not os.path.exists(lock_path)
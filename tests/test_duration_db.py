@@ -0,0 +1,176 @@
+from types import SimpleNamespace
+
+import pytest
+
+import utils.duration_db as duration_db
+from utils.duration_db import DurationHistory, DurationHistoryPlugin, load_history_durations, top_level_steps
+
+STEP = "CheckoutStepOnePage.fill_user_information"
+
+
+def _record(history, seconds, step_seconds=None, outcome="passed"):
+    steps = {"test_checkout": {STEP: step_seconds}} if step_seconds is not None else None
+    return history.record_run({"test_checkout": (seconds, outcome)}, steps)
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = DurationHistory(str(tmp_path / "history.sqlite"))
+    yield history
+    history.close()
+
+
+@pytest.mark.unit
+def test_durations_are_median_of_recent_passed_runs(history):
+    """
+    Тест проверяет, что ожидаемая длительность - медиана последних успешных прогонов,
+    а упавшие прогоны и прогоны за пределами окна не учитываются.
+    """
+    for seconds in (100.0, 2.0, 3.0, 4.0):
+        _record(history, seconds)
+    _record(history, 50.0, outcome="failed")
+
+    assert history.durations(window=3) == {"test_checkout": 3.0}
+
+
+@pytest.mark.unit
+def test_step_regression_against_rolling_baseline(history):
+    """
+    Тест проверяет, что шаг, ставший на 30% медленнее медианы прошлых прогонов, попадает в регрессии.
+    """
+    for step_seconds in (1.0, 1.1, 0.9):
+        _record(history, 5.0, step_seconds)
+
+    run = _record(history, 5.1, 1.4)
+
+    regressions = history.regressions(run, threshold=0.3)
+    assert [(regression.kind, regression.name) for regression in regressions] == [("step", STEP)]
+    assert regressions[0].baseline == 1.0
+    assert "+40%" in regressions[0].format()
+
+
+@pytest.mark.unit
+def test_steps_of_failed_tests_are_ignored(history):
+    """
+    Тест проверяет, что шаг упавшего теста (например, ожидание до таймаута) не считается регрессией
+    и не попадает в базовую длительность следующих прогонов.
+    """
+    for step_seconds in (1.0, 1.1, 0.9):
+        _record(history, 5.0, step_seconds)
+
+    failed_run = _record(history, 15.0, 10.0, outcome="failed")
+    assert history.regressions(failed_run) == []
+
+    run = _record(history, 5.1, 1.4)
+    assert [regression.baseline for regression in history.regressions(run)] == [1.0]
+
+
+@pytest.mark.unit
+def test_no_regression_without_enough_history_or_below_threshold(history):
+    """
+    Тест проверяет, что замедление не отмечается при малой истории и при замедлении ниже порога.
+    """
+    _record(history, 1.0, 1.0)
+    run = _record(history, 3.0, 3.0)
+    assert history.regressions(run) == []
+
+    _record(history, 1.0, 1.0)
+    run = _record(history, 1.2, 1.2)
+    assert history.regressions(run) == []
+
+
+@pytest.mark.unit
+def test_old_runs_are_pruned(history, monkeypatch):
+    """
+    Тест проверяет, что в базе остаются только последние KEEP_RUNS прогонов.
+    """
+    monkeypatch.setattr(duration_db, "KEEP_RUNS", 2)
+    for seconds in (1.0, 2.0, 3.0):
+        _record(history, seconds, seconds)
+
+    assert history._connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+    assert history._connection.execute("SELECT COUNT(*) FROM steps").fetchone()[0] == 2
+    assert history.durations() == {"test_checkout": 2.5}
+
+
+@pytest.mark.unit
+def test_plugin_records_reports_and_prints_regressions(tmp_path):
+    """
+    Тест проверяет, что плагин суммирует фазы теста, сохраняет исход и длительности шагов
+    и выводит найденные регрессии в итоговой сводке.
+    """
+    path = str(tmp_path / "history.sqlite")
+    history = DurationHistory(path)
+    for _ in range(3):
+        _record(history, 1.0, 0.5)
+    history.close()
+
+    plugin = DurationHistoryPlugin(path)
+    for when, duration in (("setup", 0.5), ("call", 1.5), ("teardown", 0.2)):
+        report = SimpleNamespace(nodeid="test_checkout", when=when, duration=duration, failed=False, skipped=False)
+        if when == "call":
+            report.step_durations = {STEP: 1.0}
+            report.uses_driver = True
+        plugin.pytest_runtest_logreport(report)
+    plugin.pytest_sessionfinish()
+
+    lines = []
+    reporter = SimpleNamespace(write_sep=lambda sep, title: lines.append(title), write_line=lines.append)
+    plugin.pytest_terminal_summary(reporter)
+
+    assert plugin.tests == {"test_checkout": (pytest.approx(2.2), "passed")}
+    assert lines[0].startswith("performance regressions")
+    assert any(line.startswith(f"step {STEP}") for line in lines)
+    assert any(line.startswith("test test_checkout") for line in lines)
+    assert load_history_durations(path) == {"test_checkout": 1.0}
+
+
+@pytest.mark.unit
+def test_unit_only_run_is_recorded_without_regressions(tmp_path):
+    """
+    Тест проверяет, что прогон без тестов с браузером записывается в историю, но регрессии не ищутся.
+    """
+    path = str(tmp_path / "history.sqlite")
+    history = DurationHistory(path)
+    for _ in range(3):
+        _record(history, 0.01)
+    history.close()
+
+    plugin = DurationHistoryPlugin(path)
+    plugin.pytest_runtest_logreport(SimpleNamespace(nodeid="test_checkout", when="call", duration=0.5,
+                                                    failed=False, skipped=False, uses_driver=False))
+    plugin.pytest_sessionfinish()
+
+    assert plugin.flagged == []
+    assert load_history_durations(path) == {"test_checkout": 0.01}
+    history = DurationHistory(path)
+    assert history._connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 4
+    history.close()
+
+
+@pytest.mark.unit
+def test_only_top_level_page_steps_are_recorded():
+    """
+    Тест проверяет, что в шаги попадают только вызовы страниц из тела теста: вложенные вызовы
+    и ожидания уже входят в их длительность, а ожидания верхнего уровня шагами не считаются.
+    """
+    tree = [
+        {"name": STEP, "kind": "page", "duration": 1.0, "children": [
+            {"name": "BasePage.fill", "kind": "page", "duration": 0.6, "children": [
+                {"name": "wait visible", "kind": "wait", "duration": 0.4}]}]},
+        {"name": "wait visible", "kind": "wait", "duration": 0.2},
+        {"name": STEP, "kind": "page", "duration": 0.5},
+    ]
+
+    assert top_level_steps(tree) == {STEP: 1.5}
+
+
+@pytest.mark.unit
+def test_load_history_durations_without_database(tmp_path):
+    """
+    Тест проверяет, что без базы ожидаемые длительности пусты, а файл базы не создается.
+    """
+    path = tmp_path / "missing.sqlite"
+
+    assert load_history_durations(str(path)) == {}
+    assert not path.exists()
@@ -0,0 +1,147 @@
+import io
+import os
+import threading
+
+import pytest
+
+from utils import failure_artifacts as module
+from utils.failure_artifacts import FailureArtifacts, encode_screenshot
+
+
+class FakeDriver:
+    def __init__(self, fail_logs=False):
+        self.calls = []
+        self.fail_logs = fail_logs
+
+    def get_screenshot_as_png(self):
+        self.calls.append("screenshot")
+        return b"png-bytes"
+
+    @property
+    def page_source(self):
+        self.calls.append("page_source")
+        return "<html><body>страница</body></html>"
+
+    def get_log(self, log_type):
+        self.calls.append(log_type)
+        if self.fail_logs:
+            raise RuntimeError("логи недоступны")
+        return [{"level": "SEVERE", "message": "Uncaught TypeError"}]
+
+
+@pytest.fixture
+def collector():
+    artifacts = FailureArtifacts(image_format="png")
+    artifacts.start_test()
+    yield artifacts
+    artifacts.shutdown()
+
+
+@pytest.mark.unit
+def test_capture_happens_once_per_test(collector):
+    """
+    Тест проверяет, что повторный запрос артефактов в рамках теста не обращается к браузеру.
+    """
+    driver = FakeDriver()
+
+    assert collector.capture(driver, "screenshot_on_error") is True
+    assert collector.capture(driver, "screenshot_on_failure") is False
+
+    assert driver.calls == ["screenshot", "page_source", "browser"]
+    assert [artifact.name for artifact in collector.collect()] == ["screenshot_on_error", "dom_snapshot",
+                                                                   "browser_console"]
+
+
+@pytest.mark.unit
+def test_start_test_resets_capture(collector):
+    """
+    Тест проверяет, что в следующем тесте артефакты снимаются заново, а очередь очищается.
+    """
+    driver = FakeDriver()
+    collector.capture(driver, "screenshot_on_error")
+    collector.start_test()
+
+    assert collector.collect() == []
+    assert collector.capture(driver, "screenshot_on_failure") is True
+
+
+@pytest.mark.unit
+def test_encoding_runs_in_background_thread(collector, monkeypatch):
+    """
+    Тест проверяет, что сжатие скриншота выполняется не в потоке теста.
+    """
+    threads = []
+
+    def fake_encode(png, image_format, quality):
+        threads.append(threading.current_thread().name)
+        return png, "image/png", "png"
+
+    monkeypatch.setattr(module, "encode_screenshot", fake_encode)
+    collector.capture(FakeDriver(), "screenshot_on_error")
+    collector.collect()
+
+    assert threads and threads[0].startswith("failure-artifacts")
+
+
+@pytest.mark.unit
+def test_unavailable_console_log_is_skipped(collector):
+    """
+    Тест проверяет, что ошибка получения логов консоли не мешает сохранить остальные артефакты.
+    """
+    collector.capture(FakeDriver(fail_logs=True), "screenshot_on_error")
+
+    assert [artifact.name for artifact in collector.collect()] == ["screenshot_on_error", "dom_snapshot"]
+
+
+@pytest.mark.unit
+def test_flush_attaches_spooled_files_and_removes_them(collector, monkeypatch):
+    """
+    Тест проверяет, что артефакты прикладываются к отчету файлами, которые затем удаляются.
+    """
+    attached = []
+
+    def fake_attach_file(source, name=None, attachment_type=None, extension=None):
+        with open(source, "rb") as f:
+            attached.append((name, f.read(), attachment_type, extension, source))
+
+    monkeypatch.setattr(module.allure.attach, "file", fake_attach_file)
+    collector.capture(FakeDriver(), "screenshot_on_error")
+    collector.flush()
+
+    assert [row[:4] for row in attached[:1]] == [("screenshot_on_error", b"png-bytes", "image/png", "png")]
+    assert attached[1][2] == "text/html"
+    assert not any(os.path.exists(row[4]) for row in attached)
+
+
+@pytest.mark.unit
+def test_png_is_kept_without_pillow(monkeypatch):
+    """
+    Тест проверяет, что без Pillow скриншот сохраняется в исходном PNG.
+    """
+    monkeypatch.setattr(module, "Image", None)
+
+    assert encode_screenshot(b"png-bytes", "webp", 50) == (b"png-bytes", "image/png", "png")
+
+
+@pytest.mark.unit
+def test_screenshot_is_compressed_with_pillow():
+    """
+    Тест проверяет, что при наличии Pillow скриншот перекодируется в JPEG.
+    """
+    image_module = pytest.importorskip("PIL.Image")
+    png = io.BytesIO()
+    image_module.new("RGBA", (40, 40), (200, 30, 30, 255)).save(png, "PNG")
+
+    body, mime_type, extension = encode_screenshot(png.getvalue(), "jpeg", 60)
+
+    assert (mime_type, extension) == ("image/jpeg", "jpg")
+    assert body.startswith(b"\xff\xd8")
+
+
+@pytest.mark.unit
+def test_unknown_format_is_rejected(collector):
+    """
+    Тест проверяет, что неизвестный формат скриншотов отклоняется.
+    """
+    with pytest.raises(ValueError):
+        collector.configure(image_format="bmp")
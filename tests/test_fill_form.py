@@ -0,0 +1,104 @@
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from pages.base_page import BasePage
+from pages.checkout_step_one_page import CheckoutStepOnePage
+from pages.models import CheckoutUserData
+from utils.dom_query import FILL_FORM_SCRIPT
+from utils.failure_artifacts import failure_artifacts
+from utils.wait_engine import OBSERVE_SCRIPT
+
+USER = CheckoutUserData(first_name="John", last_name="Doe", postal_code="12345")
+
+
+class InputElement:
+    def __init__(self):
+        self.typed = []
+
+    def clear(self):
+        pass
+
+    def send_keys(self, text):
+        self.typed.append(text)
+
+
+class FormDriver:
+    """
+    Заглушка веб-драйвера, записывающая асинхронные скрипты. Скрипт заполнения формы
+    возвращает fill_result или бросает fill_error; ожидания элементов возвращают поле ввода.
+    """
+
+    def __init__(self, fill_result=None, fill_error=None):
+        self.fill_result = fill_result
+        self.fill_error = fill_error
+        self.element = InputElement()
+        self.calls = []
+
+    def execute_async_script(self, script, *args):
+        self.calls.append((script, args))
+        if script == FILL_FORM_SCRIPT:
+            if self.fill_error:
+                raise self.fill_error
+            return self.fill_result
+        return True if args[3:] == ("click",) else self.element
+
+
+@pytest.mark.unit
+def test_checkout_form_is_filled_in_one_round_trip():
+    """
+    Тест проверяет, что форма первого шага чекаута заполняется одним вызовом WebDriver.
+    """
+    driver = FormDriver()
+
+    CheckoutStepOnePage(driver).fill_user_information(USER)
+
+    assert len(driver.calls) == 1
+    script, (fields, timeout_ms) = driver.calls[0]
+    assert script == FILL_FORM_SCRIPT
+    assert fields == [[["css", '[id="first-name"]'], "John"], [["css", '[id="last-name"]'], "Doe"],
+                      [["css", '[id="postal-code"]'], "12345"]]
+
+
+@pytest.mark.unit
+def test_real_keys_and_script_failure_fall_back_to_keystrokes():
+    """
+    Тест проверяет ввод настоящими нажатиями клавиш по опции и при ошибке скрипта на странице.
+    """
+    driver = FormDriver()
+    CheckoutStepOnePage(driver).fill_user_information(USER, real_keys=True)
+
+    assert FILL_FORM_SCRIPT not in [script for script, _ in driver.calls]
+    assert driver.element.typed == ["John", "Doe", "12345"]
+
+    driver = FormDriver(fill_error=JavascriptException("CSP"))
+    CheckoutStepOnePage(driver).fill_user_information(USER)
+
+    assert driver.element.typed == ["John", "Doe", "12345"]
+
+
+@pytest.mark.unit
+def test_unavailable_fields_raise_timeout(monkeypatch):
+    """
+    Тест проверяет, что поля, не ставшие доступными, приводят к TimeoutException с их локаторами
+    и снятию артефактов падения.
+    """
+    captured = []
+    monkeypatch.setattr(failure_artifacts, "capture", lambda driver, reason: captured.append(reason))
+    driver = FormDriver(fill_result=[1])
+
+    with pytest.raises(TimeoutException, match="last-name"):
+        CheckoutStepOnePage(driver).fill_user_information(USER)
+    assert captured == ["screenshot_on_error"]
+
+
+@pytest.mark.unit
+def test_js_click_waits_and_clicks_in_one_call():
+    """
+    Тест проверяет, что ожидание и клик через JavaScript выполняются одним вызовом.
+    """
+    driver = FormDriver()
+
+    BasePage(driver, "https://app/").js_click_element((By.ID, "finish"))
+
+    assert driver.calls == [(OBSERVE_SCRIPT, (["css", '[id="finish"]'], "visible", 10000, "click"))]
@@ -0,0 +1,54 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули, которые загружает запуск юнит-тестов: conftest и пакет страниц
+UNIT_IMPORTS = ("conftest", "pages", "utils.logger")
+# Браузерный стек нужен только E2E-фикстурам, генерация и проверка тестовых данных - фикстуре пула данных
+DEFERRED_MODULES = ("selenium", "webdriver_manager", "pages.base_page", "pydantic", "faker")
+# Бюджет на импорт модулей проекта сверх pytest и allure, мс
+DEFAULT_BUDGET_MS = 400
+
+
+def _import_profile():
+    """
+    Импортирует модули юнит-запуска в отдельном процессе с -X importtime.
+    :return: (время импорта модулей проекта в мс, список загруженных отложенных модулей, открыт ли лог)
+    """
+    code = (
+        "import sys, pytest, allure\n"
+        f"import {', '.join(UNIT_IMPORTS)}\n"
+        f"print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])\n"
+        "import logging\n"
+        "print(any(isinstance(h, logging.FileHandler) for h in logging.getLogger().handlers))\n"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT_DIR,
+                            capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)", line)
+        # Учитываются только модули верхнего уровня, вложенные уже входят в их суммарное время
+        if match and not match.group(2):
+            cumulative[match.group(3)] = int(match.group(1))
+    total_ms = sum(cumulative.get(name, 0) for name in UNIT_IMPORTS) / 1000
+    deferred_modules, file_logging = result.stdout.splitlines()
+    return total_ms, deferred_modules, file_logging == "True"
+
+
+@pytest.mark.unit
+def test_unit_startup_stays_within_import_budget():
+    """
+    Тест проверяет, что запуск юнит-тестов не загружает браузерный стек и pydantic, не настраивает
+    запись в test_run.log и укладывается в бюджет времени импорта (IMPORT_TIME_BUDGET_MS).
+    """
+    budget_ms = float(os.getenv("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS))
+    total_ms, deferred_modules, file_logging = _import_profile()
+
+    assert deferred_modules == "[]"
+    assert not file_logging
+    assert total_ms < budget_ms, f"Импорт модулей проекта занял {total_ms:.0f} мс (бюджет {budget_ms:.0f} мс)"
@@ -0,0 +1,85 @@
+import pytest
+
+from pages.inventory_page import InventoryPage
+from utils.dom_query import QUERY_ALL_SCRIPT
+
+CATALOG = ["Backpack", "Bike Light", "Bolt T-Shirt", "Fleece Jacket"]
+
+
+class CatalogElement:
+    def __init__(self, driver, position):
+        self.driver = driver
+        self.position = position
+
+    def click(self):
+        self.driver.clicks.append(self.position)
+        self.driver.in_cart.add(self.position)
+
+
+class CatalogDriver:
+    """
+    Заглушка веб-драйвера со страницей каталога: считает запросы и клики по кнопкам.
+    """
+
+    def __init__(self, in_cart=()):
+        self.current_url = "https://app/inventory.html"
+        self.in_cart = set(in_cart)
+        self.clicks = []
+        self.queries = 0
+        self.lookups = []
+
+    def execute_script(self, script, *args):
+        if script == QUERY_ALL_SCRIPT:
+            self.queries += 1
+            return [{"name": name, "price": "$1", "button": "Remove" if position in self.in_cart else "Add to cart"}
+                    for position, name in enumerate(CATALOG)]
+        return len(self.in_cart)
+
+    def find_elements(self, by, value):
+        self.lookups.append((by, value))
+        if (by, value) == InventoryPage._ADD_TO_CART_BUTTON:
+            return [CatalogElement(self, position) for position in range(len(CATALOG)) if position not in self.in_cart]
+        # Остальные кнопки товаров, включая "Remove"
+        return [CatalogElement(self, position) for position in range(len(CATALOG))]
+
+
+@pytest.mark.unit
+def test_add_items_to_cart_clicks_once_per_item_in_catalog_order():
+    """
+    Тест проверяет, что товары по индексам и названиям добавляются за один проход
+    в порядке каталога, а уже лежащие в корзине пропускаются.
+    """
+    driver = CatalogDriver(in_cart={1})
+
+    count = InventoryPage(driver).add_items_to_cart(["Fleece Jacket", 0, 1, "Backpack"])
+
+    assert count == 3
+    assert driver.clicks == [0, 3]
+    assert driver.queries == 1
+    assert driver.lookups == [InventoryPage._ADD_TO_CART_BUTTON]
+
+
+@pytest.mark.unit
+def test_add_items_to_cart_without_new_items_does_not_look_up_buttons():
+    """
+    Тест проверяет, что если все товары уже в корзине, кнопки не запрашиваются и кликов нет.
+    """
+    driver = CatalogDriver(in_cart={0, 2})
+
+    assert InventoryPage(driver).add_items_to_cart([0, "Bolt T-Shirt"]) == 2
+    assert (driver.clicks, driver.lookups) == ([], [])
+
+
+@pytest.mark.unit
+def test_add_items_to_cart_rejects_unknown_items():
+    """
+    Тест проверяет, что неизвестные товары и индексы вне каталога не приводят к кликам.
+    """
+    driver = CatalogDriver()
+    page = InventoryPage(driver)
+
+    with pytest.raises(ValueError, match="Onesie"):
+        page.add_items_to_cart([0, "Onesie"])
+    with pytest.raises(IndexError):
+        page.add_items_to_cart([len(CATALOG)])
+    assert driver.clicks == []
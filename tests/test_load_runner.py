@@ -0,0 +1,196 @@
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+
+import utils.load_runner as load_runner
+from utils.data_pool import UserDataPool
+from utils.failure_artifacts import failure_artifacts
+from utils.load_runner import LatencyHistogram, LoadRunner, browser_lost, format_report
+
+
+class FakeDriver:
+    pass
+
+
+class FakePool:
+    """
+    Пул без браузеров: выдает объекты-заглушки и запоминает, какие вернулись сломанными.
+    """
+
+    def __init__(self, failures=0):
+        self.acquired = 0
+        self.broken = 0
+        self.failures = failures
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("chrome failed to start")
+            self.acquired += 1
+        return FakeDriver()
+
+    def release(self, driver, broken=False):
+        with self._lock:
+            self.broken += broken
+
+
+def sleeping_step(seconds):
+    def step(driver, user_data):
+        time.sleep(seconds)
+    return step
+
+
+@pytest.mark.unit
+def test_histogram_buckets_and_percentiles():
+    """
+    Тест проверяет раскладку задержек по корзинам и расчет p99.
+    """
+    histogram = LatencyHistogram()
+    for seconds in (0.01, 0.07, 0.2, 20):
+        histogram.record(seconds)
+
+    row = histogram.to_dict()
+
+    assert row["count"] == 4
+    assert row["p99"] == 20000
+    assert row["histogram_ms"]["<=50"] == 1
+    assert row["histogram_ms"]["<=100"] == 1
+    assert row["histogram_ms"]["<=250"] == 1
+    assert row["histogram_ms"][">10000"] == 1
+
+
+@pytest.mark.unit
+def test_virtual_users_run_checkouts_until_duration():
+    """
+    Тест проверяет, что пользователи параллельно повторяют цикл до окончания прогона
+    и каждый шаг замеряется для каждого заказа.
+    """
+    pool = FakePool()
+    steps = (("login", sleeping_step(0.01)), ("finish", sleeping_step(0.01)))
+    runner = LoadRunner(pool, users=3, duration=0.3, data_pool=UserDataPool(size=5), steps=steps)
+
+    stats = runner.run()
+
+    assert stats.checkouts >= 6
+    assert stats.checkouts == pool.acquired
+    assert stats.steps["login"].to_dict()["count"] == stats.checkouts
+    assert stats.checkouts_per_minute > 0
+    assert "checkouts:" in format_report(stats)
+
+
+@pytest.mark.unit
+def test_ramp_up_delays_later_users():
+    """
+    Тест проверяет, что при разгоне последний пользователь стартует позже первого.
+    """
+    started = {}
+
+    def record_start(driver, user_data):
+        started.setdefault(threading.current_thread().name, time.monotonic())
+
+    runner = LoadRunner(FakePool(), users=2, duration=0.3, ramp_up=0.2, data_pool=UserDataPool(size=5),
+                        steps=(("login", record_start),))
+    runner.run()
+
+    assert started["virtual-user-1"] - started["virtual-user-0"] >= 0.09
+
+
+@pytest.mark.unit
+def test_failed_step_counts_error_and_returns_broken_browser():
+    """
+    Тест проверяет, что ошибка шага из-за потерянной сессии учитывается, заказ не засчитывается,
+    а браузер возвращается как сломанный.
+    """
+    def fail(driver, user_data):
+        time.sleep(0.01)
+        raise InvalidSessionIdException("invalid session id")
+
+    pool = FakePool()
+    runner = LoadRunner(pool, users=1, duration=0.1, data_pool=UserDataPool(size=5),
+                        steps=(("login", sleeping_step(0)), ("finish", fail)))
+
+    stats = runner.run()
+
+    assert stats.checkouts == 0
+    assert stats.errors["finish"] == pool.broken == pool.acquired > 0
+    assert stats.steps["finish"].to_dict()["count"] == 0
+
+
+@pytest.mark.unit
+def test_driver_start_failure_is_counted_and_user_keeps_running(monkeypatch):
+    """
+    Тест проверяет, что ошибка запуска браузера учитывается в статистике,
+    а виртуальный пользователь после паузы продолжает оформлять заказы.
+    """
+    monkeypatch.setattr(load_runner, "ACQUIRE_BACKOFF", 0.01)
+    pool = FakePool(failures=2)
+    runner = LoadRunner(pool, users=1, duration=0.2, data_pool=UserDataPool(size=5),
+                        steps=(("login", sleeping_step(0.01)),))
+
+    stats = runner.run()
+
+    assert stats.driver_errors == 2
+    assert stats.checkouts == pool.acquired > 0
+    assert "driver errors: 2" in format_report(stats)
+
+
+@pytest.mark.unit
+def test_failure_artifacts_are_reset_for_each_iteration(monkeypatch):
+    """
+    Тест проверяет, что артефакты падения снимаются в каждой неудачной итерации,
+    а не только в первой, и собранные артефакты выгружаются после каждой итерации.
+    """
+    captured = []
+    flushed = []
+    monkeypatch.setattr(failure_artifacts, "_encode", lambda *args: ["screenshot"])
+    monkeypatch.setattr(failure_artifacts, "flush", lambda: flushed.append(len(failure_artifacts.collect())))
+
+    def fail(driver, user_data):
+        driver.get_screenshot_as_png = lambda: b""
+        driver.page_source = ""
+        driver.get_log = lambda kind: []
+        captured.append(failure_artifacts.capture(driver, "screenshot_on_error"))
+        raise RuntimeError("timeout")
+
+    runner = LoadRunner(FakePool(), users=1, duration=0.1, data_pool=UserDataPool(size=5),
+                        steps=(("finish", fail),))
+
+    runner.run()
+
+    assert len(captured) > 1 and all(captured)
+    assert flushed == [1] * len(captured)
+
+
+@pytest.mark.unit
+def test_application_failure_keeps_browser_in_pool():
+    """
+    Тест проверяет, что таймаут локатора или неверное сообщение учитываются как ошибки шага,
+    а браузер возвращается в пул исправным.
+    """
+    def fail(driver, user_data):
+        time.sleep(0.01)
+        raise TimeoutException("locator timeout")
+
+    pool = FakePool()
+    runner = LoadRunner(pool, users=1, duration=0.1, data_pool=UserDataPool(size=5), steps=(("finish", fail),))
+
+    stats = runner.run()
+
+    assert stats.errors["finish"] == pool.acquired > 0
+    assert pool.broken == 0
+
+
+@pytest.mark.unit
+def test_browser_lost_only_for_session_and_connection_errors():
+    """
+    Тест проверяет, какие ошибки считаются потерей браузера.
+    """
+    assert browser_lost(InvalidSessionIdException("invalid session id"))
+    assert browser_lost(WebDriverException("chrome not reachable"))
+    assert browser_lost(ConnectionRefusedError())
+    assert not browser_lost(TimeoutException("timeout"))
+    assert not browser_lost(AssertionError("Неверное сообщение о завершении заказа"))
@@ -0,0 +1,72 @@
+import logging
+import queue
+
+import pytest
+
+from utils.logger import DeferredQueueHandler, TruncatedRepr, log_decorator, logger
+
+
+class CountingRepr:
+    """
+    Объект, считающий, сколько раз у него запрашивали repr.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "CountingRepr"
+
+
+class Page:
+    def __init__(self, result):
+        self.result = result
+
+    @log_decorator
+    def action(self):
+        return self.result
+
+
+@pytest.mark.unit
+def test_truncated_repr_limits_large_results():
+    """
+    Тест проверяет, что большие результаты обрезаются в сообщении лога.
+    """
+    text = str(TruncatedRepr(list(range(1000))))
+
+    assert text == "[0, 1, 2, 3, 4, ...]"
+    assert len(str(TruncatedRepr("x" * 10000))) <= 200
+
+
+@pytest.mark.unit
+def test_log_decorator_skips_formatting_when_debug_is_off():
+    """
+    Тест проверяет, что при выключенном DEBUG результат не форматируется.
+    """
+    previous_level = logger.level
+    logger.setLevel(logging.INFO)
+    result = CountingRepr()
+    try:
+        assert Page(result).action() is result
+    finally:
+        logger.setLevel(previous_level)
+
+    assert result.calls == 0
+
+
+@pytest.mark.unit
+def test_deferred_queue_handler_does_not_format_in_caller_thread():
+    """
+    Тест проверяет, что запись попадает в очередь без форматирования сообщения.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    result = CountingRepr()
+    record = logging.LogRecord("test", logging.DEBUG, __file__, 1, "Result: %r", (result,), None)
+
+    handler.emit(record)
+
+    assert log_queue.get_nowait() is record
+    assert result.calls == 0
+    assert record.getMessage() == "Result: CountingRepr"
@@ -0,0 +1,108 @@
+import gc
+import weakref
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pages.cart_page import CartPage
+from pages.inventory_page import InventoryPage
+from pages.registry import page_registry
+
+
+class TitleElement:
+    def __init__(self, stale=False):
+        self.stale = stale
+
+    @property
+    def text(self):
+        if self.stale:
+            raise StaleElementReferenceException("stale")
+        return "Products"
+
+    def click(self):
+        pass
+
+
+class PageDriver:
+    """
+    Заглушка веб-драйвера: ожидания элементов возвращают заданные элементы по очереди,
+    обращение к current_url запрещено.
+    """
+
+    def __init__(self, *elements):
+        self.elements = list(elements)
+        self.lookups = 0
+
+    @property
+    def current_url(self):
+        raise AssertionError("страница не должна запрашивать current_url")
+
+    def execute_async_script(self, script, *args):
+        self.lookups += 1
+        return self.elements.pop(0) if len(self.elements) > 1 else self.elements[0]
+
+
+@pytest.mark.unit
+def test_registry_creates_pages_lazily_and_caches_them():
+    """
+    Тест проверяет, что страница создается при первом обращении, переиспользуется
+    и не запрашивает current_url.
+    """
+    driver = PageDriver(TitleElement())
+    registry = page_registry(driver)
+
+    page = registry.get(InventoryPage)
+
+    assert registry.get("InventoryPage") is page
+    assert page.url.endswith("inventory.html")
+    registry.reset()
+    assert registry.get(InventoryPage) is not page
+
+
+@pytest.mark.unit
+def test_static_element_is_looked_up_once_until_navigation():
+    """
+    Тест проверяет, что статичный элемент ищется один раз, а после навигации - заново.
+    """
+    driver = PageDriver(TitleElement())
+    page = page_registry(driver).get(InventoryPage)
+
+    assert page.is_inventory_page_open()
+    assert page.is_inventory_page_open()
+    assert driver.lookups == 1
+
+    page.go_to_cart()
+
+    assert page_registry(driver).current is CartPage
+    assert page.is_inventory_page_open()
+    assert driver.lookups == 3
+
+
+@pytest.mark.unit
+def test_stale_static_element_is_looked_up_again():
+    """
+    Тест проверяет, что устаревший элемент удаляется из кэша и находится заново.
+    """
+    driver = PageDriver(TitleElement(stale=True), TitleElement())
+    page = page_registry(driver).get(InventoryPage)
+
+    assert page.is_inventory_page_open()
+    assert driver.lookups == 2
+
+
+@pytest.mark.unit
+def test_registry_does_not_keep_driver_alive():
+    """
+    Тест проверяет, что реестр и его страницы не удерживают драйвер: после удаления драйвера
+    он вместе с реестром освобождается сборщиком мусора.
+    """
+    driver = PageDriver(TitleElement())
+    page_registry(driver).get(InventoryPage)
+    driver_ref = weakref.ref(driver)
+    registry_ref = weakref.ref(page_registry(driver))
+
+    del driver
+    gc.collect()
+
+    assert driver_ref() is None
+    assert registry_ref() is None
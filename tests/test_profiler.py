@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+
+from utils.profiler import PAGE, WAIT, ProfileSummary, Profiler, format_locator
+from utils.stats import Reservoir
+
+
+def _reservoir(*values):
+    reservoir = Reservoir()
+    for value in values:
+        reservoir.add(value)
+    return reservoir
+
+
+@pytest.mark.unit
+def test_profiler_builds_call_tree_with_self_time():
+    """
+    Тест проверяет, что вложенные вызовы образуют дерево, а сводка делит собственное
+    время на ожидания и работу с драйвером.
+    """
+    profiler = Profiler()
+    profiler.start_test()
+    with profiler.span("LoginPage.login", PAGE):
+        with profiler.span("LoginPage.enter_text", PAGE, "id=user-name"):
+            with profiler.span("wait clickable", WAIT, "id=user-name"):
+                pass
+
+    profile = profiler.finish_test()
+
+    login = profile["tree"][0]
+    assert login["name"] == "LoginPage.login"
+    assert login["children"][0]["children"][0]["kind"] == WAIT
+    assert set(profile["summary"]["methods"]) == {"LoginPage.login", "LoginPage.enter_text", "wait clickable"}
+    assert profile["summary"]["locators"]["id=user-name"]["count"] == 2
+    assert profiler.session.methods["LoginPage.login"].total == pytest.approx(
+        profiler.session.driver_self + profiler.session.wait_self)
+
+
+@pytest.mark.unit
+def test_profiler_keeps_threads_separate():
+    """
+    Тест проверяет, что вызовы из разных потоков не попадают в чужое дерево.
+    """
+    profiler = Profiler()
+    profiles = {}
+
+    def run(name):
+        profiler.start_test()
+        with profiler.span(name):
+            pass
+        profiles[name] = profiler.finish_test()
+
+    threads = [threading.Thread(target=run, args=(f"Page{index}.open",)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all([span["name"] for span in profile["tree"]] == [name] for name, profile in profiles.items())
+    assert len(profiler.session.methods) == 4
+
+
+@pytest.mark.unit
+def test_profile_summary_merge_preserves_samples():
+    """
+    Тест проверяет объединение сводок разных воркеров.
+    """
+    first, second = ProfileSummary(), ProfileSummary()
+    first.methods = {"CartPage.proceed_to_checkout": _reservoir(0.1, 0.2)}
+    second.methods = {"CartPage.proceed_to_checkout": _reservoir(0.3)}
+
+    merged = ProfileSummary()
+    merged.merge(first.to_dict(samples=True))
+    merged.merge(second.to_dict(samples=True))
+
+    assert merged.to_dict()["methods"]["CartPage.proceed_to_checkout"]["count"] == 3
+    assert merged.to_dict()["methods"]["CartPage.proceed_to_checkout"]["p95"] == 0.3
+
+
+@pytest.mark.unit
+def test_reservoir_keeps_bounded_samples_and_exact_totals():
+    """
+    Тест проверяет, что выборка не растет больше заданного размера, в том числе при объединении,
+    а количество, сумма и максимум остаются точными.
+    """
+    reservoir = Reservoir(size=50)
+    for index in range(1000):
+        reservoir.add(index / 1000)
+    other = Reservoir(size=50)
+    for _ in range(200):
+        other.add(2.0)
+
+    reservoir.merge(other.to_dict(samples=True))
+
+    assert len(reservoir.samples) == 50
+    summary = reservoir.to_dict()
+    assert (summary["count"], summary["max"]) == (1200, 2.0)
+    assert summary["total"] == pytest.approx(499.5 + 400.0)
+    assert "samples" not in summary
+    assert len(reservoir.to_dict(samples=True)["samples"]) == 50
+
+
+@pytest.mark.unit
+def test_spans_outside_a_profiled_test_are_not_recorded():
+    """
+    Тест проверяет, что вызовы страниц вне start_test()/finish_test() (например, в unit-тестах
+    с поддельным драйвером) не попадают ни в дерево следующего теста, ни в сводку сессии.
+    """
+    profiler = Profiler()
+    with profiler.span("LoginPage.login") as span:
+        assert span is None
+    profiler.start_test()
+    profile = profiler.finish_test()
+    with profiler.span("LoginPage.login"):
+        pass
+
+    assert profile["tree"] == []
+    assert profiler.session.methods == {}
+
+
+@pytest.mark.unit
+def test_format_locator():
+    """
+    Тест проверяет распознавание локаторов среди аргументов метода.
+    """
+    assert format_locator(("id", "checkout")) == "id=checkout"
+    assert format_locator("standard_user") is None
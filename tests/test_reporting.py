@@ -0,0 +1,60 @@
+import allure_commons
+import pytest
+
+from utils.reporting import FULL, MINIMAL, detail_step, get_step_mode, set_step_mode
+
+
+class StepRecorder:
+    def __init__(self):
+        self.titles = []
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self.titles.append(title)
+
+
+class Page:
+    @detail_step("Найти элемент {locator}")
+    def find(self, locator):
+        return locator
+
+
+@pytest.fixture
+def recorder():
+    recorder = StepRecorder()
+    allure_commons.plugin_manager.register(recorder)
+    mode = get_step_mode()
+    yield recorder
+    set_step_mode(mode)
+    allure_commons.plugin_manager.unregister(recorder)
+
+
+@pytest.mark.unit
+def test_detail_step_is_reported_in_full_mode(recorder):
+    """
+    Тест проверяет, что в полном режиме низкоуровневый шаг попадает в отчет с подставленными параметрами.
+    """
+    set_step_mode(FULL)
+
+    assert Page().find("id=checkout") == "id=checkout"
+    assert recorder.titles == ["Найти элемент 'id=checkout'"]
+
+
+@pytest.mark.unit
+def test_detail_step_is_collapsed_in_minimal_mode(recorder):
+    """
+    Тест проверяет, что в минимальном режиме низкоуровневый шаг не создается, а метод выполняется.
+    """
+    set_step_mode(MINIMAL)
+
+    assert Page().find("id=checkout") == "id=checkout"
+    assert recorder.titles == []
+
+
+@pytest.mark.unit
+def test_unknown_step_mode_is_rejected():
+    """
+    Тест проверяет, что неизвестный режим шагов отклоняется.
+    """
+    with pytest.raises(ValueError):
+        set_step_mode("verbose")
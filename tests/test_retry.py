@@ -0,0 +1,112 @@
+import pytest
+from selenium.common.exceptions import ElementClickInterceptedException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from pages.base_page import BasePage
+from utils.profiler import ProfileSummary, profiler
+from utils.retry import retry_budget, retry_policy, with_retry
+
+BUTTON = (By.ID, "continue")
+
+
+class FlakyElement:
+    """
+    Элемент, клик по которому падает заданное число раз.
+    """
+
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.clicks = 0
+
+    def click(self):
+        self.clicks += 1
+        if self.clicks <= self.failures:
+            raise self.error("flaky")
+
+
+class ElementDriver:
+    def __init__(self, element):
+        self.element = element
+        self.lookups = 0
+
+    def execute_async_script(self, script, *args):
+        self.lookups += 1
+        return self.element
+
+
+@pytest.fixture(autouse=True)
+def fresh_budget(monkeypatch):
+    # Профиль этих тестов проверяется отдельно и не должен попадать в сводку сессии
+    monkeypatch.setattr(profiler, "session", ProfileSummary())
+    retry_budget.start_test()
+    profiler.start_test()
+    yield
+    profiler.finish_test()
+
+
+@pytest.mark.unit
+def test_click_retries_only_the_interaction_and_records_profile():
+    """
+    Тест проверяет, что перекрытый клик повторяется после повторного поиска элемента,
+    а повтор попадает в профиль теста.
+    """
+    element = FlakyElement(1, ElementClickInterceptedException)
+    driver = ElementDriver(element)
+
+    BasePage(driver, "https://app/").click_element(BUTTON)
+
+    profile = profiler.finish_test()
+    assert element.clicks == 2
+    assert driver.lookups == 2
+    assert profile["summary"]["retries"]["id=continue"]["count"] == 1
+    # Вызов click_element и два ожидания; пауза повтора в замеры локатора не попадает
+    assert profile["summary"]["locators"]["id=continue"]["count"] == 3
+
+
+@pytest.mark.unit
+def test_retries_stop_after_attempts():
+    """
+    Тест проверяет, что после исчерпания попыток пробрасывается исходное исключение.
+    """
+    element = FlakyElement(10, StaleElementReferenceException)
+
+    with pytest.raises(StaleElementReferenceException):
+        with_retry(lambda limit: element, lambda e: e.click(), (StaleElementReferenceException,))
+    assert element.clicks == retry_policy.attempts
+
+
+@pytest.mark.unit
+def test_exhausted_budget_fails_fast(monkeypatch):
+    """
+    Тест проверяет, что при исчерпанном бюджете теста повторов нет, а элемент ищется с таймаутом
+    не больше остатка бюджета.
+    """
+    element = FlakyElement(1, StaleElementReferenceException)
+    limits = []
+
+    def resolve(limit):
+        limits.append(limit)
+        return element
+
+    retry_budget.spend(retry_policy.budget - 1.0)
+    assert with_retry(resolve, lambda e: e.click(), (StaleElementReferenceException,)) is None
+    assert limits[0] is None and 0 < limits[1] <= 1.0
+
+    retry_budget.spend(retry_policy.budget)
+    with pytest.raises(StaleElementReferenceException):
+        with_retry(lambda limit: FlakyElement(1, StaleElementReferenceException), lambda e: e.click(),
+                   (StaleElementReferenceException,))
+
+
+@pytest.mark.unit
+def test_profile_summary_merges_retries():
+    """
+    Тест проверяет объединение статистики повторов из выгрузок воркеров.
+    """
+    summary = ProfileSummary()
+    summary.merge({"retries": {"id=continue": {"samples": [0.1, 0.2]}}})
+    summary.merge({"retries": {"id=continue": {"samples": [0.3]}}})
+
+    assert summary.retry_count == 3
+    assert summary.retry_time == pytest.approx(0.6)
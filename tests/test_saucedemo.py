@@ -1,28 +1,25 @@
 import pytest
 import allure
-from faker import Faker
 
 from pages.login_page import LoginPage
 from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
-from pages.checkout_step_one_page import CheckoutStepOnePage, CheckoutUserData
+from pages.checkout_step_one_page import CheckoutStepOnePage
 from pages.checkout_step_two_page import CheckoutStepTwoPage
 from pages.checkout_complete_page import CheckoutCompletePage
 
-fake = Faker()
-
 @allure.feature("SauceDemo E2E")
 class TestSauceDemo:
     
     @allure.story("Успешный вход в систему")
     @allure.title("Тест успешного входа в систему")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_successful_login(self, driver):
+    def test_successful_login(self, pages):
         """
         Тест проверяет успешный вход в систему с валидными данными.
         """
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
+        login_page = pages.get(LoginPage)
+        inventory_page = pages.get(InventoryPage)
 
         with allure.step("Выполнить вход с валидными данными"):
             login_page.login("standard_user", "secret_sauce")
@@ -33,16 +30,15 @@ class TestSauceDemo:
     @allure.story("Работа с корзиной")
     @allure.title("Тест добавления товара в корзину")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_add_item_to_cart(self, driver):
+    def test_add_item_to_cart(self, pages, fast_login):
         """
         Тест проверяет добавление товара в корзину.
         """
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
+        inventory_page = pages.get(InventoryPage)
+        cart_page = pages.get(CartPage)
 
         with allure.step("Выполнить вход"):
-            login_page.login("standard_user", "secret_sauce")
+            fast_login("standard_user")
         
         with allure.step("Добавить первый товар в корзину"):
             inventory_page.add_item_to_cart_by_index(0)
@@ -53,22 +49,44 @@ class TestSauceDemo:
         with allure.step("Проверить, что в корзине один товар"):
             assert cart_page.get_items_count_in_cart() == 1, "Количество товаров в корзине неверное"
 
+    @allure.story("Работа с корзиной")
+    @allure.title("Тест добавления нескольких товаров в корзину")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_add_multiple_items_to_cart(self, pages, fast_login):
+        """
+        Тест проверяет добавление нескольких товаров в корзину за один проход.
+        """
+        inventory_page = pages.get(InventoryPage)
+        cart_page = pages.get(CartPage)
+
+        with allure.step("Выполнить вход"):
+            fast_login("standard_user")
+
+        with allure.step("Добавить товары в корзину по названиям и индексам"):
+            count = inventory_page.add_items_to_cart(["Sauce Labs Backpack", "Sauce Labs Bike Light", 2, 3])
+
+        with allure.step("Перейти в корзину"):
+            inventory_page.go_to_cart()
+
+        with allure.step("Проверить количество товаров в корзине"):
+            assert count == 4, "Счетчик корзины неверный"
+            assert cart_page.get_items_count_in_cart() == 4, "Количество товаров в корзине неверное"
+
     @allure.story("Оформление заказа")
     @allure.title("Тест полного цикла оформления заказа")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_full_checkout_process(self, driver):
+    def test_full_checkout_process(self, pages, fast_login, user_data):
         """
         Тест проверяет полный цикл оформления заказа от начала до конца.
         """
-        login_page = LoginPage(driver)
-        inventory_page = InventoryPage(driver)
-        cart_page = CartPage(driver)
-        checkout_one_page = CheckoutStepOnePage(driver)
-        checkout_two_page = CheckoutStepTwoPage(driver)
-        checkout_complete_page = CheckoutCompletePage(driver)
+        inventory_page = pages.get(InventoryPage)
+        cart_page = pages.get(CartPage)
+        checkout_one_page = pages.get(CheckoutStepOnePage)
+        checkout_two_page = pages.get(CheckoutStepTwoPage)
+        checkout_complete_page = pages.get(CheckoutCompletePage)
 
         with allure.step("Выполнить вход"):
-            login_page.login("standard_user", "secret_sauce")
+            fast_login("standard_user")
 
         with allure.step("Добавить товар в корзину"):
             inventory_page.add_item_to_cart_by_index(0)
@@ -80,11 +98,6 @@ class TestSauceDemo:
             cart_page.proceed_to_checkout()
 
         with allure.step("Заполнить данные пользователя"):
-            user_data = CheckoutUserData(
-                first_name=fake.first_name(),
-                last_name=fake.last_name(),
-                postal_code=fake.zipcode()
-            )
             checkout_one_page.fill_user_information(user_data)
         
         with allure.step("Продолжить оформление"):
@@ -103,11 +116,11 @@ class TestSauceDemo:
     @allure.story("Вход в систему с ошибкой")
     @allure.title("Тест входа с неверными кредами")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_failed_login(self, driver):
+    def test_failed_login(self, pages):
         """
         Тест проверяет, что при вводе неверных данных появляется сообщение об ошибке.
         """
-        login_page = LoginPage(driver)
+        login_page = pages.get(LoginPage)
 
         with allure.step("Выполнить вход с невалидными данными"):
             login_page.login("wrong_user", "wrong_password")
@@ -0,0 +1,28 @@
+import pytest
+
+from utils.scheduling import balance_groups
+
+
+@pytest.mark.unit
+def test_balance_groups_equalizes_worker_load():
+    """
+    Тест проверяет, что суммарная длительность групп получается примерно равной.
+    """
+    durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 2.0, "f": 1.0}
+
+    groups = balance_groups(durations, workers=2)
+
+    loads = [sum(seconds for nodeid, seconds in durations.items() if groups[nodeid] == index)
+             for index in range(2)]
+    assert loads == [9.0, 9.0]
+
+
+@pytest.mark.unit
+def test_balance_groups_is_deterministic():
+    """
+    Тест проверяет, что разбиение одинаково во всех воркерах, собирающих тесты независимо.
+    """
+    durations = {f"test_{index}": 1.0 for index in range(10)}
+
+    assert balance_groups(durations, 3) == balance_groups(dict(reversed(list(durations.items()))), 3)
+
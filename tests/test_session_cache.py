@@ -0,0 +1,165 @@
+import time
+
+import pytest
+
+import pages.login_page as login_page
+from pages.login_page import LoginPage
+from utils.session_cache import AuthSession, SessionCache, capture_session, inject_session, session_cache
+
+
+class FakeBrowser:
+    """
+    Заглушка веб-драйвера, записывающая обращения к cookies, localStorage и навигации.
+    """
+
+    def __init__(self, cookies=(), local_storage=(), redirect_to=None):
+        self.cookies = list(cookies)
+        self.local_storage = [list(item) for item in local_storage]
+        self.redirect_to = redirect_to
+        self.current_url = None
+        self.calls = []
+
+    def get_cookies(self):
+        return self.cookies
+
+    def execute_script(self, script, *args):
+        if args:
+            self.calls.append(("set_local_storage", args[0]))
+            return None
+        return self.local_storage
+
+    def get(self, url):
+        self.calls.append(("get", url))
+        # Приложение без действующей сессии перенаправляет на страницу входа
+        self.current_url = self.redirect_to or url
+
+    def delete_all_cookies(self):
+        self.calls.append(("delete_all_cookies",))
+
+    def add_cookie(self, cookie):
+        self.calls.append(("add_cookie", cookie["name"]))
+
+    def refresh(self):
+        self.calls.append(("refresh",))
+
+
+class FakeChrome(FakeBrowser):
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+
+
+@pytest.mark.unit
+def test_capture_session_snapshots_cookies_and_storage():
+    """
+    Тест проверяет, что снимок сессии содержит cookies и localStorage.
+    """
+    browser = FakeBrowser(cookies=[{"name": "session-username", "value": "standard_user"}],
+                          local_storage=[["cart-contents", "[4]"]])
+
+    session = capture_session(browser)
+
+    assert session.cookies == ({"name": "session-username", "value": "standard_user"},)
+    assert session.local_storage == (("cart-contents", "[4]"),)
+
+
+@pytest.mark.unit
+def test_inject_session_uses_cdp_without_extra_navigation():
+    """
+    Тест проверяет, что в Chrome cookies ставятся через CDP и открывается сразу целевая страница.
+    """
+    browser = FakeChrome()
+    session = AuthSession(cookies=({"name": "session-username", "value": "standard_user", "expiry": 100},),
+                          local_storage=())
+
+    assert inject_session(browser, "https://app/", "https://app/inventory.html", session)
+    assert browser.calls == [
+        ("Network.setCookie", {"name": "session-username", "value": "standard_user",
+                               "expires": 100, "url": "https://app/"}),
+        ("get", "https://app/inventory.html"),
+    ]
+
+
+@pytest.mark.unit
+def test_inject_session_without_cdp_restores_storage():
+    """
+    Тест проверяет запасной путь без CDP и восстановление localStorage.
+    """
+    browser = FakeBrowser()
+    session = AuthSession(cookies=({"name": "session-username", "value": "standard_user"},),
+                          local_storage=(("cart-contents", "[4]"),))
+
+    inject_session(browser, "https://app/", "https://app/inventory.html", session)
+
+    assert browser.calls == [
+        ("get", "https://app/"),
+        ("add_cookie", "session-username"),
+        ("get", "https://app/inventory.html"),
+        ("set_local_storage", [["cart-contents", "[4]"]]),
+        ("refresh",),
+    ]
+
+
+@pytest.mark.unit
+def test_session_cache_is_keyed_by_url_and_user():
+    """
+    Тест проверяет, что сессии разных пользователей и приложений не смешиваются.
+    """
+    cache = SessionCache()
+    session = AuthSession(cookies=(), local_storage=())
+    cache.put("https://app/", "standard_user", session)
+
+    assert cache.get("https://app/", "standard_user") is session
+    assert cache.get("https://app/", "problem_user") is None
+    assert cache.get("http://localhost/", "standard_user") is None
+
+
+@pytest.mark.unit
+def test_inject_session_reports_redirect_to_login():
+    """
+    Тест проверяет, что непринятая приложением сессия (перенаправление на страницу входа) распознается.
+    """
+    browser = FakeChrome(redirect_to="https://app/")
+    session = AuthSession(cookies=({"name": "session-username", "value": "standard_user"},), local_storage=())
+
+    assert not inject_session(browser, "https://app/", "https://app/inventory.html", session)
+
+
+@pytest.mark.unit
+def test_session_cache_drops_expired_sessions():
+    """
+    Тест проверяет, что сессия с истекшей cookie не выдается и удаляется из кэша.
+    """
+    cache = SessionCache()
+    expired = AuthSession(cookies=({"name": "session-username", "value": "u", "expiry": time.time() - 1},),
+                          local_storage=())
+    fresh = AuthSession(cookies=({"name": "session-username", "value": "u", "expiry": time.time() + 600},),
+                        local_storage=())
+    cache.put("https://app/", "expired_user", expired)
+    cache.put("https://app/", "standard_user", fresh)
+
+    assert cache.get("https://app/", "expired_user") is None
+    assert cache.get("https://app/", "standard_user") is fresh
+    assert cache._sessions.keys() == {("https://app/", "standard_user")}
+
+
+@pytest.mark.unit
+def test_fast_login_falls_back_to_form_when_session_is_rejected(monkeypatch):
+    """
+    Тест проверяет, что при непринятой сессии быстрый вход удаляет ее из кэша, входит через форму
+    и сохраняет новую сессию.
+    """
+    browser = FakeChrome(redirect_to="https://app/")
+    page = LoginPage(browser)
+    stale = AuthSession(cookies=({"name": "session-username", "value": "standard_user"},), local_storage=())
+    fresh = AuthSession(cookies=(), local_storage=())
+    logins = []
+    monkeypatch.setattr(session_cache, "_sessions", {(page.url, "standard_user"): stale})
+    monkeypatch.setattr(LoginPage, "login", lambda self, username, password: logins.append(username))
+    monkeypatch.setattr(LoginPage, "wait_for_url", lambda self, url: None)
+    monkeypatch.setattr(login_page, "capture_session", lambda driver: fresh)
+
+    page.fast_login("standard_user")
+
+    assert logins == ["standard_user"]
+    assert ("delete_all_cookies",) in browser.calls
+    assert session_cache.get(page.url, "standard_user") is fresh
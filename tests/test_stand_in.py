@@ -0,0 +1,54 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from utils.stand_in.server import StandInServer
+
+PAGES = ["", "inventory.html", "cart.html", "checkout-step-one.html", "checkout-step-two.html",
+         "checkout-complete.html"]
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    """
+    Фикстура запускает локальную копию SauceDemo на свободном порту.
+    """
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("page", PAGES)
+def test_stand_in_serves_pages(stand_in, page):
+    """
+    Тест проверяет, что все страницы сценария оформления заказа отдаются локальным сервером.
+    """
+    with urllib.request.urlopen(stand_in.url + page) as response:
+        body = response.read().decode("utf-8")
+
+    assert response.status == 200
+    assert '<script src="app.js"></script>' in body
+
+
+@pytest.mark.unit
+def test_stand_in_script_contains_locator_targets(stand_in):
+    """
+    Тест проверяет, что приложение создает элементы с id и классами, на которые опираются локаторы страниц.
+    """
+    with urllib.request.urlopen(stand_in.url + "app.js") as response:
+        script = response.read().decode("utf-8")
+
+    for target in ("user-name", "login-button", "shopping_cart_container", "inventory_item_name", "cart_item",
+                   "first-name", "postal-code", "finish", "complete-header", "Add to cart"):
+        assert target in script
+
+
+@pytest.mark.unit
+def test_stand_in_returns_404_for_unknown_page(stand_in):
+    """
+    Тест проверяет ответ на несуществующую страницу.
+    """
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        urllib.request.urlopen(stand_in.url + "missing.html")
+    assert exc_info.value.code == 404
@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
-from pages.checkout_step_one_page import CheckoutUserData
+from pages.models import CheckoutUserData
 
 @pytest.mark.unit
 def test_checkout_user_data_valid():
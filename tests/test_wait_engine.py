@@ -0,0 +1,149 @@
+import time
+
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from utils.wait_engine import AdaptiveWait, TimeoutProfile, WaitEngine, WaitStats
+
+TITLE = (By.CLASS_NAME, "title")
+
+
+class ObserverDriver:
+    """
+    Заглушка веб-драйвера для ожиданий через execute_async_script.
+    """
+
+    def __init__(self, result=None, error=None, delay=0.0):
+        self.result = result
+        self.error = error
+        self.delay = delay
+        self.async_calls = []
+        self.script_timeouts = []
+
+    def set_script_timeout(self, seconds):
+        self.script_timeouts.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        self.async_calls.append(args)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+    def find_element(self, by, value):
+        return FakeElement()
+
+
+class FakeElement:
+    def is_displayed(self):
+        return True
+
+
+@pytest.mark.unit
+def test_adaptive_wait_detects_condition_faster_than_default_poll():
+    """
+    Тест проверяет, что условие, выполнившееся вскоре после первой проверки,
+    обнаруживается раньше стандартного интервала опроса 0.5 сек.
+    """
+    ready_at = time.monotonic() + 0.05
+
+    start = time.monotonic()
+    AdaptiveWait(None, timeout=2).until(lambda driver: time.monotonic() >= ready_at)
+
+    assert time.monotonic() - start < 0.3
+
+
+@pytest.mark.unit
+def test_adaptive_wait_times_out():
+    """
+    Тест проверяет, что невыполнимое условие завершается TimeoutException вовремя.
+    """
+    start = time.monotonic()
+    with pytest.raises(TimeoutException):
+        AdaptiveWait(None, timeout=0.2).until(lambda driver: False)
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.unit
+def test_timeout_profile_priority():
+    """
+    Тест проверяет порядок выбора таймаута: профиль локатора, профиль страницы, код страницы.
+    """
+    profile = TimeoutProfile({"InventoryPage class name=title": 2, "CartPage": 4})
+
+    assert profile.resolve("InventoryPage", TITLE, 10, {}) == 2
+    assert profile.resolve("CartPage", TITLE, 10, {TITLE: 3}) == 4
+    assert profile.resolve("LoginPage", TITLE, 10, {TITLE: 3}) == 3
+    assert profile.resolve("LoginPage", None, 10, {}) == 10
+
+
+@pytest.mark.unit
+def test_wait_engine_records_observed_element():
+    """
+    Тест проверяет, что ожидание выполняется одним вызовом в браузере и попадает в статистику.
+    """
+    element = FakeElement()
+    driver = ObserverDriver(result=element)
+    stats = WaitStats()
+
+    assert WaitEngine(driver, "InventoryPage", stats).visible(TITLE, 5) is element
+
+    assert driver.async_calls == [(["css", '[class~="title"]'], "visible", 5000)]
+    assert [(row["locator"], row["count"]) for row in stats.summary()] == [("InventoryPage class name=title", 1)]
+
+
+@pytest.mark.unit
+def test_wait_engine_timeout_is_recorded():
+    """
+    Тест проверяет, что таймаут ожидания в браузере превращается в TimeoutException и учитывается.
+    """
+    stats = WaitStats()
+
+    with pytest.raises(TimeoutException):
+        WaitEngine(ObserverDriver(result=None), "LoginPage", stats).clickable(TITLE, 1)
+
+    assert stats.summary()[0]["timeouts"] == 1
+
+
+@pytest.mark.unit
+def test_wait_engine_falls_back_to_polling_on_script_error():
+    """
+    Тест проверяет переход на опрос, если скрипт ожидания не удалось выполнить на странице.
+    """
+    driver = ObserverDriver(error=JavascriptException("blocked"))
+
+    assert isinstance(WaitEngine(driver, "LoginPage", WaitStats()).visible(TITLE, 1), FakeElement)
+
+
+@pytest.mark.unit
+def test_fallback_polls_only_for_the_rest_of_the_timeout():
+    """
+    Тест проверяет, что опрос после сбоя скрипта ждет только остаток таймаута, и ожидание
+    вместе с временем скрипта не превышает таймаут (с запасом на опрос), а таймаут учитывается в статистике.
+    """
+    driver = ObserverDriver(error=JavascriptException("blocked"), delay=0.3)
+    driver.find_element = lambda by, value: (_ for _ in ()).throw(TimeoutException("нет элемента"))
+    stats = WaitStats()
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutException):
+        WaitEngine(driver, "LoginPage", stats).visible(TITLE, 0.5)
+
+    assert time.monotonic() - start < 0.75
+    assert stats.summary()[0]["timeouts"] == 1
+
+
+@pytest.mark.unit
+def test_raised_script_timeout_is_restored():
+    """
+    Тест проверяет, что поднятый для долгого ожидания таймаут скриптов возвращается к значению по умолчанию,
+    в том числе после ошибки скрипта.
+    """
+    driver = ObserverDriver(result=FakeElement())
+    WaitEngine(driver, "LoginPage", WaitStats()).visible(TITLE, 40)
+
+    failing = ObserverDriver(error=JavascriptException("blocked"))
+    WaitEngine(failing, "LoginPage", WaitStats()).visible(TITLE, 40)
+
+    assert driver.script_timeouts == failing.script_timeouts == [45, 30]
@@ -3,15 +3,28 @@ AI Code Review Tool for PyCharm
 Text-only mode. NO JSON. NO verdict enforcement.
 """
 
+import argparse
+import asyncio
 import os
-import time
+import sys
 import json
-from typing import Dict
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+if __package__ in (None, ""):
+    # Запуск как скрипта из PyCharm: модули пакета импортируются от корня проекта
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.ai_code_review.batch import (REPORT_FILE, STATE_FILE, ChunkReview, chunk_budget, format_report,
+                                        review_chunks, review_paths)
+from utils.ai_code_review.cache import ReviewCache
+from utils.ai_code_review.chunking import chunk_source
+from utils.ai_code_review.engine import STRATEGIES, ReviewEngine, ReviewError
+from utils.ai_code_review.providers import create_provider
+
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
 PROMPT_FILE = os.path.join(os.path.dirname(__file__), "qa_code_review_prompt.txt")
-MAX_CODE_FALLBACK = 12000
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 def load_prompt() -> str:
@@ -34,63 +47,128 @@ def read_selected_code() -> str:
     return pyperclip.paste()
 
 
-def call_openai(code: str, cfg: Dict, prompt: str) -> str:
-    from openai import OpenAI
-    client = OpenAI(api_key=cfg["api_key"])
-    r = client.chat.completions.create(
-        model=cfg["model"],
-        temperature=0.2,
-        max_tokens=900,
-        messages=[{"role": "user", "content": prompt.format(code=code)}]
-    )
-    return r.choices[0].message.content.strip()
+def build_cache(cfg: Dict) -> Optional[ReviewCache]:
+    cache_cfg = cfg.get("cache", {})
+    if not cache_cfg.get("enabled", True):
+        return None
+    return ReviewCache(os.path.join(ROOT_DIR, cache_cfg.get("dir", ".ai_review_cache")),
+                       ttl=cache_cfg.get("ttl_hours", 168) * 3600,
+                       max_bytes=int(cache_cfg.get("max_mb", 50) * 2 ** 20))
+
+
+def build_engine(cfg: Dict, prompt: str, provider_names: Optional[List[str]] = None,
+                 use_cache: bool = True) -> ReviewEngine:
+    """
+    Собирает движок ревью по config.json. Без списка провайдеров используются
+    review.providers, а для старых конфигов - единственный provider.
+    """
+    review_cfg = cfg.get("review", {})
+    names = provider_names or review_cfg.get("providers") or [cfg.get("provider")]
+    providers = [create_provider(name, cfg.get(name, {})) for name in names]
+    return ReviewEngine(providers, prompt, build_cache(cfg) if use_cache else None,
+                        timeout=review_cfg.get("timeout", 120))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AI-ревью выделенного кода")
+    parser.add_argument("--providers", help="Провайдеры через запятую, например openai,gemini")
+    parser.add_argument("--strategy", choices=STRATEGIES, help="first - первый ответ, merge - ответы всех провайдеров")
+    parser.add_argument("--no-cache", action="store_true", help="Не использовать кэш ответов")
+    parser.add_argument("--batch", nargs="+", metavar="PATH",
+                        help="Пакетное ревью файлов и каталогов, например pages tests utils")
+    parser.add_argument("--report", default=REPORT_FILE, help="Файл общего отчета пакетного ревью")
+    parser.add_argument("--workers", type=int, default=4, help="Количество одновременных запросов к моделям")
+    parser.add_argument("--force", action="store_true", help="Пересмотреть все файлы, а не только измененные")
+    return parser.parse_args(argv)
+
+
+def print_token(token: str) -> None:
+    print(token, end="", flush=True)
+
+
+async def _run_batch(engine: ReviewEngine, args, strategy: str, max_chars: int):
+    def progress(item: ChunkReview) -> None:
+        mark = "❌" if item.error else "✔"
+        print(f"{mark} {item.path}: {item.chunk.name}")
+
+    try:
+        return await review_paths(engine, args.batch, strategy, max_chars, args.workers,
+                                  os.path.join(ROOT_DIR, STATE_FILE), args.force, progress)
+    finally:
+        await engine.aclose()
+
+
+def run_batch(engine: ReviewEngine, args, strategy: str, max_chars: int) -> None:
+    results = asyncio.run(_run_batch(engine, args, strategy, max_chars))
+    with open(args.report, "w", encoding="utf-8") as f:
+        f.write(format_report(results))
+    reviewed = sum(1 for item in results if not item.reused)
+    print(f"\n📄 Отчет: {args.report} (проверено фрагментов: {reviewed}, без изменений: {len(results) - reviewed})")
+    for line in engine.metrics.summary_lines():
+        print(f"⏱ {line}")
+
+
+async def _review_selection(engine: ReviewEngine, code: str, strategy: str, max_chars: int, workers: int):
+    try:
+        chunks = chunk_source(code, max_chars)
+        if len(chunks) > 1:
+            items = [ChunkReview("selection", chunk, None) for chunk in chunks]
+            await review_chunks(engine, items, strategy, workers)
+            return items
+        print("\n================ AI CODE REVIEW ================\n")
+        return await engine.review(code, strategy, on_token=print_token)
+    finally:
+        await engine.aclose()
+
+
+def review_selection(engine: ReviewEngine, code: str, strategy: str, max_chars: int, workers: int) -> None:
+    """
+    Ревью выделенного кода. Ответ выводится по мере генерации. Код больше лимита
+    не обрезается, а делится на фрагменты, которые проверяются параллельно.
+    """
+    try:
+        result = asyncio.run(_review_selection(engine, code, strategy, max_chars, workers))
+    except ReviewError as e:
+        print(f"\n❌ Ошибка: {e}")
+        return
 
+    if isinstance(result, list):
+        print("\n================ AI CODE REVIEW ================\n")
+        print(format_report(result))
+        for line in engine.metrics.summary_lines():
+            print(f"⏱ {line}")
+        return
 
-def call_gemini(code: str, cfg: Dict, prompt: str) -> str:
-    from google import genai
-    client = genai.Client(api_key=cfg["api_key"])
-    r = client.models.generate_content(
-        model=cfg["model"],
-        contents=[prompt.format(code=code)]
-    )
-    return r.candidates[0].content.parts[0].text.strip()
+    if result.streamed:
+        print()
+    else:
+        # Ответ из кэша, объединенный ответ или ответ провайдера, сменившего упавший во время вывода
+        print(result.text)
+    for name, reason in result.errors.items():
+        print(f"\n⚠ {name}: {reason}")
+    if result.cached:
+        print(f"\n⏱ Время анализа: {round(result.elapsed, 2)} сек (из кэша)")
+    for metrics in result.metrics:
+        print(f"\n⏱ {metrics.format()}")
 
 
-def call_mistral(code: str, cfg: Dict, prompt: str) -> str:
-    from mistralai.client import MistralClient
-    from mistralai.models.chat_completion import ChatMessage
-    client = MistralClient(api_key=cfg["api_key"])
-    r = client.chat(
-        model=cfg["model"],
-        messages=[ChatMessage(role="user", content=prompt.format(code=code))]
-    )
-    return r.choices[0].message.content.strip()
+def main():
+    args = parse_args()
+    cfg = load_config()
+    prompt = load_prompt()
+    engine = build_engine(cfg, prompt, args.providers.split(",") if args.providers else None, not args.no_cache)
+    strategy = args.strategy or cfg.get("review", {}).get("strategy", "first")
+    max_chars = chunk_budget(cfg, [provider.name for provider in engine.providers], prompt)
 
+    if args.batch:
+        run_batch(engine, args, strategy, max_chars)
+        return
 
-def main():
     code = read_selected_code()
     if not code.strip():
         print("❌ Ошибка: не передан код для анализа")
         return
-
-    cfg = load_config()
-    prompt = load_prompt()
-    provider = cfg.get("provider")
-    code = code[:MAX_CODE_FALLBACK]
-
-    start = time.time()
-    if provider == "openai":
-        result = call_openai(code, cfg["openai"], prompt)
-    elif provider == "gemini":
-        result = call_gemini(code, cfg["gemini"], prompt)
-    elif provider == "mistral":
-        result = call_mistral(code, cfg["mistral"], prompt)
-    else:
-        raise ValueError("Unknown provider")
-
-    print("\n================ AI CODE REVIEW ================\n")
-    print(result)
-    print(f"\n⏱ Время анализа: {round(time.time() - start, 2)} сек")
+    review_selection(engine, code, strategy, max_chars, args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+"""
+Пакетное AI-ревью каталогов: разбиение файлов на фрагменты, ограниченный пул запросов,
+повторное ревью только измененных фрагментов и общий отчет.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils.ai_code_review.chunking import CHARS_PER_TOKEN, Chunk, chunk_source
+from utils.ai_code_review.engine import ReviewEngine, ReviewError
+from utils.ai_code_review.metrics import CallMetrics
+
+STATE_FILE = ".ai_review_state.json"
+REPORT_FILE = "ai_review_report.md"
+DEFAULT_EXTENSIONS = (".py",)
+SKIPPED_DIRS = {"__pycache__", "node_modules", "allure-results", "logs"}
+
+
+@dataclass
+class ChunkReview:
+    path: str
+    chunk: Chunk
+    review: Optional[str]
+    reused: bool = False
+    error: Optional[str] = None
+    # Метрики запросов к моделям по этому фрагменту
+    metrics: List[CallMetrics] = field(default_factory=list)
+
+
+def chunk_budget(cfg: Dict, provider_names: Iterable[str], prompt: str) -> int:
+    """
+    Размер фрагмента в символах: limits.max_code_length, но не больше, чем помещается
+    в max_input_tokens самого ограниченного провайдера вместе с промптом.
+    """
+    budget = cfg.get("limits", {}).get("max_code_length", 12000)
+    for name in provider_names:
+        tokens = cfg.get(name, {}).get("max_input_tokens")
+        if tokens:
+            budget = min(budget, tokens * CHARS_PER_TOKEN - len(prompt))
+    return max(budget, 1000)
+
+
+def collect_files(paths: Iterable[str], extensions=DEFAULT_EXTENSIONS) -> List[str]:
+    """
+    Собирает файлы для ревью из путей к файлам и каталогам, пропуская скрытые и служебные каталоги.
+    :return: отсортированный список путей
+    """
+    files = set()
+    for path in paths:
+        if os.path.isfile(path):
+            files.add(os.path.normpath(path))
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in SKIPPED_DIRS]
+            files.update(os.path.normpath(os.path.join(root, name)) for name in names if name.endswith(extensions))
+    return sorted(files)
+
+
+def load_state(path: str) -> Dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: Dict, path: str) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _file_digest(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def review_text(path: str, chunk: Chunk) -> str:
+    """
+    Код фрагмента с заголовком о расположении, чтобы модель видела контекст.
+    """
+    return f"# {path}: {chunk.name} (строки {chunk.start}-{chunk.end})\n{chunk.text}"
+
+
+async def review_chunks(engine: ReviewEngine, items: List[ChunkReview], strategy: str, workers: int,
+                        on_done: Optional[Callable[[ChunkReview], None]] = None) -> None:
+    """
+    Отправляет фрагменты на ревью, не больше workers запросов одновременно.
+    Ошибка одного фрагмента записывается в него и не останавливает остальные.
+    """
+    semaphore = asyncio.Semaphore(workers)
+
+    async def review(item: ChunkReview) -> None:
+        async with semaphore:
+            try:
+                result = await engine.review(review_text(item.path, item.chunk), strategy)
+                item.review = result.text
+                item.metrics = result.metrics
+            except (ReviewError, ValueError) as e:
+                item.error = str(e)
+        if on_done:
+            on_done(item)
+
+    await asyncio.gather(*(review(item) for item in items))
+
+
+async def review_paths(engine: ReviewEngine, paths: Iterable[str], strategy: str, max_chars: int,
+                       workers: int = 4, state_path: str = STATE_FILE, force: bool = False,
+                       progress: Optional[Callable[[ChunkReview], None]] = None) -> List[ChunkReview]:
+    """
+    Проводит ревью файлов. Для каждого файла хранятся хэши фрагментов и ответы, поэтому
+    при повторном запуске на ревью уходят только новые и измененные фрагменты,
+    а ответы по остальным берутся из файла состояния.
+    :param engine: движок ревью
+    :param paths: файлы и каталоги
+    :param strategy: стратегия движка (first или merge)
+    :param max_chars: максимальный размер фрагмента
+    :param workers: количество одновременных запросов
+    :param state_path: файл состояния с хэшами и ответами
+    :param force: пересмотреть все фрагменты
+    :param progress: вызывается после ревью каждого фрагмента
+    :return: результаты по всем фрагментам в порядке файлов и строк
+    """
+    state = load_state(state_path)
+    # Состояние файлов, не попавших в этот запуск, сохраняется
+    new_state, results, pending = dict(state), [], []
+    for path in collect_files(paths):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            source = f.read()
+        previous = {} if force else state.get(path, {})
+        known = previous.get("chunks", {}) if previous.get("max_chars") == max_chars else {}
+        chunks = chunk_source(source, max_chars)
+        for chunk in chunks:
+            cached = known.get(chunk.name)
+            if cached and cached.get("hash") == chunk.digest and cached.get("review") is not None:
+                results.append(ChunkReview(path, chunk, cached["review"], reused=True))
+            else:
+                item = ChunkReview(path, chunk, None)
+                results.append(item)
+                pending.append(item)
+        new_state[path] = {"hash": _file_digest(source), "max_chars": max_chars, "chunks": {}}
+
+    try:
+        await review_chunks(engine, pending, strategy, workers, progress)
+    finally:
+        for item in results:
+            if item.review is not None:
+                new_state[item.path]["chunks"][item.chunk.name] = {"hash": item.chunk.digest, "review": item.review}
+        save_state(new_state, state_path)
+    return results
+
+
+def format_report(results: List[ChunkReview]) -> str:
+    """
+    Собирает общий отчет в Markdown: по разделу на файл и подразделу на фрагмент.
+    """
+    reviewed = sum(1 for item in results if item.review is not None and not item.reused)
+    reused = sum(1 for item in results if item.reused)
+    failed = sum(1 for item in results if item.error)
+    lines = ["# AI CODE REVIEW", "",
+             f"Фрагментов: {len(results)}, проверено: {reviewed}, без изменений: {reused}, ошибок: {failed}"]
+    current = None
+    for item in results:
+        if item.path != current:
+            current = item.path
+            lines += ["", f"## {item.path}"]
+        status = " (без изменений)" if item.reused else ""
+        lines += ["", f"### {item.chunk.name}, строки {item.chunk.start}-{item.chunk.end}{status}", ""]
+        lines.append(item.review if item.review is not None else f"❌ Ошибка: {item.error}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,117 @@
+"""
+Дисковый кэш ответов AI-ревью.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+def cache_key(code: str, prompt: str, provider: str, model: str, params: Optional[Dict] = None) -> str:
+    """
+    Ключ кэша: хэш кода, шаблона промпта, провайдера, модели и параметров запроса.
+    """
+    payload = json.dumps({"code": code, "prompt": prompt, "provider": provider, "model": model,
+                          "params": params or {}}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReviewCache:
+    """
+    Кэш ответов в каталоге: один JSON-файл на ключ. Записи старше ttl удаляются при чтении,
+    а при превышении max_bytes удаляются записи, к которым дольше всего не обращались.
+    Размер каталога считается одним обходом при первой записи и дальше ведется по записанным файлам,
+    поэтому каталог обходится заново только при превышении предела.
+    """
+
+    def __init__(self, directory: str, ttl: float = 7 * 24 * 3600, max_bytes: int = 50 * 2 ** 20):
+        """
+        :param directory: каталог кэша
+        :param ttl: время жизни записи в секундах
+        :param max_bytes: предельный размер каталога в байтах
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # Оценка размера каталога; None - еще не считался. Другие процессы могут писать в тот же каталог,
+        # поэтому оценка уточняется при каждом вытеснении
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Возвращает сохраненный ответ или None, если записи нет или она устарела.
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            self._remove(path)
+            return None
+        # Время доступа хранится в mtime и используется при вытеснении
+        os.utime(path)
+        return entry.get("result")
+
+    def put(self, key: str, result: str) -> None:
+        """
+        Атомарно сохраняет ответ и вытесняет старые записи, если каталог превысил max_bytes.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "result": result}, f, ensure_ascii=False)
+            written = f.tell()
+        os.replace(tmp_path, path)
+        if self._size is None:
+            self.evict()
+            return
+        self._size += written - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Удаляет устаревшие записи и самые давние по доступу, пока каталог больше max_bytes.
+        :return: количество удаленных записей
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+        except OSError:
+            return 0
+        now = time.time()
+        stats = sorted(((entry.stat(), entry.path) for entry in entries), key=lambda pair: pair[0].st_mtime)
+        total = sum(stat.st_size for stat, _ in stats)
+        removed = 0
+        for stat, path in stats:
+            # mtime не старше времени создания, поэтому запись без обращений дольше ttl точно устарела
+            if total <= self.max_bytes and now - stat.st_mtime <= self.ttl:
+                continue
+            self._remove(path)
+            total -= stat.st_size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.directory) if os.path.isdir(self.directory) else ():
+            if entry.name.endswith(".json"):
+                self._remove(entry.path)
+        self._size = 0
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,119 @@
+"""
+Разбиение исходного кода на фрагменты для ревью с учетом синтаксиса Python.
+"""
+import ast
+import hashlib
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# Грубая оценка размера промпта: в среднем около 4 символов кода на токен
+CHARS_PER_TOKEN = 4
+
+MODULE = "module"
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """
+    Фрагмент файла: имя (функция, класс, метод или блок модуля), строки и текст.
+    """
+    name: str
+    start: int
+    end: int
+    text: str
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+
+def _node_start(node: ast.AST) -> int:
+    decorators = getattr(node, "decorator_list", None) or []
+    return min([node.lineno] + [decorator.lineno for decorator in decorators])
+
+
+def _split_lines(name: str, lines: List[str], start: int, end: int, max_chars: int) -> List[Tuple[str, int, int]]:
+    """
+    Делит диапазон строк на части не больше max_chars (строка длиннее лимита идет отдельной частью).
+    """
+    parts, part_start, size = [], start, 0
+    for number in range(start, end + 1):
+        length = len(lines[number - 1])
+        if size and size + length > max_chars:
+            parts.append((part_start, number - 1))
+            part_start, size = number, 0
+        size += length
+    parts.append((part_start, end))
+    if len(parts) == 1:
+        return [(name, start, end)]
+    return [(f"{name}[{index}]", first, last) for index, (first, last) in enumerate(parts, 1)]
+
+
+def _size(lines: List[str], start: int, end: int) -> int:
+    return sum(len(line) for line in lines[start - 1:end])
+
+
+def _units(body: List[ast.stmt], lines: List[str], start: int, end: int, max_chars: int,
+           prefix: str = "") -> List[Tuple[str, int, int]]:
+    """
+    Делит диапазон строк на единицы по определениям функций и классов. Строки между
+    определениями (импорты, константы, комментарии) относятся к блоку модуля или к
+    следующему определению, поэтому вместе единицы покрывают весь диапазон.
+    """
+    units, cursor, pending_module = [], start, None
+    for node in body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            pending_module = pending_module or cursor
+            continue
+        if pending_module is not None:
+            units.append((prefix.rstrip(".") or MODULE, pending_module, _node_start(node) - 1))
+            cursor = _node_start(node)
+            pending_module = None
+        name, node_end = prefix + node.name, node.end_lineno
+        if _size(lines, cursor, node_end) <= max_chars:
+            units.append((name, cursor, node_end))
+        elif isinstance(node, ast.ClassDef) and any(
+                isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) for child in node.body):
+            units.extend(_units(node.body, lines, cursor, node_end, max_chars, prefix=f"{name}."))
+        else:
+            units.extend(_split_lines(name, lines, cursor, node_end, max_chars))
+        cursor = node_end + 1
+    if cursor <= end:
+        units.append((prefix.rstrip(".") or MODULE, cursor, end))
+    result = []
+    for name, first, last in units:
+        if _size(lines, first, last) > max_chars:
+            result.extend(_split_lines(name, lines, first, last, max_chars))
+        else:
+            result.append((name, first, last))
+    return result
+
+
+def chunk_source(source: str, max_chars: int) -> List[Chunk]:
+    """
+    Делит код на фрагменты не больше max_chars символов, не теряя ни одной строки.
+    Код Python делится по функциям, классам и методам, поэтому изменение одной функции
+    меняет только ее фрагмент. Прочий текст и код с синтаксическими ошибками делится по строкам.
+    :param source: исходный код
+    :param max_chars: максимальный размер фрагмента в символах
+    :return: список Chunk с уникальными именами в порядке следования
+    """
+    lines = source.splitlines(keepends=True)
+    if not lines:
+        return []
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        units = _split_lines("lines", lines, 1, len(lines), max_chars)
+    else:
+        units = _units(tree.body, lines, 1, len(lines), max_chars)
+
+    chunks, seen = [], {}
+    for name, first, last in units:
+        text = "".join(lines[first - 1:last])
+        if not text.strip():
+            continue
+        seen[name] = seen.get(name, 0) + 1
+        unique = name if seen[name] == 1 else f"{name}#{seen[name]}"
+        chunks.append(Chunk(unique, first, last, text))
+    return chunks
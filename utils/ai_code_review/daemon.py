@@ -0,0 +1,212 @@
+"""
+Демон AI-ревью: держит загруженными конфиг, промпт, SDK и клиенты провайдеров
+и принимает запросы через Unix-сокет, поэтому время ревью определяется только моделью.
+
+    python utils/ai_code_review/daemon.py [--socket PATH] [--idle-timeout MINUTES]
+    python utils/ai_code_review/daemon.py --stop
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+if __package__ in (None, ""):
+    # Запуск как скрипта: модули пакета импортируются от корня проекта
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.ai_code_review.ai_code_review import CONFIG_FILE, PROMPT_FILE, build_engine, load_config, load_prompt
+from utils.ai_code_review.batch import ChunkReview, chunk_budget, format_report, review_chunks
+from utils.ai_code_review.chunking import chunk_source
+from utils.ai_code_review.engine import ReviewEngine
+from utils.ai_code_review.metrics import ProviderMetrics
+from utils.ai_code_review.protocol import decode, default_socket_path, encode, is_running, request
+
+
+class ReviewDaemon:
+    """
+    Сервер ревью. Движки создаются на каждый набор провайдеров один раз и живут
+    вместе с клиентами SDK и их пулами соединений, пока не изменятся конфиг или промпт.
+    """
+
+    def __init__(self, cfg: Dict, prompt: str, socket_path: str, idle_timeout: Optional[float] = None,
+                 workers: int = 4, reload: Optional[Callable[[], Tuple[Dict, str]]] = None,
+                 watch_files: Sequence[str] = ()):
+        """
+        :param cfg: конфигурация из config.json
+        :param prompt: шаблон промпта
+        :param socket_path: путь к Unix-сокету
+        :param idle_timeout: завершить работу после стольких секунд без запросов; None - не завершать
+        :param workers: количество одновременных запросов при ревью по фрагментам
+        :param reload: функция, заново загружающая (конфиг, промпт)
+        :param watch_files: файлы конфига и промпта; при изменении их mtime вызывается reload
+        """
+        self.cfg = cfg
+        self.prompt = prompt
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.workers = workers
+        self._reload = reload
+        self._watch_files = tuple(watch_files)
+        self._mtimes = self._read_mtimes()
+        self._engines: Dict[Tuple[Tuple[str, ...], bool], ReviewEngine] = {}
+        # Движки до перезагрузки конфига: их еще могут использовать начатые запросы, закрываются в конце работы
+        self._retired: List[ReviewEngine] = []
+        self._last_request = time.monotonic()
+        self._stopped = None
+
+    def _read_mtimes(self) -> Dict[str, Optional[float]]:
+        mtimes = {}
+        for path in self._watch_files:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def reload_if_changed(self) -> bool:
+        """
+        Перезагружает конфиг и промпт, если их файлы изменились с прошлой загрузки.
+        :return: True, если конфигурация перезагружена
+        """
+        mtimes = self._read_mtimes()
+        if self._reload is None or mtimes == self._mtimes:
+            return False
+        try:
+            self.cfg, self.prompt = self._reload()
+        except (OSError, ValueError, KeyError) as e:
+            # Незаконченная правка конфига не должна останавливать демон: остается прежняя конфигурация
+            print(f"⚠ Конфиг не перезагружен: {e}", file=sys.stderr)
+            return False
+        self._mtimes = mtimes
+        self._retired.extend(self._engines.values())
+        self._engines.clear()
+        return True
+
+    def engine_for(self, providers: Optional[List[str]], use_cache: bool) -> ReviewEngine:
+        key = (tuple(providers or ()), use_cache)
+        if key not in self._engines:
+            self._engines[key] = build_engine(self.cfg, self.prompt, providers, use_cache)
+        return self._engines[key]
+
+    def warmup(self) -> None:
+        """
+        Импортирует SDK и создает клиенты провайдеров по умолчанию заранее, а не при первом запросе.
+        """
+        for provider in self.engine_for(None, True).providers:
+            try:
+                provider.client()
+            except Exception as e:
+                print(f"⚠ {provider.name}: клиент не создан заранее: {e}", file=sys.stderr)
+
+    async def review(self, message: Dict, writer: asyncio.StreamWriter) -> None:
+        self.reload_if_changed()
+        engine = self.engine_for(message.get("providers"), not message.get("no_cache"))
+        strategy = message.get("strategy") or self.cfg.get("review", {}).get("strategy", "first")
+        code = message.get("code", "")
+        chunks = chunk_source(code, chunk_budget(self.cfg, [p.name for p in engine.providers], self.prompt))
+        if len(chunks) > 1:
+            items = [ChunkReview("selection", chunk, None) for chunk in chunks]
+            await review_chunks(engine, items, strategy, self.workers)
+            # Метрики только этого запроса, а не накопленные движком за время работы демона
+            metrics = ProviderMetrics()
+            for item in items:
+                for call in item.metrics:
+                    metrics.record(call)
+            writer.write(encode({"type": "text", "text": format_report(items)}))
+            writer.write(encode({"type": "done", "metrics": metrics.summary_lines(), "errors": {},
+                                 "cached": False, "elapsed": None}))
+            return
+
+        result = await engine.review(code, strategy,
+                                     on_token=lambda token: writer.write(encode({"type": "token", "text": token})))
+        if not result.streamed:
+            writer.write(encode({"type": "text", "text": result.text}))
+        writer.write(encode({"type": "done", "metrics": [metrics.format() for metrics in result.metrics],
+                             "errors": result.errors, "cached": result.cached, "elapsed": result.elapsed}))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._last_request = time.monotonic()
+        try:
+            message = decode(await reader.readline())
+            kind = message.get("type")
+            if kind == "ping":
+                writer.write(encode({"type": "pong"}))
+            elif kind == "shutdown":
+                writer.write(encode({"type": "done"}))
+                self._stopped.set()
+            elif kind == "review":
+                try:
+                    await self.review(message, writer)
+                except Exception as e:
+                    # Ошибка одного запроса не должна останавливать демон
+                    writer.write(encode({"type": "error", "message": str(e)}))
+            else:
+                writer.write(encode({"type": "error", "message": f"Неизвестный запрос: {kind}"}))
+            await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._last_request = time.monotonic()
+            writer.close()
+
+    async def _watch_idle(self) -> None:
+        while not self._stopped.is_set():
+            await asyncio.sleep(min(30.0, self.idle_timeout))
+            if time.monotonic() - self._last_request > self.idle_timeout:
+                self._stopped.set()
+
+    async def serve(self) -> None:
+        self._stopped = asyncio.Event()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        # Сокет создается сразу с правами 0600: между bind и chmod к нему мог бы подключиться другой пользователь
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.handle, path=self.socket_path)
+        finally:
+            os.umask(umask)
+        self.warmup()
+        watcher = asyncio.ensure_future(self._watch_idle()) if self.idle_timeout else None
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            if watcher:
+                watcher.cancel()
+            for engine in [*self._engines.values(), *self._retired]:
+                await engine.aclose()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Демон AI-ревью кода")
+    parser.add_argument("--socket", default=default_socket_path(), help="Путь к Unix-сокету")
+    parser.add_argument("--idle-timeout", type=float, default=None,
+                        help="Завершить работу после стольких минут без запросов")
+    parser.add_argument("--stop", action="store_true", help="Остановить запущенный демон")
+    args = parser.parse_args()
+
+    if args.stop:
+        if is_running(args.socket):
+            list(request(args.socket, {"type": "shutdown"}))
+            print("Демон остановлен")
+        return
+    if is_running(args.socket):
+        print(f"Демон уже запущен: {args.socket}")
+        return
+
+    cfg = load_config()
+    daemon_cfg = cfg.get("daemon", {})
+    idle_minutes = args.idle_timeout if args.idle_timeout is not None else daemon_cfg.get("idle_timeout_minutes")
+    daemon = ReviewDaemon(cfg, load_prompt(), args.socket, idle_minutes * 60 if idle_minutes else None,
+                          daemon_cfg.get("workers", 4), reload=lambda: (load_config(), load_prompt()),
+                          watch_files=(CONFIG_FILE, PROMPT_FILE))
+    print(f"Демон AI-ревью слушает {args.socket}")
+    asyncio.run(daemon.serve())
+
+
+if __name__ == "__main__":
+    main()
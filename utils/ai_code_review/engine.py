@@ -0,0 +1,190 @@
+"""
+Асинхронный движок AI-ревью: параллельные запросы к нескольким провайдерам и кэш ответов.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.ai_code_review.cache import ReviewCache, cache_key
+from utils.ai_code_review.chunking import CHARS_PER_TOKEN
+from utils.ai_code_review.metrics import CallMetrics, ProviderMetrics
+from utils.ai_code_review.providers import Provider
+
+# Стратегии: первый успешный ответ или объединение ответов всех провайдеров
+FIRST = "first"
+MERGE = "merge"
+STRATEGIES = (FIRST, MERGE)
+
+
+class ReviewError(RuntimeError):
+    """
+    Ни один провайдер не вернул ответ.
+    """
+
+
+@dataclass
+class ReviewResult:
+    text: str
+    providers: List[str]
+    cached: bool
+    elapsed: float
+    errors: Dict[str, str] = field(default_factory=dict)
+    metrics: List[CallMetrics] = field(default_factory=list)
+    # Текст уже передан в on_token по мере генерации
+    streamed: bool = False
+
+
+class ReviewEngine:
+    """
+    Отправляет код на ревью нескольким провайдерам одновременно, каждому со своим таймаутом.
+    Ответы кэшируются по хэшу кода, промпта, модели и параметров, поэтому повторное ревью
+    неизмененного кода возвращается из кэша без запросов к моделям.
+    Задержки каждого запроса накапливаются в metrics.
+    """
+
+    def __init__(self, providers: List[Provider], prompt: str, cache: Optional[ReviewCache] = None,
+                 timeout: float = 120.0):
+        """
+        :param providers: провайдеры в порядке предпочтения
+        :param prompt: шаблон промпта с полем {code}
+        :param cache: дисковый кэш ответов или None
+        :param timeout: таймаут провайдера по умолчанию в секундах
+        """
+        if not providers:
+            raise ValueError("Не задан ни один провайдер")
+        self.providers = providers
+        self.prompt = prompt
+        self.cache = cache
+        self.timeout = timeout
+        self.metrics = ProviderMetrics()
+
+    def _key(self, provider: Provider, code: str) -> str:
+        return cache_key(code, self.prompt, provider.name, provider.model, provider.params)
+
+    def _cached(self, provider: Provider, code: str) -> Optional[str]:
+        return self.cache.get(self._key(provider, code)) if self.cache else None
+
+    async def _stream(self, provider: Provider, text: str,
+                      on_token: Optional[Callable[[Provider, str], None]]) -> Tuple[str, CallMetrics]:
+        usage, parts, ttft = {}, [], None
+        start = time.perf_counter()
+        async for token in provider.stream(text, usage):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            parts.append(token)
+            if on_token:
+                on_token(provider, token)
+        result = "".join(parts).strip()
+        tokens = usage.get("output_tokens")
+        metrics = CallMetrics(provider.name, ttft, time.perf_counter() - start,
+                              tokens or len(result) // CHARS_PER_TOKEN, estimated=not tokens)
+        return result, metrics
+
+    async def _ask(self, provider: Provider, code: str,
+                   on_token: Optional[Callable[[Provider, str], None]] = None) -> Tuple[str, CallMetrics]:
+        result, metrics = await asyncio.wait_for(self._stream(provider, self.prompt.format(code=code), on_token),
+                                                 provider.timeout or self.timeout)
+        self.metrics.record(metrics)
+        if self.cache:
+            self.cache.put(self._key(provider, code), result)
+        return result, metrics
+
+    async def review(self, code: str, strategy: str = FIRST,
+                     on_token: Optional[Callable[[str], None]] = None) -> ReviewResult:
+        """
+        Выполняет ревью кода.
+        :param code: код для анализа
+        :param strategy: FIRST - первый успешный ответ, MERGE - ответы всех провайдеров
+        :param on_token: вызывается с каждым фрагментом ответа по мере генерации (только для FIRST);
+                         передается ответ провайдера, который начал отвечать первым, и возвращается
+                         ответ именно этого провайдера, если он не упал
+        :return: ReviewResult
+        :raises: ReviewError если ни один провайдер не ответил
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия: {strategy}")
+        start = time.perf_counter()
+        if strategy == FIRST:
+            result = await self._first(code, on_token)
+        else:
+            result = await self._merge(code)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def _first(self, code: str, on_token: Optional[Callable[[str], None]] = None) -> ReviewResult:
+        for provider in self.providers:
+            cached = self._cached(provider, code)
+            if cached is not None:
+                return ReviewResult(cached, [provider.name], True, 0.0)
+
+        # Вывод по мере генерации достается провайдеру, первым приславшему токен
+        streaming = {}
+
+        def forward(provider: Provider, token: str) -> None:
+            if streaming.setdefault("provider", provider.name) == provider.name:
+                on_token(token)
+
+        tasks = {asyncio.ensure_future(self._ask(provider, code, forward if on_token else None)): provider
+                 for provider in self.providers}
+        errors, answers = {}, {}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        answers[tasks[task].name] = task.result()
+                    else:
+                        errors[tasks[task].name] = _describe(task.exception())
+                streamer = streaming.get("provider")
+                if streamer in answers:
+                    text, metrics = answers[streamer]
+                    return ReviewResult(text, [streamer], False, 0.0, errors, [metrics], streamed=True)
+                # Пока провайдер, начавший вывод, отвечает, ждем его: иначе в терминале оказался бы
+                # обрывок одного ответа и полный текст другого. Если он упал, берется готовый ответ остальных
+                if answers and (streamer is None or streamer in errors):
+                    # Среди готовых ответов предпочитается провайдер, указанный раньше
+                    provider = next(provider for provider in self.providers if provider.name in answers)
+                    text, metrics = answers[provider.name]
+                    return ReviewResult(text, [provider.name], False, 0.0, errors, [metrics])
+        finally:
+            for task in tasks:
+                task.cancel()
+        raise ReviewError(_failure_message(errors))
+
+    async def _merge(self, code: str) -> ReviewResult:
+        answers = {provider.name: self._cached(provider, code) for provider in self.providers}
+        missing = [provider for provider in self.providers if answers[provider.name] is None]
+        results = await asyncio.gather(*(self._ask(provider, code) for provider in missing), return_exceptions=True)
+        errors, metrics = {}, []
+        for provider, result in zip(missing, results):
+            if isinstance(result, BaseException):
+                answers[provider.name] = None
+                errors[provider.name] = _describe(result)
+            else:
+                answers[provider.name] = result[0]
+                metrics.append(result[1])
+        answered = [name for name, text in answers.items() if text is not None]
+        if not answered:
+            raise ReviewError(_failure_message(errors))
+        text = "\n\n".join(f"### {name}\n\n{answers[name]}" for name in answered)
+        return ReviewResult(text, answered, not missing, 0.0, errors, metrics)
+
+    async def aclose(self) -> None:
+        """
+        Закрывает клиенты всех провайдеров.
+        """
+        for provider in self.providers:
+            await provider.aclose()
+
+
+def _describe(error: BaseException) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return "таймаут"
+    return f"{type(error).__name__}: {error}"
+
+
+def _failure_message(errors: Dict[str, str]) -> str:
+    details = "; ".join(f"{name}: {reason}" for name, reason in errors.items())
+    return f"Ни один провайдер не вернул ответ ({details})"
@@ -0,0 +1,65 @@
+"""
+Метрики задержки провайдеров AI-ревью: время до первого токена, общее время и скорость генерации.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from utils.stats import describe
+
+
+@dataclass
+class CallMetrics:
+    """
+    Метрики одного запроса. Если API не сообщает количество токенов, оно оценивается по длине ответа.
+    """
+    provider: str
+    ttft: Optional[float]
+    total: float
+    tokens: int
+    estimated: bool = False
+
+    @property
+    def tokens_per_second(self) -> float:
+        # Скорость генерации считается без ожидания первого токена
+        generation = self.total - (self.ttft or 0.0)
+        return self.tokens / generation if generation > 0 else 0.0
+
+    def format(self) -> str:
+        ttft = f"{self.ttft:.2f} сек" if self.ttft is not None else "нет"
+        approx = "~" if self.estimated else ""
+        return (f"{self.provider}: первый токен {ttft}, всего {self.total:.2f} сек, "
+                f"{approx}{self.tokens} ток., {self.tokens_per_second:.1f} ток/с")
+
+
+class ProviderMetrics:
+    """
+    Накопленные метрики запросов по провайдерам за время работы (пакет или демон).
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, List[CallMetrics]] = {}
+
+    def record(self, metrics: CallMetrics) -> None:
+        self.calls.setdefault(metrics.provider, []).append(metrics)
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        :return: словарь {провайдер: {"ttft": ..., "total": ..., "tokens_per_second": ...}} со сводками describe
+        """
+        return {
+            provider: {
+                "ttft": describe([call.ttft for call in calls if call.ttft is not None]),
+                "total": describe([call.total for call in calls]),
+                "tokens_per_second": describe([call.tokens_per_second for call in calls]),
+            }
+            for provider, calls in sorted(self.calls.items())
+        }
+
+    def summary_lines(self) -> List[str]:
+        lines = []
+        for provider, row in self.summary().items():
+            lines.append(f"{provider}: запросов {row['total']['count']}, "
+                         f"первый токен p50 {row['ttft']['p50']:.2f} сек / p95 {row['ttft']['p95']:.2f} сек, "
+                         f"всего p50 {row['total']['p50']:.2f} сек / p95 {row['total']['p95']:.2f} сек, "
+                         f"p50 {row['tokens_per_second']['p50']:.1f} ток/с")
+        return lines
@@ -0,0 +1,65 @@
+"""
+Протокол демона AI-ревью: JSON-сообщения по одному в строке через Unix-сокет.
+Модуль использует только стандартную библиотеку, чтобы клиент запускался быстро.
+
+Запросы клиента:
+    {"type": "review", "code": "...", "providers": ["gemini"] | null, "strategy": "first" | null, "no_cache": false}
+    {"type": "ping"}, {"type": "shutdown"}
+Ответы демона:
+    {"type": "token", "text": "..."}  - фрагмент ответа по мере генерации
+    {"type": "text", "text": "..."}   - ответ целиком (из кэша, объединенный или по фрагментам)
+    {"type": "error", "message": "..."}
+    {"type": "done", "metrics": ["..."], "errors": {...}, "cached": false, "elapsed": 1.2}
+    {"type": "pong"}
+"""
+import json
+import os
+import socket
+import tempfile
+from typing import Dict, Iterator
+
+ENV_SOCKET = "AI_REVIEW_SOCKET"
+
+
+def default_socket_path() -> str:
+    """
+    Путь к сокету демона: переменная AI_REVIEW_SOCKET или файл в XDG_RUNTIME_DIR (временном каталоге).
+    """
+    if os.getenv(ENV_SOCKET):
+        return os.getenv(ENV_SOCKET)
+    base = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else os.getenv("USERNAME", "user")
+    return os.path.join(base, f"ai_code_review-{user}.sock")
+
+
+def encode(message: Dict) -> bytes:
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def decode(line: bytes) -> Dict:
+    return json.loads(line.decode("utf-8"))
+
+
+def supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def request(socket_path: str, message: Dict, timeout: float = 600.0) -> Iterator[Dict]:
+    """
+    Отправляет запрос демону и отдает ответы по мере поступления.
+    :raises: OSError если демон недоступен
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(encode(message))
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                yield decode(line)
+
+
+def is_running(socket_path: str) -> bool:
+    try:
+        return any(reply.get("type") == "pong" for reply in request(socket_path, {"type": "ping"}, timeout=2))
+    except (OSError, ValueError):
+        return False
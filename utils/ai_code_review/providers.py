@@ -0,0 +1,185 @@
+"""
+Провайдеры AI-ревью с единым асинхронным потоковым интерфейсом.
+SDK импортируются при первом запросе, поэтому заглушки и кэш работают без установленных SDK.
+"""
+import asyncio
+from typing import AsyncIterator, Dict, Optional
+
+# Параметры запроса из config.json, которые влияют на ответ и поэтому входят в ключ кэша
+REQUEST_PARAMS = ("temperature", "max_tokens")
+
+
+class Provider:
+    """
+    Базовый провайдер: имя, модель, параметры запроса и собственный таймаут.
+    Клиент SDK создается один раз и переиспользуется между запросами, пока жив цикл событий,
+    поэтому в пакетном режиме и в демоне соединение и TLS-сессия не устанавливаются заново.
+    """
+    name = "base"
+
+    def __init__(self, cfg: Optional[Dict] = None):
+        cfg = cfg or {}
+        self.api_key = cfg.get("api_key")
+        self.model = cfg.get("model", "")
+        self.params = {key: cfg[key] for key in REQUEST_PARAMS if key in cfg}
+        self.timeout = cfg.get("timeout")
+        self._client = None
+        self._client_loop = None
+
+    def _create_client(self):
+        raise NotImplementedError
+
+    def client(self):
+        """
+        Возвращает клиент SDK, созданный в текущем цикле событий.
+        Асинхронные HTTP-клиенты привязаны к циклу, поэтому при смене цикла клиент пересоздается.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = self._create_client()
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """
+        Закрывает клиент SDK и его пул соединений.
+        """
+        client, self._client, self._client_loop = self._client, None, None
+        if client is not None:
+            await self._close_client(client)
+
+    async def _close_client(self, client) -> None:
+        await client.close()
+
+    def stream(self, text: str, usage: Dict) -> AsyncIterator[str]:
+        """
+        Отправляет промпт модели и отдает ответ по мере генерации.
+        :param text: промпт с подставленным кодом
+        :param usage: словарь, в который провайдер записывает output_tokens, если их сообщает API
+        """
+        raise NotImplementedError
+
+    async def complete(self, text: str) -> str:
+        """
+        Отправляет промпт модели и возвращает ответ целиком.
+        """
+        return "".join([token async for token in self.stream(text, {})]).strip()
+
+
+class OpenAIProvider(Provider):
+    name = "openai"
+
+    def _create_client(self):
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(api_key=self.api_key)
+
+    async def stream(self, text: str, usage: Dict) -> AsyncIterator[str]:
+        response = await self.client().chat.completions.create(
+            model=self.model,
+            temperature=self.params.get("temperature", 0.2),
+            max_tokens=self.params.get("max_tokens", 900),
+            messages=[{"role": "user", "content": text}],
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        async for chunk in response:
+            if chunk.usage:
+                usage["output_tokens"] = chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class GeminiProvider(Provider):
+    name = "gemini"
+
+    def _create_client(self):
+        from google import genai
+        return genai.Client(api_key=self.api_key)
+
+    async def _close_client(self, client) -> None:
+        await client.aio.aclose()
+
+    async def stream(self, text: str, usage: Dict) -> AsyncIterator[str]:
+        from google.genai import types
+        response = await self.client().aio.models.generate_content_stream(
+            model=self.model,
+            contents=[text],
+            config=types.GenerateContentConfig(temperature=self.params.get("temperature"),
+                                               max_output_tokens=self.params.get("max_tokens"))
+        )
+        async for chunk in response:
+            if chunk.usage_metadata and chunk.usage_metadata.candidates_token_count:
+                usage["output_tokens"] = chunk.usage_metadata.candidates_token_count
+            if chunk.text:
+                yield chunk.text
+
+
+class MistralProvider(Provider):
+    name = "mistral"
+
+    def _create_client(self):
+        from mistralai.async_client import MistralAsyncClient
+        return MistralAsyncClient(api_key=self.api_key)
+
+    async def stream(self, text: str, usage: Dict) -> AsyncIterator[str]:
+        from mistralai.models.chat_completion import ChatMessage
+        async for chunk in self.client().chat_stream(
+            model=self.model,
+            messages=[ChatMessage(role="user", content=text)]
+        ):
+            if getattr(chunk, "usage", None):
+                usage["output_tokens"] = chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class StubProvider(Provider):
+    """
+    Локальный провайдер без сети для тестов и отладки: после задержки отдает заданный ответ
+    по словам (или бросает заданное исключение).
+    """
+    name = "stub"
+
+    def __init__(self, cfg: Optional[Dict] = None, name: Optional[str] = None, response: str = "OK",
+                 delay: float = 0.0, error: Optional[Exception] = None, token_delay: float = 0.0):
+        super().__init__(cfg)
+        self.name = name or self.name
+        self.model = self.model or "stub"
+        self.response = response
+        self.delay = delay
+        self.error = error
+        self.token_delay = token_delay
+        self.calls = 0
+
+    def _create_client(self):
+        return None
+
+    async def stream(self, text: str, usage: Dict) -> AsyncIterator[str]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        tokens = self.response.split(" ")
+        for index, token in enumerate(tokens):
+            if index:
+                await asyncio.sleep(self.token_delay)
+            yield token if index == len(tokens) - 1 else token + " "
+        usage["output_tokens"] = len(tokens)
+
+
+PROVIDERS = {
+    "openai": OpenAIProvider,
+    "gemini": GeminiProvider,
+    "mistral": MistralProvider,
+    "stub": StubProvider,
+}
+
+
+def create_provider(name: str, cfg: Optional[Dict] = None) -> Provider:
+    """
+    Создает провайдера по имени из config.json.
+    :raises: ValueError если провайдер неизвестен
+    """
+    if name not in PROVIDERS:
+        raise ValueError(f"Неизвестный провайдер: {name}")
+    return PROVIDERS[name](cfg)
@@ -1,30 +1,89 @@
 """
-Wrapper for PyCharm External Tool to safely pass selected text
-to ai_code_review.py using a temporary file.
+Wrapper for PyCharm External Tool: sends the selected text to the AI review daemon
+and streams the answer back. The daemon is started on first use; if Unix sockets are
+not available, the review runs in this process.
 """
-import sys
 import os
-import tempfile
 import subprocess
+import sys
+import tempfile
+import time
+
+if __package__ in (None, ""):
+    # Запуск как скрипта из PyCharm: модули пакета импортируются от корня проекта
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.ai_code_review.protocol import default_socket_path, is_running, request, supported
+
+DAEMON_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "daemon.py")
+DAEMON_LOG = os.path.join(tempfile.gettempdir(), "ai_code_review_daemon.log")
+DAEMON_START_TIMEOUT = 20
+
+
+def ensure_daemon(socket_path: str) -> bool:
+    """
+    Запускает демон в фоне, если он еще не запущен, и ждет, пока он начнет принимать запросы.
+    """
+    if is_running(socket_path):
+        return True
+    with open(DAEMON_LOG, "a", encoding="utf-8") as log:
+        subprocess.Popen([sys.executable, DAEMON_SCRIPT, "--socket", socket_path],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if is_running(socket_path):
+            return True
+        time.sleep(0.1)
+    print(f"⚠ Демон не запустился, подробности в {DAEMON_LOG}")
+    return False
+
+
+def review_via_daemon(socket_path: str, code: str) -> None:
+    print("\n================ AI CODE REVIEW ================\n")
+    for reply in request(socket_path, {"type": "review", "code": code}):
+        kind = reply.get("type")
+        if kind == "token":
+            print(reply["text"], end="", flush=True)
+        elif kind == "text":
+            print(reply["text"], end="")
+        elif kind == "error":
+            print(f"\n❌ Ошибка: {reply['message']}")
+        elif kind == "done":
+            print()
+            for name, reason in reply.get("errors", {}).items():
+                print(f"\n⚠ {name}: {reason}")
+            if reply.get("cached"):
+                print(f"\n⏱ Время анализа: {round(reply['elapsed'], 2)} сек (из кэша)")
+            for line in reply.get("metrics", []):
+                print(f"\n⏱ {line}")
+
+
+def review_in_process(code: str) -> None:
+    from utils.ai_code_review.ai_code_review import build_engine, load_config, load_prompt, review_selection
+    from utils.ai_code_review.batch import chunk_budget
+
+    cfg = load_config()
+    prompt = load_prompt()
+    engine = build_engine(cfg, prompt)
+    strategy = cfg.get("review", {}).get("strategy", "first")
+    review_selection(engine, code, strategy, chunk_budget(cfg, [p.name for p in engine.providers], prompt), 4)
 
-# 1. Читаем выделенный текст
-selected_text = ""
-if len(sys.argv) > 1:
-    selected_text = sys.argv[1]
-else:
-    print("❌ Ошибка: нет выделенного текста")
-    sys.exit(1)
 
-# 2. Создаём временный файл
-with tempfile.NamedTemporaryFile(mode="w+", suffix=".py", delete=False, encoding="utf-8") as tmp_file:
-    tmp_file.write(selected_text)
-    tmp_path = tmp_file.name
+def main():
+    if len(sys.argv) < 2 or not sys.argv[1].strip():
+        print("❌ Ошибка: нет выделенного текста")
+        sys.exit(1)
+    code = sys.argv[1]
 
-# 3. Путь к твоему ai_code_review.py
-script_path = os.path.join(os.path.dirname(__file__), "ai_code_review.py")
+    socket_path = default_socket_path()
+    if supported() and ensure_daemon(socket_path):
+        try:
+            review_via_daemon(socket_path, code)
+            return
+        except OSError as e:
+            print(f"⚠ Демон недоступен ({e}), ревью выполняется без него")
+    review_in_process(code)
 
-# 4. Запускаем ai_code_review.py с временным файлом как аргумент
-subprocess.run([sys.executable, script_path, tmp_path])
 
-# 5. Опционально: удаляем временный файл
-os.remove(tmp_path)
+if __name__ == "__main__":
+    main()
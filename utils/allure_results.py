@@ -0,0 +1,57 @@
+"""
+Объединение каталогов результатов Allure, например записанных разными воркерами или машинами CI.
+
+    python -m utils.allure_results allure-results allure-results-gw0 allure-results-gw1 --move
+"""
+import argparse
+import os
+import shutil
+
+# Общие для всего запуска файлы: при объединении сохраняется первый найденный
+GLOBAL_FILES = ("environment.properties", "executor.json", "categories.json")
+
+
+def merge_results(sources, target, move=False):
+    """
+    Объединяет каталоги результатов Allure в один за один проход по файлам.
+    Результаты, контейнеры и вложения имеют уникальные имена и просто переносятся;
+    из общих файлов запуска остается первый. Незавершенные файлы *.tmp пропускаются.
+    :param sources: каталоги с результатами
+    :param target: итоговый каталог; может совпадать с одним из исходных
+    :param move: переносить файлы вместо копирования (исходные каталоги становятся пустыми)
+    :return: количество перенесенных файлов
+    """
+    os.makedirs(target, exist_ok=True)
+    target = os.path.abspath(target)
+    transfer = os.replace if move else shutil.copy2
+    merged = 0
+    for source in sources:
+        if os.path.abspath(source) == target or not os.path.isdir(source):
+            continue
+        with os.scandir(source) as entries:
+            for entry in entries:
+                if not entry.is_file() or entry.name.endswith(".tmp"):
+                    continue
+                destination = os.path.join(target, entry.name)
+                if entry.name in GLOBAL_FILES and os.path.exists(destination):
+                    continue
+                transfer(entry.path, destination)
+                merged += 1
+        if move:
+            shutil.rmtree(source, ignore_errors=True)
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Объединение каталогов результатов Allure")
+    parser.add_argument("target", help="Итоговый каталог результатов")
+    parser.add_argument("sources", nargs="+", help="Каталоги с результатами для объединения")
+    parser.add_argument("--move", action="store_true", help="Переносить файлы вместо копирования")
+    args = parser.parse_args()
+
+    merged = merge_results(args.sources, args.target, args.move)
+    print(f"Объединено файлов: {merged} -> {args.target}")
+
+
+if __name__ == "__main__":
+    main()
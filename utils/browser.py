@@ -0,0 +1,97 @@
+import os
+import tempfile
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from utils.driver_provisioning import resolve_chromedriver
+from utils.logger import logger
+from utils.workers import worker_file_name
+
+CHROMEDRIVER_LOG_DIR = "logs"
+
+# Облегченный профиль: без фоновых сетевых запросов, расширений и прочих служб Chrome,
+# не нужных для проверки страниц
+LEAN_ARGUMENTS = (
+    "--disable-background-networking",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+)
+
+# Запросы, которые в облегченном профиле блокируются через CDP: картинки, шрифты и аналитика
+LEAN_BLOCKED_URLS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*backtrace.io*",
+)
+
+
+def build_chrome_options(user_data_dir=None, lean=False):
+    """
+    Собирает опции запуска Chrome для тестов.
+    :param user_data_dir: отдельный каталог профиля Chrome
+    :param lean: облегченный профиль без картинок, фоновых служб и с eager-загрузкой страниц
+    :return: экземпляр Options
+    """
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    # Логи консоли браузера прикладываются к отчету при падении теста
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    if lean:
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        # Управление возвращается после DOMContentLoaded, не дожидаясь картинок и стилей
+        options.page_load_strategy = "eager"
+    return options
+
+
+def block_requests(driver, patterns=LEAN_BLOCKED_URLS):
+    """
+    Блокирует запросы по шаблонам URL через Chrome DevTools Protocol.
+    :param driver: экземпляр веб-драйвера Chrome
+    :param patterns: шаблоны URL с символом *
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def _start_chrome(binary, user_data_dir, lean):
+    service = Service(binary.path,
+                      log_output=os.path.join(CHROMEDRIVER_LOG_DIR, worker_file_name("chromedriver.log")))
+    return webdriver.Chrome(service=service, options=build_chrome_options(user_data_dir, lean))
+
+
+def create_chrome_driver(profile_root=None, lean=False):
+    """
+    Запускает новый экземпляр Chrome.
+    :param profile_root: каталог, в котором создается отдельный профиль для этого браузера;
+                         нужен, чтобы параллельные браузеры не делили один профиль
+    :param lean: запустить браузер в облегченном профиле с блокировкой лишних запросов
+    :return: экземпляр веб-драйвера
+    """
+    user_data_dir = tempfile.mkdtemp(prefix="chrome-", dir=profile_root) if profile_root else None
+    os.makedirs(CHROMEDRIVER_LOG_DIR, exist_ok=True)
+    # Путь к chromedriver определяется один раз на сессию и кэшируется в манифесте
+    try:
+        driver = _start_chrome(resolve_chromedriver(), user_data_dir, lean)
+    except SessionNotCreatedException as e:
+        # Обычно это несовпадение версий chromedriver и Chrome: драйвер ищется заново, попытка повторяется один раз
+        logger.warning("Chrome не запустился с chromedriver из манифеста, драйвер будет найден заново: %s", e.msg)
+        driver = _start_chrome(resolve_chromedriver(refresh=True), user_data_dir, lean)
+    if lean:
+        block_requests(driver)
+    return driver
@@ -0,0 +1,22 @@
+import os
+
+DEFAULT_BASE_URL = "https://www.saucedemo.com/"
+ENV_BASE_URL = "SAUCEDEMO_BASE_URL"
+
+
+def get_base_url():
+    """
+    Возвращает базовый URL тестируемого приложения.
+    По умолчанию это публичный SauceDemo; переопределяется переменной SAUCEDEMO_BASE_URL.
+    :return: URL, заканчивающийся на "/"
+    """
+    url = os.getenv(ENV_BASE_URL) or DEFAULT_BASE_URL
+    return url if url.endswith("/") else url + "/"
+
+
+def set_base_url(url):
+    """
+    Устанавливает базовый URL приложения для текущего процесса и дочерних процессов.
+    :param url: базовый URL
+    """
+    os.environ[ENV_BASE_URL] = url
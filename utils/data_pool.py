@@ -0,0 +1,84 @@
+import threading
+import zlib
+
+DEFAULT_SEED = 0
+DEFAULT_SIZE = 1000
+
+
+class UserDataPool:
+    """
+    Заранее сгенерированный набор данных пользователей для чекаута.
+
+    Записи генерируются Faker один раз, проверяются pydantic одним пакетным вызовом
+    и хранятся кортежами строк. Модели выдаются через model_construct без повторной валидации.
+    Одинаковые seed и размер дают одинаковые данные, поэтому прогон воспроизводится по seed.
+    """
+
+    def __init__(self, seed=DEFAULT_SEED, size=DEFAULT_SIZE, locale="en_US"):
+        """
+        :param seed: seed генератора Faker
+        :param size: количество записей
+        :param locale: локаль Faker
+        """
+        if size < 1:
+            raise ValueError("Размер пула данных должен быть положительным")
+        self.seed = seed
+        self.size = size
+        self.locale = locale
+        self._records = None
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def _generate(self):
+        # Faker и pydantic импортируются только при первой выдаче данных: сборке тестов они не нужны
+        from faker import Faker
+        from pydantic import TypeAdapter
+
+        from pages.models import CheckoutUserData
+
+        fake = Faker(self.locale)
+        fake.seed_instance(self.seed)
+        rows = [(fake.first_name(), fake.last_name(), fake.zipcode()) for _ in range(self.size)]
+        TypeAdapter(list[CheckoutUserData]).validate_python(
+            [{"first_name": first, "last_name": last, "postal_code": code} for first, last, code in rows])
+        return tuple(rows)
+
+    @property
+    def records(self):
+        """
+        Кортеж записей (имя, фамилия, индекс); генерируется при первом обращении.
+        """
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    self._records = self._generate()
+        return self._records
+
+    def get(self, index):
+        """
+        Возвращает запись по индексу (по модулю размера пула).
+        :param index: номер записи
+        :return: CheckoutUserData
+        """
+        from pages.models import CheckoutUserData
+
+        first_name, last_name, postal_code = self.records[index % self.size]
+        return CheckoutUserData.model_construct(first_name=first_name, last_name=last_name, postal_code=postal_code)
+
+    def take(self):
+        """
+        Выдает следующую запись по кругу. Потокобезопасно.
+        :return: CheckoutUserData
+        """
+        with self._lock:
+            index, self._cursor = self._cursor, self._cursor + 1
+        return self.get(index)
+
+    def for_key(self, key):
+        """
+        Возвращает запись, закрепленную за ключом (например, nodeid теста).
+        Выбор не зависит от порядка тестов и распределения по воркерам xdist.
+        :param key: строковый ключ
+        :return: CheckoutUserData
+        """
+        return self.get(zlib.crc32(key.encode("utf-8")))
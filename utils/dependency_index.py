@@ -0,0 +1,389 @@
+"""
+Статический граф зависимостей тестов от классов страниц: какие методы и локаторы pages/
+использует каждый тест (вместе с фикстурами conftest.py). По графу выбираются тесты,
+затронутые изменениями с указанной ревизии git.
+
+    python -m utils.dependency_index --since origin/main
+"""
+import argparse
+import ast
+import copy
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import subprocess
+
+INDEX_FILE = ".dependency_index.json"
+INDEX_VERSION = 2
+PAGES_DIR = "pages"
+TESTS_PATTERN = os.path.join("tests", "test_*.py")
+CONFTEST = "conftest.py"
+BASE_PAGE = "BasePage"
+# Член класса, обозначающий заголовок класса (базы, декораторы) и код модуля вне классов
+HEADER = "<class>"
+MODULE = "<module>"
+
+
+def _digest(node):
+    return hashlib.sha256(ast.dump(node).encode("utf-8")).hexdigest()[:16]
+
+
+def _is_locator(value):
+    # Локатор страницы - кортеж (By.X, "селектор")
+    return (isinstance(value, ast.Tuple) and len(value.elts) == 2 and isinstance(value.elts[0], ast.Attribute)
+            and isinstance(value.elts[0].value, ast.Name) and value.elts[0].value.id == "By")
+
+
+def _self_references(function):
+    return sorted({node.attr for node in ast.walk(function) if isinstance(node, ast.Attribute)
+                   and isinstance(node.value, ast.Name) and node.value.id == "self"})
+
+
+def parse_pages(sources):
+    """
+    Разбирает исходники пакета pages.
+    :param sources: словарь {путь: текст}
+    :return: словарь {класс: {"file", "bases", "members": {имя: хэш}, "locators": {имя: значение},
+             "references": {метод: [атрибуты self]}}}
+    """
+    classes = {}
+    for path, source in sorted(sources.items()):
+        tree = ast.parse(source)
+        module_digest = _digest(ast.Module(body=[node for node in tree.body if not isinstance(node, ast.ClassDef)],
+                                           type_ignores=[]))
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            header = ast.ClassDef(name=node.name, bases=node.bases, keywords=node.keywords, body=[],
+                                  decorator_list=node.decorator_list)
+            page = {
+                "file": path,
+                "bases": [base.id for base in node.bases if isinstance(base, ast.Name)],
+                "members": {HEADER: _digest(header), MODULE: module_digest},
+                "locators": {},
+                "references": {},
+            }
+            for statement in node.body:
+                if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    page["members"][statement.name] = _digest(statement)
+                    page["references"][statement.name] = _self_references(statement)
+                elif isinstance(statement, (ast.Assign, ast.AnnAssign)):
+                    targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+                    for target in targets:
+                        if isinstance(target, ast.Name):
+                            page["members"][target.id] = _digest(statement)
+                            if _is_locator(statement.value):
+                                page["locators"][target.id] = ast.unparse(statement.value)
+            classes[node.name] = page
+    return classes
+
+
+def page_classes(classes):
+    """
+    Имена классов страниц: наследники BasePage (и он сам).
+    """
+    def is_page(name, seen=()):
+        if name == BASE_PAGE:
+            return True
+        return name in classes and name not in seen and any(
+            is_page(base, seen + (name,)) for base in classes[name]["bases"])
+
+    return {name for name in classes if is_page(name)}
+
+
+def ancestors(classes, name):
+    """
+    Класс и его предки среди разобранных классов, начиная с самого класса.
+    """
+    chain = []
+    while name in classes and name not in chain:
+        chain.append(name)
+        bases = [base for base in classes[name]["bases"] if base in classes]
+        name = bases[0] if bases else None
+    return chain
+
+
+def _owner(classes, name, member):
+    # Класс, в котором определен член, с учетом наследования
+    while name in classes:
+        if member in classes[name]["members"]:
+            return name
+        bases = [base for base in classes[name]["bases"] if base in classes]
+        name = bases[0] if bases else None
+    return None
+
+
+def member_closure(classes, name, members):
+    """
+    Замыкание зависимостей: члены класса и все члены, на которые они ссылаются через self.
+    :param classes: результат parse_pages
+    :param name: класс страницы
+    :param members: имена используемых членов
+    :return: множество строк "Класс.член"
+    """
+    result, pending = set(), [(name, member) for member in members]
+    while pending:
+        cls, member = pending.pop()
+        owner = _owner(classes, cls, member)
+        if owner is None or f"{owner}.{member}" in result:
+            continue
+        result.add(f"{owner}.{member}")
+        # Ссылки self внутри метода разрешаются от исходного класса: наследник может их переопределить
+        pending.extend((cls, reference) for reference in classes[owner]["references"].get(member, ()))
+    return result
+
+
+class _UsageVisitor(ast.NodeVisitor):
+    """
+    Собирает из функции теста или фикстуры классы страниц и вызываемые у них методы.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.variables = {}
+        self.used = {}
+
+    def _page_of(self, node):
+        # X(driver), pages.get(X), pages.get("X"), registry(driver).get(X)
+        if isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name) and node.func.id in self.pages:
+                return node.func.id
+            if isinstance(node.func, ast.Attribute) and node.func.attr == "get" and node.args:
+                argument = node.args[0]
+                name = argument.id if isinstance(argument, ast.Name) else getattr(argument, "value", None)
+                if name in self.pages:
+                    return name
+        if isinstance(node, ast.Name):
+            return self.variables.get(node.id)
+        return None
+
+    def visit_Assign(self, node):
+        page = self._page_of(node.value)
+        if page:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.variables[target.id] = page
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id in self.pages:
+            self.used.setdefault(node.id, set()).update({HEADER, MODULE, "__init__"})
+
+    def visit_Attribute(self, node):
+        page = self._page_of(node.value)
+        if page:
+            self.used.setdefault(page, set()).update({HEADER, MODULE, "__init__", node.attr})
+        self.generic_visit(node)
+
+
+def _functions(tree):
+    # Функции модуля и методы классов с именем класса
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield None, node
+        elif isinstance(node, ast.ClassDef):
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    yield node.name, child
+
+
+def _is_test(node):
+    return isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test")
+
+
+def _test_module_digest(tree):
+    # Хэш модуля тестов без самих тестов: импорты, константы, хелперы, фейки и фикстуры модуля и классов.
+    # Изменение любого из них затрагивает все тесты модуля
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            node = copy.copy(node)
+            node.body = [child for child in node.body if not _is_test(child)]
+        elif _is_test(node):
+            continue
+        body.append(node)
+    return _digest(ast.Module(body=body, type_ignores=[]))
+
+
+def _usage(function, pages, classes):
+    visitor = _UsageVisitor(pages)
+    visitor.visit(function)
+    dependencies = set()
+    for page, members in visitor.used.items():
+        dependencies |= member_closure(classes, page, members)
+        # Создание страницы проходит через конструкторы и заголовки всех предков (super().__init__)
+        for ancestor in ancestors(classes, page):
+            dependencies |= member_closure(classes, ancestor, (HEADER, MODULE, "__init__"))
+    return dependencies
+
+
+def _is_fixture(function):
+    return any("fixture" in ast.unparse(decorator) for decorator in function.decorator_list)
+
+
+def build_index(sources):
+    """
+    Строит граф зависимостей.
+    :param sources: словарь {путь: текст} для pages/*.py, tests/test_*.py и conftest.py
+    :return: словарь {"pages": ..., "tests": {nodeid: {"file", "digest", "module", "dependencies"}}}
+    """
+    classes = parse_pages({path: text for path, text in sources.items()
+                           if os.path.dirname(path) == PAGES_DIR})
+    pages = page_classes(classes)
+
+    fixtures = {}
+    if CONFTEST in sources:
+        for _, function in _functions(ast.parse(sources[CONFTEST])):
+            if _is_fixture(function):
+                fixtures[function.name] = ([arg.arg for arg in function.args.args], _usage(function, pages, classes))
+
+    def fixture_dependencies(names, seen):
+        result = set()
+        for name in names:
+            if name in fixtures and name not in seen:
+                seen.add(name)
+                arguments, dependencies = fixtures[name]
+                result |= dependencies | fixture_dependencies(arguments, seen)
+        return result
+
+    tests = {}
+    for path, source in sorted(sources.items()):
+        if not fnmatch.fnmatch(path, TESTS_PATTERN):
+            continue
+        tree = ast.parse(source)
+        module_digest = _test_module_digest(tree)
+        for class_name, function in _functions(tree):
+            if not function.name.startswith("test"):
+                continue
+            nodeid = "::".join(part for part in (path.replace(os.sep, "/"), class_name, function.name) if part)
+            dependencies = _usage(function, pages, classes)
+            dependencies |= fixture_dependencies([arg.arg for arg in function.args.args], set())
+            tests[nodeid] = {"file": path, "digest": _digest(function), "module": module_digest,
+                             "dependencies": sorted(dependencies)}
+    return {"pages": {name: classes[name] for name in sorted(pages)}, "tests": tests}
+
+
+def source_files(root):
+    """
+    Пути исходников, из которых строится граф, относительно корня проекта.
+    """
+    paths = glob.glob(os.path.join(root, PAGES_DIR, "*.py")) + glob.glob(os.path.join(root, TESTS_PATTERN))
+    paths.append(os.path.join(root, CONFTEST))
+    return sorted(os.path.relpath(path, root) for path in paths if os.path.isfile(path))
+
+
+def _hash_sources(sources):
+    return {path: hashlib.sha256(text.encode("utf-8")).hexdigest() for path, text in sources.items()}
+
+
+def load_index(root, cache_path=None):
+    """
+    Возвращает граф для рабочего дерева. Граф кэшируется в INDEX_FILE и перестраивается,
+    только если изменился хотя бы один исходник.
+    :param root: корень проекта
+    :param cache_path: путь к кэшу; по умолчанию INDEX_FILE в корне
+    """
+    cache_path = cache_path or os.path.join(root, INDEX_FILE)
+    sources = {}
+    for path in source_files(root):
+        with open(os.path.join(root, path), encoding="utf-8") as f:
+            sources[path] = f.read()
+    hashes = _hash_sources(sources)
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") == INDEX_VERSION and cached.get("sources") == hashes:
+            return cached["index"]
+    except (OSError, ValueError):
+        pass
+    index = build_index(sources)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": INDEX_VERSION, "sources": hashes, "index": index}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+    return index
+
+
+def _git(root, *args):
+    return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def changed_files(root, rev):
+    """
+    Файлы, измененные с ревизии rev, включая незакоммиченные и новые неотслеживаемые.
+    :raises: subprocess.CalledProcessError если ревизия неизвестна
+    """
+    changed = _git(root, "diff", "--name-only", rev, "--").splitlines()
+    changed += _git(root, "ls-files", "--others", "--exclude-standard").splitlines()
+    return sorted(set(changed))
+
+
+def index_at(root, rev):
+    """
+    Строит граф по исходникам ревизии rev (без кэша).
+    """
+    listed = _git(root, "ls-tree", "-r", "--name-only", rev, "--", PAGES_DIR, "tests", CONFTEST).splitlines()
+    sources = {}
+    for path in listed:
+        if os.path.dirname(path) == PAGES_DIR and path.endswith(".py") or path == CONFTEST or \
+                fnmatch.fnmatch(path, TESTS_PATTERN):
+            sources[path] = _git(root, "show", f"{rev}:{path}")
+    return build_index(sources)
+
+
+def changed_members(old, new):
+    """
+    Члены классов страниц, которые добавлены, удалены или изменены.
+    :return: множество строк "Класс.член"
+    """
+    changed = set()
+    for name in set(old["pages"]) | set(new["pages"]):
+        before = old["pages"].get(name, {}).get("members", {})
+        after = new["pages"].get(name, {}).get("members", {})
+        changed |= {f"{name}.{member}" for member in set(before) | set(after)
+                    if before.get(member) != after.get(member)}
+    return changed
+
+
+def affected_tests(root, rev):
+    """
+    Тесты, затронутые изменениями с ревизии rev.
+    :param root: корень проекта
+    :param rev: ревизия git
+    :return: (множество nodeid затронутых тестов или None, если затронуты все; граф рабочего дерева)
+    """
+    new = load_index(root)
+    files = [path for path in changed_files(root, rev) if path.endswith(".py")]
+    page_files = {page["file"] for page in new["pages"].values()}
+    for path in files:
+        in_tests = fnmatch.fnmatch(path, TESTS_PATTERN)
+        if path == CONFTEST or not in_tests and path not in page_files:
+            # Изменения хуков, утилит или вспомогательных модулей pages без классов страниц
+            # не разбираются по зависимостям: затронуты все тесты
+            return None, new
+    old = index_at(root, rev)
+    members = changed_members(old, new)
+    affected = set()
+    for nodeid, test in new["tests"].items():
+        previous = old["tests"].get(nodeid)
+        if previous is None or previous["digest"] != test["digest"] or previous["module"] != test["module"] \
+                or members.intersection(test["dependencies"]):
+            affected.add(nodeid)
+    return affected, new
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Тесты, затронутые изменениями страниц с ревизии git")
+    parser.add_argument("--since", required=True, help="Ревизия git, с которой считать изменения")
+    parser.add_argument("--root", default=os.getcwd(), help="Корень проекта")
+    args = parser.parse_args()
+
+    affected, index = affected_tests(args.root, args.since)
+    for nodeid in sorted(index["tests"] if affected is None else affected):
+        print(nodeid)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import json
+
+from selenium.webdriver.common.by import By
+
+# Поле записи, в которое попадает текст элемента, а не значение атрибута
+TEXT = "text"
+
+# Скрипт выполняется в браузере за один вызов WebDriver: находит все контейнеры
+# и для каждого собирает тексты и атрибуты дочерних элементов.
+QUERY_ALL_SCRIPT = """
+const [container, fields, visibleOnly] = arguments;
+
+function findAll(root, locator) {
+    const [kind, value] = locator;
+    if (kind === "css") {
+        return Array.from(root.querySelectorAll(value));
+    }
+    const snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        nodes.push(snapshot.snapshotItem(i));
+    }
+    return nodes;
+}
+
+function isVisible(el) {
+    return el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden";
+}
+
+function read(el, attribute) {
+    if (attribute === "text") {
+        return (el.innerText || "").trim();
+    }
+    const value = el.getAttribute(attribute);
+    return value === null ? el[attribute] ?? null : value;
+}
+
+return findAll(document, container)
+    .filter(el => !visibleOnly || isVisible(el))
+    .map(el => {
+        const record = {};
+        for (const [name, locator, attribute] of fields) {
+            const child = locator === null ? el : findAll(el, locator)[0];
+            record[name] = child ? read(child, attribute) : null;
+        }
+        return record;
+    });
+"""
+
+# Скрипт заполняет форму за один вызов WebDriver: ждет, пока все поля станут видимыми и доступными
+# для ввода, и записывает значения через нативный setter свойства value, чтобы изменение увидели
+# фреймворки с контролируемыми полями (React), после чего отправляет события input и change.
+# Возвращает null при успехе или индексы полей, не ставших доступными за таймаут.
+FILL_FORM_SCRIPT = """
+const [fields, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+
+function find(locator) {
+    const [kind, value] = locator;
+    if (kind === "css") {
+        return document.querySelector(value);
+    }
+    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+function ready(el) {
+    return el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden"
+        && !el.disabled && !el.readOnly;
+}
+
+function setValue(el, value) {
+    const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+    el.blur();
+}
+
+function tryFill() {
+    const elements = fields.map(([locator]) => find(locator));
+    if (!elements.every(ready)) {
+        return false;
+    }
+    elements.forEach((el, i) => setValue(el, fields[i][1]));
+    return true;
+}
+
+if (tryFill()) {
+    done(null);
+    return;
+}
+
+let finished = false;
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearInterval(safety);
+    clearTimeout(deadline);
+    done(result);
+}
+
+const observer = new MutationObserver(() => { if (tryFill()) { finish(null); } });
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+const safety = setInterval(() => { if (tryFill()) { finish(null); } }, 100);
+const deadline = setTimeout(() => finish(fields.map((field, i) => i).filter(i => !ready(find(fields[i][0])))),
+                            timeoutMs);
+"""
+
+
+def to_js_locator(locator):
+    """
+    Переводит локатор Selenium в форму, понятную QUERY_ALL_SCRIPT: CSS-селектор или XPath.
+    :param locator: кортеж (By, 'selector')
+    :return: список [вид, селектор]
+    :raises: ValueError для неподдерживаемых стратегий поиска
+    """
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return ["css", value]
+    if by == By.XPATH:
+        return ["xpath", value]
+    if by == By.ID:
+        return ["css", f"[id={json.dumps(value)}]"]
+    if by == By.CLASS_NAME:
+        return ["css", f"[class~={json.dumps(value)}]"]
+    if by == By.NAME:
+        return ["css", f"[name={json.dumps(value)}]"]
+    if by == By.TAG_NAME:
+        return ["css", value]
+    raise ValueError(f"Стратегия поиска '{by}' не поддерживается в пакетных запросах")
+
+
+def to_js_fields(fields):
+    """
+    Переводит описание полей записи в аргумент для QUERY_ALL_SCRIPT.
+    Значение поля — локатор дочернего элемента (берется его текст), пара (локатор, атрибут)
+    или пара (None, атрибут) для атрибута самого контейнера.
+    :param fields: словарь {имя поля: описание}
+    :return: список [имя, локатор, атрибут]
+    """
+    js_fields = []
+    for name, spec in fields.items():
+        if spec[0] is None or isinstance(spec[0], tuple):
+            locator, attribute = spec
+        else:
+            locator, attribute = spec, TEXT
+        js_fields.append([name, to_js_locator(locator) if locator is not None else None, attribute])
+    return js_fields
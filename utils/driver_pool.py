@@ -0,0 +1,188 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from utils.logger import logger
+
+# Сброс состояния вкладки: хранилища чистятся, пока открыт домен приложения.
+_CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+@dataclass
+class PoolStats:
+    """
+    Статистика работы пула браузеров за сессию.
+    """
+    hits: int = 0
+    misses: int = 0
+    recycled_by_uses: int = 0
+    recycled_by_crash: int = 0
+    resets: int = 0
+    reset_time_total: float = 0.0
+    reset_time_max: float = 0.0
+
+    @property
+    def reset_time_avg(self):
+        return self.reset_time_total / self.resets if self.resets else 0.0
+
+    def summary_lines(self):
+        """
+        Возвращает строки для вывода в итоговый отчет pytest.
+        :return: список строк
+        """
+        return [
+            f"hits: {self.hits}, misses: {self.misses}",
+            f"recycled: {self.recycled_by_uses} by max uses, {self.recycled_by_crash} by crash",
+            f"resets: {self.resets}, avg {self.reset_time_avg * 1000:.1f} ms, "
+            f"max {self.reset_time_max * 1000:.1f} ms",
+        ]
+
+
+class _PooledDriver:
+    """
+    Браузер из пула вместе со счетчиком использований.
+    """
+    __slots__ = ("driver", "uses")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Пул "теплых" браузеров. Выдает браузер тесту и между тестами дешево сбрасывает его состояние
+    (cookies, localStorage, about:blank) вместо полного перезапуска Chrome.
+    """
+
+    def __init__(self, factory, size=1, max_uses=50):
+        """
+        Конструктор класса DriverPool.
+        :param factory: функция без аргументов, создающая новый экземпляр веб-драйвера
+        :param size: максимальное число одновременно живых браузеров
+        :param max_uses: число тестов, после которого браузер пересоздается
+        """
+        if size < 1:
+            raise ValueError("Размер пула должен быть не меньше 1")
+        self._factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.stats = PoolStats()
+        self._idle = []
+        self._busy = {}
+        self._live = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def acquire(self):
+        """
+        Выдает браузер из пула. Если свободных нет, создает новый (пока не достигнут размер пула)
+        либо ждет освобождения.
+        :return: экземпляр веб-драйвера
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Пул браузеров уже закрыт")
+                if self._idle:
+                    pooled = self._idle.pop()
+                    self.stats.hits += 1
+                    break
+                if self._live < self.size:
+                    pooled = None
+                    self.stats.misses += 1
+                    # Резервируем место до создания браузера, чтобы не превысить размер пула
+                    self._live += 1
+                    break
+                self._cond.wait()
+
+        if pooled is None:
+            try:
+                pooled = _PooledDriver(self._factory())
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+        with self._cond:
+            pooled.uses += 1
+            self._busy[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def release(self, driver, broken=False):
+        """
+        Возвращает браузер в пул. Браузер пересоздается, если он сломан, исчерпал лимит
+        использований или не пережил сброс состояния.
+        :param driver: экземпляр веб-драйвера, полученный через acquire()
+        :param broken: True, если известно, что браузер больше непригоден
+        """
+        with self._cond:
+            pooled = self._busy.pop(id(driver), None)
+        if pooled is None:
+            raise ValueError("Драйвер не принадлежит этому пулу")
+
+        if broken:
+            self.stats.recycled_by_crash += 1
+            self._quit(pooled.driver)
+        elif pooled.uses >= self.max_uses:
+            self.stats.recycled_by_uses += 1
+            self._quit(pooled.driver)
+        elif not self._reset(pooled.driver):
+            self.stats.recycled_by_crash += 1
+            self._quit(pooled.driver)
+        else:
+            with self._cond:
+                if not self._closed:
+                    self._idle.append(pooled)
+                    self._cond.notify()
+                    return
+            self._quit(pooled.driver)
+            return
+
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    def close(self):
+        """
+        Закрывает все браузеры пула.
+        """
+        with self._cond:
+            self._closed = True
+            pooled_drivers = self._idle + list(self._busy.values())
+            self._idle = []
+            self._busy = {}
+            self._live = 0
+            self._cond.notify_all()
+        for pooled in pooled_drivers:
+            self._quit(pooled.driver)
+
+    def _reset(self, driver):
+        """
+        Сбрасывает состояние браузера между тестами.
+        :param driver: экземпляр веб-драйвера
+        :return: True, если сброс прошел успешно
+        """
+        start = time.monotonic()
+        try:
+            driver.execute_script(_CLEAR_STORAGE_SCRIPT)
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception as e:
+            logger.warning("Браузер не пережил сброс состояния и будет пересоздан: %s", e)
+            return False
+        elapsed = time.monotonic() - start
+        self.stats.resets += 1
+        self.stats.reset_time_total += elapsed
+        self.stats.reset_time_max = max(self.stats.reset_time_max, elapsed)
+        return True
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning("Не удалось корректно закрыть браузер: %s", e)
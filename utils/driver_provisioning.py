@@ -0,0 +1,217 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+
+from utils.logger import logger
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                ".drivers", "chromedriver.json")
+
+# Переменные окружения для настройки провижининга
+ENV_DRIVER_PATH = "CHROMEDRIVER_PATH"
+ENV_OFFLINE = "CHROMEDRIVER_OFFLINE"
+ENV_MANIFEST = "CHROMEDRIVER_MANIFEST"
+ENV_REFRESH = "CHROMEDRIVER_REFRESH"
+
+# Имена и пути браузера, по которым определяется установленная версия Chrome
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+                   "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
+_VERSION = re.compile(r"\d+(?:\.\d+)+")
+
+_resolved = None
+
+
+class DriverProvisioningError(RuntimeError):
+    """
+    Исключение, возникающее, когда не удалось найти или установить chromedriver.
+    """
+
+
+@dataclass(frozen=True)
+class DriverBinary:
+    """
+    Описание найденного бинарника chromedriver и версии Chrome, для которой он был найден.
+    """
+    path: str
+    version: str
+    source: str
+    browser_version: str = "unknown"
+
+
+@contextmanager
+def file_lock(path, timeout=60.0, stale_after=120.0, poll=0.05):
+    """
+    Простая межпроцессная блокировка на lock-файле. Работает одинаково на всех ОС,
+    поэтому подходит для воркеров xdist.
+    :param path: путь к lock-файлу
+    :param timeout: максимальное время ожидания блокировки в секундах
+    :param stale_after: возраст lock-файла, после которого он считается брошенным
+    :param poll: интервал повторных попыток в секундах
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale_after:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise DriverProvisioningError(f"Не удалось получить блокировку {path} за {timeout} сек")
+            time.sleep(poll)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _read_version(path):
+    """
+    Возвращает версию chromedriver по выводу `chromedriver --version`.
+    :param path: путь к бинарнику
+    :return: строка версии или "unknown"
+    """
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    parts = output.split()
+    return parts[1] if len(parts) > 1 else "unknown"
+
+
+def browser_version():
+    """
+    Возвращает версию установленного Chrome по выводу `google-chrome --version`.
+    :return: строка версии или "unknown", если браузер не найден
+    """
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if not path:
+            continue
+        try:
+            output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION.search(output)
+        if match:
+            return match.group(0)
+    return "unknown"
+
+
+def _major(version):
+    major = version.split(".")[0]
+    return major if major.isdigit() else None
+
+
+def _is_outdated(binary, browser):
+    # Chrome обновился после записи манифеста; без известной версии браузера манифест не сбрасывается
+    return _major(browser) is not None and _major(binary.browser_version) != _major(browser)
+
+
+def _load_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            data = json.load(f)
+        binary = DriverBinary(path=data["path"], version=data["version"], source=data["source"],
+                              browser_version=data.get("browser_version", "unknown"))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return binary if _is_executable(binary.path) else None
+
+
+def _save_manifest(manifest_path, binary):
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(asdict(binary), f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def _env_flag(name):
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def _offline():
+    return _env_flag(ENV_OFFLINE)
+
+
+def _locate():
+    """
+    Ищет chromedriver без обращения к манифесту: путь из окружения, PATH, webdriver_manager.
+    :return: DriverBinary
+    """
+    env_path = os.getenv(ENV_DRIVER_PATH)
+    if env_path:
+        if not _is_executable(env_path):
+            raise DriverProvisioningError(f"{ENV_DRIVER_PATH}={env_path} не указывает на исполняемый файл")
+        return DriverBinary(env_path, _read_version(env_path), "env")
+
+    system_path = shutil.which("chromedriver")
+    if system_path:
+        return DriverBinary(system_path, _read_version(system_path), "system")
+
+    if _offline():
+        raise DriverProvisioningError(
+            f"chromedriver не найден: включен офлайн-режим ({ENV_OFFLINE}), "
+            f"укажите путь в {ENV_DRIVER_PATH} или установите chromedriver в PATH")
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    return DriverBinary(path, _read_version(path), "webdriver_manager")
+
+
+def resolve_chromedriver(manifest_path=None, refresh=False):
+    """
+    Возвращает путь к chromedriver, определяя его один раз на процесс.
+    Результат сохраняется в манифест вместе с версией Chrome, поэтому следующие запуски и воркеры xdist
+    не тратят время на поиск и сетевые запросы. После обновления Chrome до новой основной версии
+    манифест считается устаревшим и chromedriver ищется заново.
+    :param manifest_path: путь к файлу манифеста
+    :param refresh: True, чтобы игнорировать манифест и кэш процесса (также CHROMEDRIVER_REFRESH=1)
+    :return: DriverBinary
+    :raises: DriverProvisioningError если chromedriver не найден
+    """
+    global _resolved
+    # CHROMEDRIVER_REFRESH действует на первый поиск в процессе, а не на каждый запуск браузера
+    refresh = refresh or (_resolved is None and _env_flag(ENV_REFRESH))
+    if _resolved is not None and not refresh:
+        return _resolved
+
+    manifest_path = manifest_path or os.getenv(ENV_MANIFEST) or DEFAULT_MANIFEST
+    env_path = os.getenv(ENV_DRIVER_PATH)
+    browser = browser_version()
+
+    def usable(binary):
+        return binary is not None and not (env_path and binary.path != env_path) and not _is_outdated(binary, browser)
+
+    binary = None if refresh else _load_manifest(manifest_path)
+    if not usable(binary):
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with file_lock(f"{manifest_path}.lock"):
+            # Другой воркер мог записать манифест, пока мы ждали блокировку
+            binary = None if refresh else _load_manifest(manifest_path)
+            if not usable(binary):
+                binary = replace(_locate(), browser_version=browser)
+                _save_manifest(manifest_path, binary)
+                logger.info("chromedriver %s (%s): %s", binary.version, binary.source, binary.path)
+
+    _resolved = binary
+    return binary
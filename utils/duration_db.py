@@ -0,0 +1,237 @@
+import os
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+
+from utils.profiler import PAGE
+
+HISTORY_FILE = ".test_history.sqlite"
+# Количество последних прогонов, по которым считается базовая длительность
+DEFAULT_WINDOW = 10
+# Порог регрессии: замедление относительно базовой длительности (0.3 = на 30%)
+DEFAULT_THRESHOLD = 0.3
+# Меньше этого числа прошлых замеров базовая длительность не считается надежной
+MIN_SAMPLES = 3
+# Замедления меньше этого значения в секундах считаются шумом
+MIN_DELTA = 0.05
+# Сколько последних прогонов хранится в базе
+KEEP_RUNS = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, started REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS tests (
+    test INTEGER NOT NULL, run INTEGER NOT NULL, duration REAL NOT NULL, outcome TEXT NOT NULL,
+    PRIMARY KEY (test, run)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS steps (
+    step INTEGER NOT NULL, run INTEGER NOT NULL, test INTEGER NOT NULL, duration REAL NOT NULL,
+    PRIMARY KEY (step, run, test)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class Regression:
+    """
+    Тест или шаг страницы, ставший медленнее своей базовой длительности.
+    """
+    kind: str
+    name: str
+    current: float
+    baseline: float
+
+    @property
+    def slowdown(self):
+        return self.current / self.baseline - 1 if self.baseline else 0.0
+
+    def format(self):
+        return (f"{self.kind} {self.name}: {self.current:.2f} s vs baseline {self.baseline:.2f} s "
+                f"(+{self.slowdown * 100:.0f}%)")
+
+
+def top_level_steps(tree):
+    """
+    Суммарное время шагов страниц верхнего уровня: вызовов из тела теста. Вложенные вызовы BasePage
+    и ожидания уже входят в длительность шага, который их вызвал, и отдельно не учитываются.
+    :param tree: дерево вызовов теста в формате Profiler.finish_test()["tree"]
+    :return: словарь {шаг: секунды}
+    """
+    steps = {}
+    for span in tree:
+        if span["kind"] == PAGE:
+            steps[span["name"]] = steps.get(span["name"], 0.0) + span["duration"]
+    return steps
+
+
+class DurationHistory:
+    """
+    Локальная база длительностей в SQLite: для каждого прогона длительность и исход каждого теста
+    и суммарное время каждого шага страницы верхнего уровня (метода PageObject) в каждом тесте.
+    Имена тестов и шагов хранятся один раз в таблице names, строки замеров ссылаются на них по id.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        """
+        :param path: путь к файлу базы
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def _name_ids(self, names):
+        self._connection.executemany("INSERT OR IGNORE INTO names (name) VALUES (?)", [(name,) for name in names])
+        ids = {}
+        for name in names:
+            ids[name] = self._connection.execute("SELECT id FROM names WHERE name = ?", (name,)).fetchone()[0]
+        return ids
+
+    def record_run(self, tests, steps=None, started=None):
+        """
+        Сохраняет результаты прогона одной транзакцией и удаляет прогоны старше KEEP_RUNS.
+        :param tests: словарь {nodeid: (длительность, исход)}
+        :param steps: словарь {nodeid: {шаг: длительность}}
+        :param started: время начала прогона; по умолчанию текущее
+        :return: id прогона
+        """
+        steps = steps or {}
+        with self._connection:
+            run = self._connection.execute("INSERT INTO runs (started) VALUES (?)",
+                                           (started or time.time(),)).lastrowid
+            ids = self._name_ids(set(tests) | {step for per_test in steps.values() for step in per_test})
+            self._connection.executemany(
+                "INSERT INTO tests (test, run, duration, outcome) VALUES (?, ?, ?, ?)",
+                [(ids[nodeid], run, duration, outcome) for nodeid, (duration, outcome) in tests.items()])
+            self._connection.executemany(
+                "INSERT INTO steps (step, run, test, duration) VALUES (?, ?, ?, ?)",
+                [(ids[step], run, ids[nodeid], duration)
+                 for nodeid, per_test in steps.items() if nodeid in ids for step, duration in per_test.items()])
+            self._prune()
+        return run
+
+    def _prune(self):
+        cutoff = self._connection.execute("SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?",
+                                          (KEEP_RUNS,)).fetchone()
+        if cutoff:
+            for table in ("tests", "steps", "runs"):
+                column = "id" if table == "runs" else "run"
+                self._connection.execute(f"DELETE FROM {table} WHERE {column} <= ?", cutoff)
+
+    def _series(self, query, parameters=()):
+        # Замеры по имени в порядке от новых прогонов к старым
+        series = {}
+        for name, run, duration in self._connection.execute(query, parameters):
+            series.setdefault(name, []).append((run, duration))
+        return series
+
+    def _test_series(self, before_run=None):
+        return self._series(
+            "SELECT names.name, tests.run, tests.duration FROM tests JOIN names ON names.id = tests.test "
+            "WHERE tests.outcome = 'passed' AND tests.run < ? ORDER BY tests.run DESC",
+            (before_run or 2 ** 62,))
+
+    def _step_series(self, before_run=None):
+        # Значение шага в прогоне - среднее время шага на успешный тест: в упавших тестах шаг часто
+        # ждет до таймаута, и такие замеры искажали бы и текущий прогон, и базовую длительность
+        return self._series(
+            "SELECT names.name, steps.run, AVG(steps.duration) FROM steps JOIN names ON names.id = steps.step "
+            "JOIN tests ON tests.test = steps.test AND tests.run = steps.run "
+            "WHERE tests.outcome = 'passed' AND steps.run < ? GROUP BY steps.step, steps.run ORDER BY steps.run DESC",
+            (before_run or 2 ** 62,))
+
+    def durations(self, window=DEFAULT_WINDOW):
+        """
+        Ожидаемые длительности тестов: медиана последних успешных прогонов.
+        :param window: сколько последних замеров учитывать
+        :return: словарь {nodeid: секунды}
+        """
+        return {name: statistics.median(duration for _, duration in values[:window])
+                for name, values in self._test_series().items()}
+
+    def regressions(self, run, window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD):
+        """
+        Тесты и шаги прогона run, ставшие медленнее медианы предыдущих window прогонов больше чем на threshold.
+        :return: список Regression, от наибольшего замедления
+        """
+        flagged = []
+        for kind, series in (("test", self._test_series), ("step", self._step_series)):
+            history = series(run)
+            for name, values in series(run + 1).items():
+                if values[0][0] != run:
+                    continue
+                current = values[0][1]
+                previous = [duration for _, duration in history.get(name, [])[:window]]
+                if len(previous) < MIN_SAMPLES:
+                    continue
+                baseline = statistics.median(previous)
+                if current > baseline * (1 + threshold) and current - baseline >= MIN_DELTA:
+                    flagged.append(Regression(kind, name, current, baseline))
+        return sorted(flagged, key=lambda regression: -regression.slowdown)
+
+
+class DurationHistoryPlugin:
+    """
+    Плагин pytest: записывает длительности и исходы тестов и шагов страниц каждого прогона в DurationHistory
+    и выводит в конце сессии регрессии производительности. При запуске через xdist отчеты воркеров
+    вместе с длительностями шагов (атрибут отчета step_durations) приходят в главный процесс.
+    Регрессии ищутся, только если в прогоне были тесты с браузером (атрибут отчета uses_driver):
+    длительности unit-тестов записываются для балансировки, но их колебания - шум.
+    """
+
+    def __init__(self, path=HISTORY_FILE, window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD):
+        self.path = path
+        self.window = window
+        self.threshold = threshold
+        self.tests = {}
+        self.steps = {}
+        self.flagged = []
+        self.uses_driver = False
+
+    def pytest_runtest_logreport(self, report):
+        duration, outcome = self.tests.get(report.nodeid, (0.0, "passed"))
+        if report.failed:
+            outcome = "failed"
+        elif report.skipped and outcome != "failed":
+            outcome = "skipped"
+        self.tests[report.nodeid] = (duration + report.duration, outcome)
+        if getattr(report, "step_durations", None):
+            self.steps[report.nodeid] = report.step_durations
+        self.uses_driver = self.uses_driver or getattr(report, "uses_driver", False)
+
+    def pytest_sessionfinish(self):
+        if not self.tests:
+            return
+        history = DurationHistory(self.path)
+        try:
+            run = history.record_run(self.tests, self.steps)
+            if self.uses_driver:
+                self.flagged = history.regressions(run, self.window, self.threshold)
+        finally:
+            history.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.flagged:
+            terminalreporter.write_sep("-", f"performance regressions (> {self.threshold * 100:.0f}% vs "
+                                            f"median of last {self.window} runs)")
+            for regression in self.flagged:
+                terminalreporter.write_line(regression.format())
+
+
+def load_history_durations(path=HISTORY_FILE, window=DEFAULT_WINDOW):
+    """
+    Ожидаемые длительности тестов из базы или пустой словарь, если базы еще нет.
+    """
+    if not os.path.exists(path):
+        return {}
+    history = DurationHistory(path)
+    try:
+        return history.durations(window)
+    finally:
+        history.close()
@@ -0,0 +1,186 @@
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+
+from utils.logger import logger
+
+try:
+    from PIL import Image
+    # Отладочные сообщения Pillow о разборе PNG не нужны в логе тестов
+    logging.getLogger("PIL").setLevel(logging.INFO)
+except ImportError:  # без Pillow скриншоты сохраняются в исходном PNG
+    Image = None
+
+# Формат изображения -> (формат Pillow, MIME-тип, расширение)
+IMAGE_FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "webp": ("WEBP", "image/webp", "webp"),
+    "png": ("PNG", "image/png", "png"),
+}
+
+
+class Artifact:
+    """
+    Готовое к записи вложение отчета, уже сохраненное во временный файл.
+    """
+    __slots__ = ("name", "path", "mime_type", "extension")
+
+    def __init__(self, name, path, mime_type, extension):
+        self.name = name
+        self.path = path
+        self.mime_type = mime_type
+        self.extension = extension
+
+
+def encode_screenshot(png, image_format="jpeg", quality=70):
+    """
+    Перекодирует PNG-скриншот в более компактный формат.
+    :param png: байты PNG
+    :param image_format: "jpeg", "webp" или "png"
+    :param quality: качество сжатия от 1 до 100
+    :return: кортеж (байты, MIME-тип, расширение)
+    """
+    pillow_format, mime_type, extension = IMAGE_FORMATS[image_format]
+    if Image is None or image_format == "png":
+        return png, "image/png", "png"
+    with Image.open(io.BytesIO(png)) as image:
+        output = io.BytesIO()
+        image.convert("RGB").save(output, pillow_format, quality=quality)
+    return output.getvalue(), mime_type, extension
+
+
+def _safe(getter, what):
+    try:
+        return getter()
+    except Exception as e:
+        logger.warning("Не удалось получить %s для отчета: %s", what, e)
+        return None
+
+
+class FailureArtifacts:
+    """
+    Сборщик артефактов падения: скриншот, DOM и логи консоли браузера.
+    Снимает артефакты один раз на тест (повторные запросы от страницы и от хука отчета
+    игнорируются), сжимает их и сбрасывает во временные файлы в фоновом потоке,
+    а в конце теста пачкой прикладывает файлы к отчету, не держа их содержимое в памяти.
+    """
+
+    def __init__(self, image_format="jpeg", quality=70, max_workers=2):
+        """
+        Конструктор класса FailureArtifacts.
+        :param image_format: формат скриншотов: "jpeg", "webp" или "png"
+        :param quality: качество сжатия скриншотов от 1 до 100
+        :param max_workers: количество фоновых потоков для сжатия
+        """
+        self.configure(image_format, quality)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="failure-artifacts")
+        self._local = threading.local()
+        self._spool_dir = None
+        self._spool_lock = threading.Lock()
+
+    def configure(self, image_format=None, quality=None):
+        """
+        Меняет формат и качество скриншотов.
+        """
+        if image_format is not None:
+            if image_format not in IMAGE_FORMATS:
+                raise ValueError(f"Неизвестный формат скриншотов: {image_format}")
+            self.image_format = image_format
+        if quality is not None:
+            self.quality = quality
+
+    def _state(self):
+        local = self._local
+        if not hasattr(local, "pending"):
+            local.pending = []
+            local.captured = False
+        return local
+
+    def start_test(self):
+        """
+        Начинает сбор артефактов для нового теста в текущем потоке.
+        """
+        state = self._state()
+        state.pending = []
+        state.captured = False
+
+    def capture(self, driver, reason):
+        """
+        Снимает артефакты падения, если для текущего теста они еще не сняты.
+        Синхронно выполняются только запросы к браузеру; сжатие уходит в фоновый поток.
+        :param driver: экземпляр веб-драйвера
+        :param reason: имя вложения со скриншотом, например "screenshot_on_error"
+        :return: True, если артефакты сняты этим вызовом
+        """
+        state = self._state()
+        if state.captured:
+            return False
+        state.captured = True
+        screenshot = _safe(driver.get_screenshot_as_png, "скриншот")
+        dom = _safe(lambda: driver.page_source, "DOM")
+        console = _safe(lambda: driver.get_log("browser"), "логи консоли")
+        state.pending.append(self._executor.submit(self._encode, reason, screenshot, dom, console))
+        return True
+
+    def _spool(self, name, body, mime_type, extension):
+        with self._spool_lock:
+            if self._spool_dir is None:
+                self._spool_dir = tempfile.mkdtemp(prefix="failure-artifacts-")
+        fd, path = tempfile.mkstemp(suffix=f".{extension}", dir=self._spool_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        return Artifact(name, path, mime_type, extension)
+
+    def _encode(self, reason, screenshot, dom, console):
+        artifacts = []
+        if screenshot:
+            body, mime_type, extension = encode_screenshot(screenshot, self.image_format, self.quality)
+            artifacts.append(self._spool(reason, body, mime_type, extension))
+        if dom:
+            artifacts.append(self._spool("dom_snapshot", dom.encode("utf-8"), "text/html", "html"))
+        if console:
+            artifacts.append(self._spool("browser_console",
+                                         json.dumps(console, indent=2, ensure_ascii=False).encode("utf-8"),
+                                         "application/json", "json"))
+        return artifacts
+
+    def collect(self):
+        """
+        Дожидается сжатия и возвращает артефакты текущего теста, очищая очередь.
+        :return: список Artifact
+        """
+        state = self._state()
+        pending, state.pending = state.pending, []
+        artifacts = []
+        for future in pending:
+            try:
+                artifacts.extend(future.result())
+            except Exception as e:
+                logger.warning("Не удалось подготовить артефакты падения: %s", e)
+        return artifacts
+
+    def flush(self):
+        """
+        Прикладывает все артефакты текущего теста к отчету Allure и удаляет временные файлы.
+        """
+        for artifact in self.collect():
+            try:
+                allure.attach.file(artifact.path, name=artifact.name,
+                                   attachment_type=artifact.mime_type, extension=artifact.extension)
+            finally:
+                os.remove(artifact.path)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        if self._spool_dir is not None:
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+
+failure_artifacts = FailureArtifacts()
@@ -0,0 +1,118 @@
+"""
+Сравнение стандартного и облегченного профиля браузера: время загрузки страниц и память на браузер.
+
+    python -m utils.lean_benchmark --repeats 5 --stand-in
+"""
+import argparse
+import json
+
+from pages.login_page import LoginPage
+from utils.browser import create_chrome_driver
+from utils.config import get_base_url, set_base_url
+from utils.logger import ensure_logger
+from utils.stand_in.server import StandInServer
+from utils.stats import describe
+
+try:
+    import psutil
+except ImportError:  # память процессов браузера измеряется, только если установлен psutil
+    psutil = None
+
+BENCHMARK_PAGES = ("inventory.html", "cart.html")
+
+_NAVIGATION_TIMING_SCRIPT = """
+const entry = performance.getEntriesByType("navigation")[0];
+return entry ? [entry.domContentLoadedEventEnd, entry.loadEventEnd || entry.duration] : null;
+"""
+_JS_HEAP_SCRIPT = "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+
+def _browser_rss(driver):
+    """
+    Возвращает суммарную резидентную память процессов браузера, запущенных chromedriver.
+    :return: байты или None, если psutil недоступен
+    """
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        return sum(process.memory_info().rss for process in root.children(recursive=True))
+    except psutil.Error:
+        return None
+
+
+def measure_profile(lean, repeats):
+    """
+    Запускает браузер в заданном профиле и замеряет загрузку страниц каталога и корзины.
+    :param lean: True для облегченного профиля
+    :param repeats: количество загрузок каждой страницы
+    :return: словарь со сводками по DOMContentLoaded, load, JS heap и RSS
+    """
+    driver = create_chrome_driver(lean=lean)
+    dom_ready, loaded, heap, rss = [], [], [], []
+    try:
+        LoginPage(driver).login("standard_user", LoginPage.DEFAULT_PASSWORD)
+        for _ in range(repeats):
+            for page in BENCHMARK_PAGES:
+                driver.get(get_base_url() + page)
+                timing = driver.execute_script(_NAVIGATION_TIMING_SCRIPT)
+                if timing:
+                    dom_ready.append(timing[0])
+                    loaded.append(timing[1])
+                heap_size = driver.execute_script(_JS_HEAP_SCRIPT)
+                if heap_size:
+                    heap.append(heap_size / 2 ** 20)
+        process_rss = _browser_rss(driver)
+        if process_rss:
+            rss.append(process_rss / 2 ** 20)
+    finally:
+        driver.quit()
+    return {
+        "dom_content_loaded_ms": describe(dom_ready),
+        "load_ms": describe(loaded),
+        "js_heap_mb": describe(heap),
+        "browser_rss_mb": describe(rss),
+    }
+
+
+def format_report(results):
+    """
+    Форматирует результаты в таблицу "метрика / стандартный / облегченный / разница".
+    :param results: словарь {"standard": ..., "lean": ...} из measure_profile
+    :return: строка отчета
+    """
+    lines = [f"{'metric':<28}{'standard':>12}{'lean':>12}{'delta':>10}"]
+    for metric in results["standard"]:
+        for statistic in ("p50", "p95"):
+            standard = results["standard"][metric][statistic]
+            lean = results["lean"][metric][statistic]
+            delta = f"{(lean - standard) / standard * 100:+.0f}%" if standard else "n/a"
+            lines.append(f"{metric + ' ' + statistic:<28}{standard:>12.1f}{lean:>12.1f}{delta:>10}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение стандартного и облегченного профиля браузера")
+    parser.add_argument("--repeats", type=int, default=5, help="Количество загрузок каждой страницы")
+    parser.add_argument("--stand-in", action="store_true", help="Замерять на локальной копии SauceDemo")
+    parser.add_argument("--json", dest="json_path", help="Сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+    ensure_logger()
+
+    server = StandInServer().start() if args.stand_in else None
+    if server:
+        set_base_url(server.url)
+    try:
+        results = {"standard": measure_profile(False, args.repeats), "lean": measure_profile(True, args.repeats)}
+    finally:
+        if server:
+            server.stop()
+
+    print(format_report(results))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
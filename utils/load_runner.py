@@ -0,0 +1,305 @@
+"""
+Нагрузочный режим: N виртуальных пользователей одновременно проходят полный цикл оформления заказа
+через классы страниц на пуле браузеров. Выводит пропускную способность (заказов в минуту)
+и p50/p95/p99 с гистограммой задержек для каждого шага.
+
+    python -m utils.load_runner --users 4 --duration 60 --ramp-up 10 --stand-in
+"""
+import argparse
+import json
+import threading
+import time
+from bisect import bisect_left
+
+from pages.registry import page_registry
+from utils.data_pool import DEFAULT_SEED, UserDataPool
+from utils.logger import logger
+from utils.stats import describe, percentile
+
+# Верхние границы корзин гистограммы задержек шага, мс; последняя корзина - все, что дольше
+HISTOGRAM_BOUNDS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Пауза виртуального пользователя после неудачного запуска браузера, секунды
+ACQUIRE_BACKOFF = 1.0
+
+
+def _login(driver, user_data):
+    login_page = page_registry(driver).get("LoginPage")
+    login_page.login("standard_user", login_page.DEFAULT_PASSWORD)
+
+
+def _add_to_cart(driver, user_data):
+    inventory_page = page_registry(driver).get("InventoryPage")
+    inventory_page.add_item_to_cart_by_index(0)
+    inventory_page.go_to_cart()
+
+
+def _proceed_to_checkout(driver, user_data):
+    page_registry(driver).get("CartPage").proceed_to_checkout()
+
+
+def _fill_user_information(driver, user_data):
+    checkout_one_page = page_registry(driver).get("CheckoutStepOnePage")
+    checkout_one_page.fill_user_information(user_data)
+    checkout_one_page.click_continue()
+
+
+def _finish(driver, user_data):
+    page_registry(driver).get("CheckoutStepTwoPage").click_finish()
+
+
+def _confirm(driver, user_data):
+    message = page_registry(driver).get("CheckoutCompletePage").get_complete_message()
+    if "Thank you for your order!" not in message:
+        raise AssertionError(f"Неверное сообщение о завершении заказа: {message}")
+
+
+# Шаги цикла оформления заказа: (имя, функция(driver, user_data)). Страницы берутся из реестра браузера
+# и импортируются при первом обращении
+CHECKOUT_STEPS = (
+    ("login", _login),
+    ("add_to_cart", _add_to_cart),
+    ("cart", _proceed_to_checkout),
+    ("checkout_info", _fill_user_information),
+    ("finish", _finish),
+    ("complete", _confirm),
+)
+
+
+def browser_lost(error):
+    """
+    Проверяет, что ошибка означает потерю браузера, а не сбой приложения. Таймауты ожиданий,
+    ненайденные элементы и проверки страниц браузер не ломают.
+    :param error: исключение шага
+    :return: True, если браузер нужно пересоздать
+    """
+    from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+    from urllib3.exceptions import HTTPError
+
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, ConnectionError, HTTPError)):
+        return True
+    # Общая ошибка WebDriver без уточнения типа: chrome not reachable, падение вкладки
+    return type(error) is WebDriverException
+
+
+class LatencyHistogram:
+    """
+    Задержки одного шага: сырые замеры для перцентилей и счетчики по корзинам HISTOGRAM_BOUNDS_MS.
+    """
+
+    def __init__(self):
+        self.samples = []
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def record(self, seconds):
+        milliseconds = seconds * 1000
+        self.samples.append(milliseconds)
+        self.buckets[bisect_left(HISTOGRAM_BOUNDS_MS, milliseconds)] += 1
+
+    def to_dict(self):
+        summary = describe(self.samples)
+        summary["p99"] = percentile(self.samples, 99)
+        labels = [f"<={bound}" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}"]
+        summary["histogram_ms"] = dict(zip(labels, self.buckets))
+        return summary
+
+
+class LoadStats:
+    """
+    Потокобезопасные результаты прогона: задержки и ошибки по шагам, число завершенных заказов
+    и неудачных попыток получить браузер из пула.
+    """
+
+    def __init__(self, step_names):
+        self.steps = {name: LatencyHistogram() for name in step_names}
+        self.errors = {name: 0 for name in step_names}
+        self.driver_errors = 0
+        self.checkouts = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record_step(self, name, seconds):
+        with self._lock:
+            self.steps[name].record(seconds)
+
+    def record_error(self, name):
+        with self._lock:
+            self.errors[name] += 1
+
+    def record_driver_error(self):
+        with self._lock:
+            self.driver_errors += 1
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    @property
+    def checkouts_per_minute(self):
+        return self.checkouts / self.elapsed * 60 if self.elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            "checkouts": self.checkouts,
+            "elapsed": self.elapsed,
+            "checkouts_per_minute": self.checkouts_per_minute,
+            "errors": dict(self.errors),
+            "driver_errors": self.driver_errors,
+            "steps": {name: histogram.to_dict() for name, histogram in self.steps.items()},
+        }
+
+
+class LoadRunner:
+    """
+    Запускает виртуальных пользователей. Пользователи стартуют равномерно в течение ramp_up секунд,
+    каждый в своем потоке повторяет цикл оформления заказа на браузере из пула, пока не истечет duration.
+    Перед каждой итерацией браузер возвращается в пул и сбрасывается, как между тестами.
+    Если браузер не удалось получить, ошибка учитывается, а пользователь повторяет попытку после паузы.
+    Сломанным браузер считается только при ошибке WebDriver (например, потерянной сессии): ошибки приложения
+    учитываются как ошибки шага, а браузер возвращается в пул и переиспользуется.
+    """
+
+    def __init__(self, pool, users, duration, ramp_up=0.0, data_pool=None, steps=CHECKOUT_STEPS):
+        """
+        :param pool: пул браузеров (DriverPool) размером не меньше users
+        :param users: количество виртуальных пользователей
+        :param duration: длительность прогона в секундах, включая разгон
+        :param ramp_up: время, за которое стартуют все пользователи, в секундах
+        :param data_pool: источник данных пользователей (UserDataPool)
+        :param steps: шаги цикла: последовательность (имя, функция(driver, user_data))
+        """
+        if users < 1:
+            raise ValueError("Количество пользователей должно быть не меньше 1")
+        self.pool = pool
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.data_pool = data_pool or UserDataPool()
+        self.steps = steps
+        self.stats = LoadStats([name for name, _ in steps])
+
+    def run(self):
+        """
+        Выполняет прогон и возвращает его результаты.
+        :return: LoadStats
+        """
+        start = time.monotonic()
+        deadline = start + self.duration
+        threads = [
+            threading.Thread(target=self._virtual_user, args=(start + self.ramp_up * index / self.users, deadline),
+                             name=f"virtual-user-{index}", daemon=True)
+            for index in range(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.stats.elapsed = time.monotonic() - start
+        return self.stats
+
+    def _virtual_user(self, start_at, deadline):
+        from utils.failure_artifacts import failure_artifacts
+        from utils.profiler import profiler
+        from utils.retry import retry_budget
+
+        time.sleep(max(0.0, start_at - time.monotonic()))
+        while time.monotonic() < deadline:
+            try:
+                driver = self.pool.acquire()
+            except Exception as e:
+                logger.warning("Виртуальный пользователь не получил браузер: %s", e)
+                self.stats.record_driver_error()
+                time.sleep(max(0.0, min(ACQUIRE_BACKOFF, deadline - time.monotonic())))
+                continue
+            # Дерево вызовов, бюджет повторов и артефакты падения не переходят между итерациями, как между тестами
+            profiler.start_test()
+            retry_budget.start_test()
+            failure_artifacts.start_test()
+            broken = False
+            try:
+                self._iteration(driver)
+            except Exception as e:
+                # Ошибка шага уже учтена; исправный браузер не перезапускается внутри замеряемого окна
+                broken = browser_lost(e)
+            finally:
+                failure_artifacts.flush()
+                page_registry(driver).reset()
+                self.pool.release(driver, broken=broken)
+
+    def _iteration(self, driver):
+        user_data = self.data_pool.take()
+        for name, step in self.steps:
+            started = time.perf_counter()
+            try:
+                step(driver, user_data)
+            except Exception:
+                self.stats.record_error(name)
+                raise
+            self.stats.record_step(name, time.perf_counter() - started)
+        self.stats.record_checkout()
+
+
+def format_report(stats):
+    """
+    Форматирует результаты в таблицу по шагам.
+    :param stats: LoadStats
+    :return: строка отчета
+    """
+    lines = [
+        f"checkouts: {stats.checkouts} за {stats.elapsed:.1f} сек, {stats.checkouts_per_minute:.1f} в минуту",
+        f"driver errors: {stats.driver_errors}",
+        f"{'step':<16}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for name, histogram in stats.steps.items():
+        row = histogram.to_dict()
+        lines.append(f"{name:<16}{row['count']:>8}{stats.errors[name]:>8}"
+                     f"{row['p50']:>10.0f}{row['p95']:>10.0f}{row['p99']:>10.0f}")
+    for name, histogram in stats.steps.items():
+        buckets = ", ".join(f"{label}: {count}" for label, count in histogram.to_dict()["histogram_ms"].items()
+                            if count)
+        lines.append(f"{name} histogram: {buckets or 'нет замеров'}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон оформления заказа через классы страниц")
+    parser.add_argument("--users", type=int, default=2, help="Количество виртуальных пользователей")
+    parser.add_argument("--duration", type=float, default=60, help="Длительность прогона в секундах")
+    parser.add_argument("--ramp-up", type=float, default=0, help="Время разгона до всех пользователей в секундах")
+    parser.add_argument("--max-uses", type=int, default=50, help="Итераций до пересоздания браузера")
+    parser.add_argument("--lean", action="store_true", help="Облегченный профиль браузера")
+    parser.add_argument("--stand-in", action="store_true", help="Нагружать локальную копию SauceDemo")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed тестовых данных")
+    parser.add_argument("--json", dest="json_path", help="Сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+
+    from utils.browser import create_chrome_driver
+    from utils.config import set_base_url
+    from utils.driver_pool import DriverPool
+    from utils.failure_artifacts import failure_artifacts
+    from utils.logger import ensure_logger
+    from utils.reporting import MINIMAL, set_step_mode
+    from utils.stand_in.server import StandInServer
+
+    ensure_logger()
+    # Вне pytest шаги Allure никуда не пишутся, поэтому не создаются вовсе
+    set_step_mode(MINIMAL)
+    server = StandInServer().start() if args.stand_in else None
+    if server:
+        set_base_url(server.url)
+    pool = DriverPool(lambda: create_chrome_driver(lean=args.lean), size=args.users, max_uses=args.max_uses)
+    try:
+        stats = LoadRunner(pool, args.users, args.duration, args.ramp_up, UserDataPool(seed=args.seed)).run()
+    finally:
+        pool.close()
+        failure_artifacts.shutdown()
+        if server:
+            server.stop()
+
+    print(format_report(stats))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
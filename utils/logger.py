@@ -1,37 +1,125 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import reprlib
 import sys
 from functools import wraps
-import json
 
-def setup_logger():
+from utils.profiler import PAGE, format_locator, profiler
+from utils.workers import worker_file_name
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Ограничения на размер результата в логе: большие списки веб-элементов и длинные строки обрезаются
+_result_repr = reprlib.Repr()
+_result_repr.maxstring = 200
+_result_repr.maxother = 200
+_result_repr.maxlist = 5
+_result_repr.maxtuple = 5
+_result_repr.maxdict = 5
+
+
+class TruncatedRepr:
+    """
+    Ленивое сокращенное представление объекта для сообщений лога.
+    repr вычисляется только при форматировании записи, то есть в фоновом потоке
+    и только если запись действительно пишется.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return _result_repr.repr(self.value)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler, который не форматирует запись в вызывающем потоке:
+    сообщение собирается уже в потоке QueueListener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_listener = None
+_configured = False
+
+
+def setup_logger(level=None, use_queue=None):
     """
-    Настраивает и возвращает логгер.
+    Настраивает и возвращает логгер. При параллельном запуске каждый воркер пишет в свой файл.
+    По умолчанию записи передаются через очередь фоновому потоку, который и пишет их в файл
+    и stdout, поэтому вызовы логгера не блокируются на вводе-выводе.
+    :param level: уровень логирования; по умолчанию из переменной LOG_LEVEL или DEBUG
+    :param use_queue: писать логи через фоновый поток; по умолчанию из LOG_QUEUE (включено)
     """
-    logging.basicConfig(level=logging.DEBUG,
-                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                        handlers=[logging.FileHandler("test_run.log"),
-                                  logging.StreamHandler(sys.stdout)])
+    global _listener, _configured
+    _configured = True
+    level = level or os.getenv("LOG_LEVEL", "DEBUG").upper()
+    if use_queue is None:
+        use_queue = os.getenv("LOG_QUEUE", "1").lower() not in ("0", "false", "no")
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(worker_file_name("test_run.log")),
+                logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        root.addHandler(DeferredQueueHandler(log_queue))
+    else:
+        for handler in handlers:
+            root.addHandler(handler)
     return logging.getLogger(__name__)
 
-logger = setup_logger()
+
+def ensure_logger():
+    """
+    Настраивает логирование при первом обращении. Импорт модуля не открывает test_run.log
+    и не трогает корневой логгер, поэтому юнит-тесты и утилиты не платят за настройку.
+    """
+    if not _configured:
+        setup_logger()
+
+
+logger = logging.getLogger(__name__)
+
 
 def log_decorator(func):
     """
     Декоратор для логирования вызова функции, ее аргументов и результата.
+    Если уровень DEBUG выключен, сообщения о входе и выходе не формируются вовсе.
+    Длительность каждого вызова записывается в профиль теста (utils.profiler).
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
+        if not _configured:
+            setup_logger()
         # args[0] is 'self'
-        class_name = args[0].__class__.__name__
-        method_name = func.__name__
-        
-        logger.debug(f"Entering: {class_name}.{method_name}")
-        
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Entering: %s.%s", args[0].__class__.__name__, func.__name__)
+
+        locator = format_locator(args[1]) if len(args) > 1 else None
         try:
-            result = func(*args, **kwargs)
-            logger.debug(f"Exiting: {class_name}.{method_name}, Result: {result}")
-            return result
+            with profiler.span(f"{args[0].__class__.__name__}.{func.__name__}", PAGE, locator):
+                result = func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"Exception in {class_name}.{method_name}: {e}", exc_info=True)
+            logger.error("Exception in %s.%s: %s", args[0].__class__.__name__, func.__name__, e, exc_info=True)
             raise
+        if debug:
+            logger.debug("Exiting: %s.%s, Result: %s", args[0].__class__.__name__, func.__name__,
+                         TruncatedRepr(result))
+        return result
     return wrapper
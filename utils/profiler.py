@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.stats import Reservoir
+
+# Виды интервалов: вызов метода страницы и ожидание элемента/условия.
+# Собственное время метода страницы (без вложенных вызовов) уходит на работу с драйвером.
+PAGE = "page"
+WAIT = "wait"
+# Повтор взаимодействия после временного сбоя: пауза и повторный поиск элемента (время, потерянное на сбой)
+RETRY = "retry"
+
+
+class Span:
+    """
+    Интервал выполнения: вызов метода страницы или ожидание. Вложенные вызовы образуют дерево.
+    """
+    __slots__ = ("name", "kind", "locator", "duration", "children")
+
+    def __init__(self, name, kind, locator=None):
+        self.name = name
+        self.kind = kind
+        self.locator = locator
+        self.duration = 0.0
+        self.children = []
+
+    @property
+    def self_time(self):
+        return max(0.0, self.duration - sum(child.duration for child in self.children))
+
+    def to_dict(self):
+        data = {"name": self.name, "kind": self.kind, "duration": round(self.duration, 6)}
+        if self.locator:
+            data["locator"] = self.locator
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+def format_locator(locator):
+    """
+    Возвращает строковое представление локатора или None, если аргумент не похож на локатор.
+    :param locator: кортеж (By, 'selector') или любой другой объект
+    :return: строка вида "id=checkout" или None
+    """
+    if isinstance(locator, tuple) and len(locator) == 2 and isinstance(locator[0], str):
+        return f"{locator[0]}={locator[1]}"
+    return None
+
+
+class ProfileSummary:
+    """
+    Агрегированные длительности по методам и локаторам. Для каждого ключа хранится выборка
+    ограниченного размера (Reservoir), поэтому память не растет с длиной сессии, а сводки разных тестов
+    и воркеров можно объединять: количество и сумма остаются точными, перцентили - оценкой по выборке.
+    """
+
+    def __init__(self):
+        self.methods = {}
+        self.locators = {}
+        self.retries = {}
+        self.wait_self = 0.0
+        self.driver_self = 0.0
+
+    @staticmethod
+    def _add(groups, key, value):
+        reservoir = groups.get(key)
+        if reservoir is None:
+            reservoir = groups[key] = Reservoir()
+        reservoir.add(value)
+
+    def add_tree(self, roots):
+        stack = list(roots)
+        while stack:
+            span = stack.pop()
+            stack.extend(span.children)
+            if span.kind == RETRY:
+                # Повторы считаются отдельно и не искажают длительности методов и ожиданий локатора
+                self._add(self.retries, span.locator or span.name, span.duration)
+                self.wait_self += span.self_time
+                continue
+            self._add(self.methods, span.name, span.duration)
+            if span.locator:
+                self._add(self.locators, span.locator, span.duration)
+            if span.kind == WAIT:
+                self.wait_self += span.self_time
+            else:
+                self.driver_self += span.self_time
+
+    def merge(self, data):
+        """
+        Добавляет сводку, выгруженную через to_dict(samples=True).
+        :param data: словарь в формате to_dict()
+        """
+        for target, source in ((self.methods, data.get("methods", {})), (self.locators, data.get("locators", {})),
+                               (self.retries, data.get("retries", {}))):
+            for key, value in source.items():
+                target.setdefault(key, Reservoir()).merge(value)
+        self.wait_self += data.get("self_time", {}).get(WAIT, 0.0)
+        self.driver_self += data.get("self_time", {}).get("driver", 0.0)
+
+    def to_dict(self, samples=False):
+        def section(groups):
+            return {key: reservoir.to_dict(samples) for key, reservoir in sorted(groups.items())}
+
+        return {
+            "methods": section(self.methods),
+            "locators": section(self.locators),
+            "retries": section(self.retries),
+            "self_time": {WAIT: self.wait_self, "driver": self.driver_self},
+        }
+
+    @property
+    def retry_count(self):
+        return sum(reservoir.count for reservoir in self.retries.values())
+
+    @property
+    def retry_time(self):
+        return sum(reservoir.total for reservoir in self.retries.values())
+
+
+class Profiler:
+    """
+    Профилировщик вызовов страниц. Строит дерево вызовов для каждого теста
+    (отдельно в каждом потоке) и накапливает сводку за сессию. Вызовы замеряются только между
+    start_test() и finish_test(): вне теста с браузером (например, в unit-тестах) span ничего не записывает.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.session = ProfileSummary()
+
+    def _state(self):
+        local = self._local
+        if not hasattr(local, "stack"):
+            local.stack = []
+            local.roots = []
+            local.active = False
+        return local
+
+    @contextmanager
+    def span(self, name, kind=PAGE, locator=None):
+        """
+        Замеряет длительность блока и встраивает его в дерево вызовов текущего потока.
+        :param name: имя интервала, например "LoginPage.login"
+        :param kind: вид интервала: PAGE или WAIT
+        :param locator: строковое представление локатора, если есть
+        """
+        state = self._state()
+        if not state.active:
+            yield None
+            return
+        span = Span(name, kind, locator)
+        (state.stack[-1].children if state.stack else state.roots).append(span)
+        state.stack.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+            state.stack.pop()
+
+    def start_test(self):
+        """
+        Начинает новое дерево вызовов для текущего потока.
+        """
+        state = self._state()
+        state.stack = []
+        state.roots = []
+        state.active = True
+
+    def finish_test(self):
+        """
+        Завершает дерево вызовов текущего потока и добавляет его в сводку сессии.
+        :return: словарь с деревом вызовов и сводкой по тесту
+        """
+        state = self._state()
+        roots, state.roots, state.stack = state.roots, [], []
+        state.active = False
+        summary = ProfileSummary()
+        summary.add_tree(roots)
+        with self._lock:
+            self.session.add_tree(roots)
+        return {"tree": [span.to_dict() for span in roots], "summary": summary.to_dict()}
+
+    def export_json(self, path):
+        """
+        Сохраняет сводку сессии (вместе с сырыми замерами) в JSON.
+        :param path: путь к файлу
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            data = self.session.to_dict(samples=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+profiler = Profiler()
@@ -0,0 +1,45 @@
+from functools import wraps
+
+import allure
+
+# Режимы детализации шагов в отчете Allure
+FULL = "full"
+MINIMAL = "minimal"
+STEP_MODES = (FULL, MINIMAL)
+
+_step_mode = FULL
+
+
+def set_step_mode(mode):
+    """
+    Задает режим детализации шагов отчета.
+    :param mode: FULL - все шаги, MINIMAL - без низкоуровневых шагов BasePage
+    :raises: ValueError если режим неизвестен
+    """
+    global _step_mode
+    if mode not in STEP_MODES:
+        raise ValueError(f"Неизвестный режим шагов Allure: {mode}")
+    _step_mode = mode
+
+
+def get_step_mode():
+    return _step_mode
+
+
+def detail_step(title):
+    """
+    Декоратор низкоуровневого шага (поиск элемента, клик, ввод текста). В режиме MINIMAL
+    шаг не создается, и время и ошибки вызова относятся к родительскому шагу страницы.
+    Режим проверяется при каждом вызове, поэтому его можно задать после импорта страниц.
+    :param title: заголовок шага, как в allure.step
+    """
+    def decorator(func):
+        stepped = allure.step(title)(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _step_mode == MINIMAL:
+                return func(*args, **kwargs)
+            return stepped(*args, **kwargs)
+        return wrapper
+    return decorator
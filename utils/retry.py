@@ -0,0 +1,85 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from utils.profiler import RETRY, format_locator, profiler
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Параметры повторов взаимодействия с элементом: число попыток, ограниченная экспоненциальная
+    пауза между ними и общий бюджет времени на повторы за тест.
+    """
+    attempts: int = 3
+    initial_delay: float = 0.05
+    max_delay: float = 0.5
+    backoff: float = 2.0
+    budget: float = 5.0
+
+
+class RetryBudget:
+    """
+    Остаток бюджета времени на повторы для текущего теста (отдельно в каждом потоке).
+    Когда бюджет исчерпан, сбой взаимодействия сразу завершает тест.
+    """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._local = threading.local()
+
+    def start_test(self):
+        self._local.remaining = self.policy.budget
+
+    def remaining(self):
+        return getattr(self._local, "remaining", self.policy.budget)
+
+    def spend(self, seconds):
+        self._local.remaining = max(0.0, self.remaining() - seconds)
+
+
+retry_policy = RetryPolicy()
+retry_budget = RetryBudget(retry_policy)
+
+
+def configure(attempts=None, budget=None):
+    """
+    Переопределяет число попыток и бюджет на тест (из опций pytest).
+    """
+    if attempts is not None:
+        retry_policy.attempts = max(1, attempts)
+    if budget is not None:
+        retry_policy.budget = max(0.0, budget)
+
+
+def with_retry(resolve, action, retryable, locator=None, invalidate=None):
+    """
+    Выполняет действие над элементом, повторяя только само действие при временных сбоях.
+    Перед повтором выдерживается пауза, элемент находится заново с таймаутом не больше
+    остатка бюджета, а время повтора попадает в профиль как интервал вида RETRY.
+    :param resolve: функция (максимальный таймаут или None) -> веб-элемент
+    :param action: функция от веб-элемента
+    :param retryable: кортеж исключений, после которых действие повторяется
+    :param locator: локатор элемента для профиля
+    :param invalidate: вызывается перед повторным поиском, например чтобы сбросить кэш элемента
+    :return: результат действия
+    :raises: последнее исключение, если попытки или бюджет исчерпаны
+    """
+    element = resolve(None)
+    delay = retry_policy.initial_delay
+    for attempt in range(1, retry_policy.attempts + 1):
+        try:
+            return action(element)
+        except retryable:
+            if attempt == retry_policy.attempts or retry_budget.remaining() <= delay:
+                raise
+        start = time.monotonic()
+        try:
+            with profiler.span("retry", RETRY, format_locator(locator)):
+                time.sleep(delay)
+                if invalidate:
+                    invalidate()
+                element = resolve(retry_budget.remaining())
+        finally:
+            retry_budget.spend(time.monotonic() - start)
+        delay = min(delay * retry_policy.backoff, retry_policy.max_delay)
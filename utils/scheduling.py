@@ -0,0 +1,37 @@
+import heapq
+
+DEFAULT_DURATION = 1.0
+
+
+def expected_duration(item, durations, default=DEFAULT_DURATION):
+    """
+    Возвращает ожидаемую длительность теста: из маркера expected_duration,
+    из истории прогонов или значение по умолчанию.
+    :param item: тест pytest
+    :param durations: словарь {nodeid: секунды}
+    :param default: длительность для тестов без истории
+    :return: ожидаемая длительность в секундах
+    """
+    marker = item.get_closest_marker("expected_duration")
+    if marker is not None and marker.args:
+        return float(marker.args[0])
+    return durations.get(item.nodeid, default)
+
+
+def balance_groups(durations, workers):
+    """
+    Распределяет тесты по группам так, чтобы суммарная длительность групп была примерно равной
+    (жадный алгоритм LPT: самый долгий тест уходит в наименее загруженную группу).
+    :param durations: словарь {nodeid: ожидаемые секунды}
+    :param workers: количество групп (воркеров)
+    :return: словарь {nodeid: номер группы}
+    """
+    workers = max(1, workers)
+    loads = [(0.0, index) for index in range(workers)]
+    groups = {}
+    for nodeid, seconds in sorted(durations.items(), key=lambda pair: (-pair[1], pair[0])):
+        load, index = heapq.heappop(loads)
+        groups[nodeid] = index
+        heapq.heappush(loads, (load + seconds, index))
+    return groups
+
@@ -0,0 +1,116 @@
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+# Содержимое localStorage в виде списка пар [ключ, значение]
+_READ_LOCAL_STORAGE_SCRIPT = "return Object.entries(window.localStorage);"
+_WRITE_LOCAL_STORAGE_SCRIPT = """
+const items = arguments[0];
+for (const [key, value] of items) { window.localStorage.setItem(key, value); }
+"""
+
+# Поля cookie, которые принимает CDP Network.setCookie
+_CDP_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+@dataclass(frozen=True)
+class AuthSession:
+    """
+    Снимок аутентифицированной сессии: cookies и содержимое localStorage.
+    """
+    cookies: tuple
+    local_storage: tuple
+
+    def is_expired(self, now=None):
+        """
+        Проверяет, истек ли срок хотя бы одной cookie сессии (поле expiry, секунды Unix).
+        :param now: текущее время; по умолчанию time.time()
+        :return: True, если сессию нельзя переносить в браузер
+        """
+        now = time.time() if now is None else now
+        return any("expiry" in cookie and cookie["expiry"] <= now for cookie in self.cookies)
+
+
+class SessionCache:
+    """
+    Потокобезопасный кэш аутентифицированных сессий по паре (базовый URL, имя пользователя).
+    Сессии с истекшими cookies не выдаются и удаляются из кэша.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url, username):
+        with self._lock:
+            session = self._sessions.get((base_url, username))
+            if session is not None and session.is_expired():
+                del self._sessions[(base_url, username)]
+                return None
+            return session
+
+    def put(self, base_url, username, session):
+        with self._lock:
+            self._sessions[(base_url, username)] = session
+
+    def discard(self, base_url, username):
+        with self._lock:
+            self._sessions.pop((base_url, username), None)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+
+session_cache = SessionCache()
+
+
+def capture_session(driver):
+    """
+    Снимает cookies и localStorage текущей вкладки.
+    :param driver: экземпляр веб-драйвера
+    :return: AuthSession
+    """
+    cookies = tuple(dict(cookie) for cookie in driver.get_cookies())
+    local_storage = tuple(tuple(item) for item in driver.execute_script(_READ_LOCAL_STORAGE_SCRIPT))
+    return AuthSession(cookies=cookies, local_storage=local_storage)
+
+
+def _set_cookies_via_cdp(driver, base_url, cookies):
+    """
+    Устанавливает cookies через Chrome DevTools Protocol без предварительного открытия страницы.
+    :return: True, если браузер поддерживает CDP
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    for cookie in cookies:
+        params = {field: cookie[field] for field in _CDP_COOKIE_FIELDS if field in cookie}
+        if "expiry" in cookie:
+            params["expires"] = cookie["expiry"]
+        params.setdefault("url", base_url)
+        driver.execute_cdp_cmd("Network.setCookie", params)
+    return True
+
+
+def inject_session(driver, base_url, landing_url, session):
+    """
+    Переносит сохраненную сессию в браузер и открывает целевую страницу.
+    :param driver: экземпляр веб-драйвера
+    :param base_url: URL приложения, к домену которого относится сессия
+    :param landing_url: страница, которую нужно открыть после входа
+    :param session: AuthSession
+    :return: True, если браузер остался на целевой странице; False, если приложение не приняло сессию
+             и перенаправило на страницу входа
+    """
+    if not _set_cookies_via_cdp(driver, base_url, session.cookies):
+        # Без CDP cookies можно поставить только для открытого домена
+        driver.get(base_url)
+        for cookie in session.cookies:
+            driver.add_cookie(cookie)
+    driver.get(landing_url)
+    if session.local_storage:
+        # Приложение читает localStorage при отрисовке, поэтому после записи страница перезагружается
+        driver.execute_script(_WRITE_LOCAL_STORAGE_SCRIPT, [list(item) for item in session.local_storage])
+        driver.refresh()
+    return urlsplit(driver.current_url).path == urlsplit(landing_url).path
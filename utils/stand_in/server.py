@@ -0,0 +1,93 @@
+import argparse
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.logger import ensure_logger, logger
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+class _StandInRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Обработчик статики локальной копии SauceDemo. Пишет запросы в общий лог вместо stderr.
+    """
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug("stand-in: " + format, *args)
+
+
+class StandInServer:
+    """
+    Локальный HTTP-сервер с копией страниц SauceDemo (вход, каталог, корзина, оформление заказа)
+    с теми же id и классами, что используют локаторы. Позволяет запускать тесты без сети.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        """
+        Конструктор класса StandInServer.
+        :param host: адрес, на котором слушает сервер
+        :param port: порт; 0 — выбрать свободный порт автоматически
+        """
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        """
+        Запускает сервер в фоновом потоке.
+        :return: self
+        """
+        handler = functools.partial(_StandInRequestHandler, directory=STATIC_DIR)
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-in-server", daemon=True)
+        self._thread.start()
+        logger.info("Локальная копия SauceDemo запущена: %s", self.url)
+        return self
+
+    def stop(self):
+        """
+        Останавливает сервер.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальная копия SauceDemo для тестов без сети")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    ensure_logger()
+
+    server = StandInServer(args.host, args.port).start()
+    print(f"SauceDemo stand-in: {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+// Локальная замена SauceDemo: те же id, классы и тексты, на которые опираются локаторы в pages/.
+(function () {
+    "use strict";
+
+    const PASSWORD = "secret_sauce";
+    const USERS = ["standard_user", "problem_user", "performance_glitch_user", "error_user", "visual_user"];
+    const LOCKED_OUT_USERS = ["locked_out_user"];
+    const CART_KEY = "cart-contents";
+    const SESSION_COOKIE = "session-username";
+
+    const PRODUCTS = [
+        {id: 4, name: "Sauce Labs Backpack", price: 29.99},
+        {id: 0, name: "Sauce Labs Bike Light", price: 9.99},
+        {id: 1, name: "Sauce Labs Bolt T-Shirt", price: 15.99},
+        {id: 5, name: "Sauce Labs Fleece Jacket", price: 49.99},
+        {id: 2, name: "Sauce Labs Onesie", price: 7.99},
+        {id: 3, name: "Test.allTheThings() T-Shirt (Red)", price: 15.99},
+    ];
+
+    function el(tag, attributes, children) {
+        const node = document.createElement(tag);
+        for (const [name, value] of Object.entries(attributes || {})) {
+            if (name === "text") {
+                node.textContent = value;
+            } else {
+                node.setAttribute(name, value);
+            }
+        }
+        for (const child of children || []) {
+            node.appendChild(child);
+        }
+        return node;
+    }
+
+    function slug(name) {
+        return name.toLowerCase().replace(/[^a-z0-9]+/g, "-").replace(/^-|-$/g, "");
+    }
+
+    function currentUser() {
+        const match = document.cookie.match(new RegExp("(?:^|; )" + SESSION_COOKIE + "=([^;]*)"));
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function readCart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function writeCart(ids) {
+        if (ids.length) {
+            window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            window.localStorage.removeItem(CART_KEY);
+        }
+    }
+
+    function go(page) {
+        window.location.href = page;
+    }
+
+    function errorBox(message) {
+        return el("div", {class: "error-message-container error"}, [
+            el("h3", {"data-test": "error", text: message}),
+        ]);
+    }
+
+    function header(title) {
+        const badge = el("span", {class: "shopping_cart_badge", "data-test": "shopping-cart-badge"});
+        const link = el("a", {class: "shopping_cart_link", "data-test": "shopping-cart-link", href: "cart.html"});
+        const container = el("div", {id: "shopping_cart_container", class: "shopping_cart_container"}, [link]);
+        const update = () => {
+            const count = readCart().length;
+            badge.textContent = String(count);
+            if (count && !badge.parentNode) {
+                link.appendChild(badge);
+            } else if (!count && badge.parentNode) {
+                link.removeChild(badge);
+            }
+        };
+        update();
+        return {
+            node: el("div", {class: "header_container", id: "header_container"}, [
+                el("div", {class: "app_logo", text: "Swag Labs"}),
+                container,
+                el("div", {class: "header_secondary_container"}, [
+                    el("span", {class: "title", "data-test": "title", text: title}),
+                ]),
+            ]),
+            update: update,
+        };
+    }
+
+    function cartItem(product) {
+        return el("div", {class: "cart_item", "data-test": "inventory-item"}, [
+            el("div", {class: "cart_quantity", text: "1"}),
+            el("div", {class: "cart_item_label"}, [
+                el("div", {class: "inventory_item_name", "data-test": "inventory-item-name", text: product.name}),
+                el("div", {class: "inventory_item_price", text: "$" + product.price.toFixed(2)}),
+            ]),
+        ]);
+    }
+
+    function cartProducts() {
+        const ids = readCart();
+        return PRODUCTS.filter(product => ids.includes(product.id));
+    }
+
+    function renderLogin(root) {
+        const params = new URLSearchParams(window.location.search);
+        const username = el("input", {id: "user-name", name: "user-name", "data-test": "username", type: "text",
+            placeholder: "Username", class: "input_error form_input"});
+        const password = el("input", {id: "password", name: "password", "data-test": "password", type: "password",
+            placeholder: "Password", class: "input_error form_input"});
+        const errors = el("div", {class: "error-message-container"});
+        const form = el("form", {}, [
+            username,
+            password,
+            errors,
+            el("input", {id: "login-button", name: "login-button", "data-test": "login-button", type: "submit",
+                class: "submit-button btn_action", value: "Login"}),
+        ]);
+        if (params.get("error")) {
+            errors.appendChild(errorBox(params.get("error")));
+        }
+        form.addEventListener("submit", event => {
+            event.preventDefault();
+            errors.textContent = "";
+            const user = username.value;
+            let message = null;
+            if (!user) {
+                message = "Epic sadface: Username is required";
+            } else if (!password.value) {
+                message = "Epic sadface: Password is required";
+            } else if (LOCKED_OUT_USERS.includes(user) && password.value === PASSWORD) {
+                message = "Epic sadface: Sorry, this user has been locked out.";
+            } else if (!USERS.includes(user) || password.value !== PASSWORD) {
+                message = "Epic sadface: Username and password do not match any user in this service";
+            }
+            if (message) {
+                errors.appendChild(errorBox(message));
+                return;
+            }
+            document.cookie = SESSION_COOKIE + "=" + encodeURIComponent(user) + "; path=/";
+            go("inventory.html");
+        });
+        root.appendChild(el("div", {class: "login_wrapper"}, [el("div", {class: "login_logo", text: "Swag Labs"}), form]));
+    }
+
+    function renderInventory(root) {
+        const top = header("Products");
+        const list = el("div", {class: "inventory_list", "data-test": "inventory-list"});
+        for (const product of PRODUCTS) {
+            const button = el("button", {class: "btn btn_small btn_inventory"});
+            const sync = () => {
+                const inCart = readCart().includes(product.id);
+                button.textContent = inCart ? "Remove" : "Add to cart";
+                const id = (inCart ? "remove-" : "add-to-cart-") + slug(product.name);
+                button.id = id;
+                button.name = id;
+                button.setAttribute("data-test", id);
+                button.className = "btn btn_small btn_inventory " + (inCart ? "btn_secondary" : "btn_primary");
+            };
+            button.addEventListener("click", () => {
+                const ids = readCart();
+                writeCart(ids.includes(product.id) ? ids.filter(id => id !== product.id) : ids.concat([product.id]));
+                sync();
+                top.update();
+            });
+            sync();
+            list.appendChild(el("div", {class: "inventory_item", "data-test": "inventory-item"}, [
+                el("div", {class: "inventory_item_description"}, [
+                    el("div", {class: "inventory_item_name", "data-test": "inventory-item-name", text: product.name}),
+                    el("div", {class: "pricebar"}, [
+                        el("div", {class: "inventory_item_price", "data-test": "inventory-item-price",
+                            text: "$" + product.price.toFixed(2)}),
+                        button,
+                    ]),
+                ]),
+            ]));
+        }
+        root.appendChild(top.node);
+        root.appendChild(el("div", {id: "inventory_container", class: "inventory_container"}, [list]));
+    }
+
+    function renderCart(root) {
+        root.appendChild(header("Your Cart").node);
+        const list = el("div", {class: "cart_list", "data-test": "cart-list"});
+        for (const product of cartProducts()) {
+            list.appendChild(cartItem(product));
+        }
+        const checkout = el("button", {id: "checkout", name: "checkout", "data-test": "checkout",
+            class: "btn btn_action btn_medium checkout_button", text: "Checkout"});
+        checkout.addEventListener("click", () => go("checkout-step-one.html"));
+        const back = el("button", {id: "continue-shopping", name: "continue-shopping", class: "btn btn_secondary",
+            text: "Continue Shopping"});
+        back.addEventListener("click", () => go("inventory.html"));
+        root.appendChild(el("div", {id: "cart_contents_container"}, [list, back, checkout]));
+    }
+
+    function renderCheckoutStepOne(root) {
+        root.appendChild(header("Checkout: Your Information").node);
+        const fields = [
+            ["first-name", "firstName", "First Name"],
+            ["last-name", "lastName", "Last Name"],
+            ["postal-code", "postalCode", "Zip/Postal Code"],
+        ].map(([id, test, placeholder]) => el("input", {id: id, name: id, "data-test": test, type: "text",
+            placeholder: placeholder, class: "input_error form_input"}));
+        const errors = el("div", {class: "error-message-container"});
+        const form = el("form", {}, fields.concat([
+            errors,
+            el("input", {id: "continue", name: "continue", "data-test": "continue", type: "submit",
+                class: "submit-button btn btn_primary cart_button btn_action", value: "Continue"}),
+        ]));
+        form.addEventListener("submit", event => {
+            event.preventDefault();
+            errors.textContent = "";
+            const missing = fields.find(field => !field.value);
+            if (missing) {
+                errors.appendChild(errorBox("Error: " + missing.placeholder + " is required"));
+                return;
+            }
+            go("checkout-step-two.html");
+        });
+        root.appendChild(el("div", {id: "checkout_info_container", class: "checkout_info_container"}, [form]));
+    }
+
+    function renderCheckoutStepTwo(root) {
+        root.appendChild(header("Checkout: Overview").node);
+        const products = cartProducts();
+        const list = el("div", {class: "cart_list", "data-test": "cart-list"}, products.map(cartItem));
+        const subtotal = products.reduce((sum, product) => sum + product.price, 0);
+        const finish = el("button", {id: "finish", name: "finish", "data-test": "finish",
+            class: "btn btn_action btn_medium cart_button", text: "Finish"});
+        finish.addEventListener("click", () => {
+            writeCart([]);
+            go("checkout-complete.html");
+        });
+        root.appendChild(el("div", {id: "checkout_summary_container"}, [
+            list,
+            el("div", {class: "summary_subtotal_label", "data-test": "subtotal-label",
+                text: "Item total: $" + subtotal.toFixed(2)}),
+            finish,
+        ]));
+    }
+
+    function renderCheckoutComplete(root) {
+        root.appendChild(header("Checkout: Complete!").node);
+        const back = el("button", {id: "back-to-products", name: "back-to-products", class: "btn btn_primary btn_small",
+            text: "Back Home"});
+        back.addEventListener("click", () => go("inventory.html"));
+        root.appendChild(el("div", {id: "checkout_complete_container", class: "checkout_complete_container"}, [
+            el("h2", {class: "complete-header", "data-test": "complete-header", text: "Thank you for your order!"}),
+            el("div", {class: "complete-text", "data-test": "complete-text",
+                text: "Your order has been dispatched, and will arrive just as fast as the pony can get there!"}),
+            back,
+        ]));
+    }
+
+    const PAGES = {
+        "login": renderLogin,
+        "inventory": renderInventory,
+        "cart": renderCart,
+        "checkout-step-one": renderCheckoutStepOne,
+        "checkout-step-two": renderCheckoutStepTwo,
+        "checkout-complete": renderCheckoutComplete,
+    };
+
+    const page = document.body.getAttribute("data-page");
+    if (page !== "login" && !currentUser()) {
+        const path = window.location.pathname.split("/").pop();
+        go("index.html?error=" + encodeURIComponent(
+            "Epic sadface: You can only access '/" + path + "' when you are logged in."));
+        return;
+    }
+    PAGES[page](document.getElementById("root"));
+})();
@@ -0,0 +1,96 @@
+import math
+import random
+
+# Сколько замеров хранит резервуар; остальные учитываются только в count, total и max
+RESERVOIR_SIZE = 1000
+
+
+def percentile(values, q):
+    """
+    Возвращает процентиль по методу ближайшего ранга.
+    :param values: последовательность чисел
+    :param q: процентиль от 0 до 100
+    :return: значение процентиля или 0.0 для пустой последовательности
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def describe(values):
+    """
+    Возвращает сводку по выборке длительностей.
+    :param values: последовательность чисел
+    :return: словарь с ключами count, total, p50, p95, max
+    """
+    return {
+        "count": len(values),
+        "total": sum(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": max(values, default=0.0),
+    }
+
+
+class Reservoir:
+    """
+    Выборка длительностей ограниченного размера (reservoir sampling): count, total и max считаются
+    по всем замерам точно, а перцентили - по равномерной случайной выборке из не более чем size замеров.
+    """
+    __slots__ = ("size", "count", "total", "max", "samples")
+
+    def __init__(self, size=RESERVOIR_SIZE):
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if len(self.samples) < self.size:
+            self.samples.append(value)
+        else:
+            index = random.randrange(self.count)
+            if index < self.size:
+                self.samples[index] = value
+
+    def merge(self, data):
+        """
+        Добавляет выборку, выгруженную через to_dict(samples=True).
+        Замеры обеих выборок попадают в общую пропорционально числу замеров, которое они представляют.
+        :param data: словарь с ключами count, total, max и samples
+        """
+        samples = data.get("samples", [])
+        count = data.get("count", len(samples))
+        if not count:
+            return
+        if len(self.samples) + len(samples) <= self.size:
+            self.samples.extend(samples)
+        else:
+            own = round(self.size * self.count / (self.count + count))
+            self.samples = (random.sample(self.samples, min(own, len(self.samples)))
+                            + random.sample(samples, min(self.size - own, len(samples))))
+        self.count += count
+        self.total += data.get("total", sum(samples))
+        self.max = max(self.max, data.get("max", max(samples, default=0.0)))
+
+    def to_dict(self, samples=False):
+        """
+        :param samples: добавить сохраненные замеры, чтобы выборку можно было объединить с другой
+        :return: словарь с ключами count, total, p50, p95, max (и samples)
+        """
+        result = {
+            "count": self.count,
+            "total": self.total,
+            "p50": percentile(self.samples, 50),
+            "p95": percentile(self.samples, 95),
+            "max": self.max,
+        }
+        if samples:
+            result["samples"] = list(self.samples)
+        return result
@@ -0,0 +1,252 @@
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.dom_query import FILL_FORM_SCRIPT, to_js_locator
+from utils.profiler import WAIT, format_locator, profiler
+# Профиль таймаутов и статистика ожиданий не зависят от Selenium и живут в отдельном модуле,
+# чтобы conftest мог загружать их без импорта браузерного стека
+from utils.wait_stats import TimeoutProfile, WaitStats, timeout_profile, wait_stats
+
+# Условия ожидания для MutationObserver-скрипта
+VISIBLE = "visible"
+CLICKABLE = "clickable"
+
+# Скрипт ждет элемент внутри страницы и завершается в момент, когда DOM начинает
+# удовлетворять условию, без опроса со стороны Python. Интервал нужен как подстраховка
+# для изменений видимости, не сопровождающихся мутациями DOM (например, анимаций).
+OBSERVE_SCRIPT = """
+const [locator, condition, timeoutMs, action] = arguments;
+const done = arguments[arguments.length - 1];
+
+function first() {
+    const [kind, value] = locator;
+    if (kind === "css") {
+        return document.querySelector(value);
+    }
+    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+function match() {
+    const el = first();
+    if (!el || el.getClientRects().length === 0 || getComputedStyle(el).visibility === "hidden") {
+        return null;
+    }
+    if (condition === "clickable" && el.disabled) {
+        return null;
+    }
+    return el;
+}
+
+// С action === "click" найденный элемент кликается в том же вызове, а вместо него возвращается true
+function complete(el) {
+    if (el && action === "click") {
+        el.click();
+        return true;
+    }
+    return el;
+}
+
+const found = match();
+if (found) {
+    done(complete(found));
+    return;
+}
+
+let finished = false;
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearInterval(safety);
+    clearTimeout(deadline);
+    done(complete(result));
+}
+
+const observer = new MutationObserver(() => {
+    const el = match();
+    if (el) {
+        finish(el);
+    }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+const safety = setInterval(() => { const el = match(); if (el) { finish(el); } }, 100);
+const deadline = setTimeout(() => finish(null), timeoutMs);
+"""
+
+# Таймаут асинхронных скриптов WebDriver по умолчанию
+_DEFAULT_SCRIPT_TIMEOUT = 30
+
+
+class AdaptiveWait(WebDriverWait):
+    """
+    WebDriverWait с адаптивным опросом: первые проверки идут часто, затем интервал
+    растет до poll_frequency. Элемент, появившийся сразу после проверки, обнаруживается
+    за десятки миллисекунд, а не за полсекунды.
+    """
+
+    def __init__(self, driver, timeout, poll_frequency=0.5, ignored_exceptions=None,
+                 initial_poll=0.02, backoff=1.6):
+        """
+        Конструктор класса AdaptiveWait.
+        :param driver: экземпляр веб-драйвера
+        :param timeout: время ожидания в секундах
+        :param poll_frequency: максимальный интервал опроса в секундах
+        :param ignored_exceptions: исключения, которые игнорируются во время ожидания
+        :param initial_poll: первый интервал опроса в секундах
+        :param backoff: множитель интервала после каждой неудачной проверки
+        """
+        super().__init__(driver, timeout, poll_frequency, ignored_exceptions)
+        self._initial_poll = min(initial_poll, self._poll)
+        self._backoff = backoff
+
+    def until(self, method, message=""):
+        screen = None
+        stacktrace = None
+        poll = self._initial_poll
+
+        end_time = time.monotonic() + self._timeout
+        while True:
+            try:
+                value = method(self._driver)
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(poll, remaining))
+            poll = min(poll * self._backoff, self._poll)
+        raise TimeoutException(message, screen, stacktrace)
+
+
+class WaitEngine:
+    """
+    Ожидания для страниц: одно ожидание внутри браузера через MutationObserver
+    для отдельных элементов и AdaptiveWait для остальных условий. Все ожидания
+    попадают в статистику WaitStats.
+    """
+
+    def __init__(self, driver, owner, stats=wait_stats):
+        """
+        Конструктор класса WaitEngine.
+        :param driver: экземпляр веб-драйвера
+        :param owner: имя страницы, от имени которой выполняются ожидания
+        :param stats: накопитель статистики ожиданий
+        """
+        self.driver = driver
+        self.owner = owner
+        self.stats = stats
+
+    def visible(self, locator, timeout):
+        """
+        Ожидает, пока элемент станет видимым.
+        :return: найденный веб-элемент
+        :raises: TimeoutException если элемент не появился
+        """
+        return self._observe(locator, VISIBLE, timeout, EC.visibility_of_element_located(locator))
+
+    def clickable(self, locator, timeout):
+        """
+        Ожидает, пока элемент станет видимым и доступным для клика.
+        :return: найденный веб-элемент
+        :raises: TimeoutException если элемент не стал кликабельным
+        """
+        return self._observe(locator, CLICKABLE, timeout, EC.element_to_be_clickable(locator))
+
+    def click(self, locator, timeout):
+        """
+        Ожидает, пока элемент станет видимым, и кликает по нему через JavaScript в том же вызове.
+        :raises: TimeoutException если элемент не появился
+        """
+        def click_visible(driver):
+            element = EC.visibility_of_element_located(locator)(driver)
+            if element:
+                driver.execute_script("arguments[0].click();", element)
+            return bool(element)
+
+        return self._observe(locator, VISIBLE, timeout, click_visible, action="click")
+
+    def fill(self, fields, timeout):
+        """
+        Заполняет поля формы одним вызовом: скрипт ждет, пока все поля станут доступны для ввода,
+        и записывает значения через нативный setter с событиями input и change.
+        :param fields: словарь {локатор: значение}
+        :param timeout: время ожидания полей в секундах
+        :return: список локаторов, которые не стали доступны за таймаут (пустой при успехе)
+        :raises: JavascriptException если скрипт не выполнился; ValueError для неподдерживаемых локаторов
+        """
+        locators = list(fields)
+        args = [[to_js_locator(locator), str(value)] for locator, value in fields.items()]
+        start = time.monotonic()
+        with self._script_timeout(timeout), \
+                profiler.span("wait fill", WAIT, format_locator(locators[0]) if len(locators) == 1 else None):
+            missing = self.driver.execute_async_script(FILL_FORM_SCRIPT, args, int(timeout * 1000)) or []
+        for index, locator in enumerate(locators):
+            self._record(locator, start, index not in missing)
+        return [locators[index] for index in missing]
+
+    def until(self, condition, timeout, locator=None, message=""):
+        """
+        Ожидает произвольное условие с адаптивным опросом.
+        :param condition: функция от драйвера, например из expected_conditions
+        :param timeout: время ожидания в секундах
+        :param locator: локатор для статистики; без него ожидание не учитывается
+        :param message: сообщение для TimeoutException
+        :return: результат условия
+        """
+        return self._poll(condition, timeout, locator, message, time.monotonic())
+
+    def _poll(self, condition, timeout, locator, message, start):
+        # Длительность в статистике считается от start, то есть вместе с уже потраченным временем ожидания
+        try:
+            with profiler.span("wait until", WAIT, format_locator(locator)):
+                result = AdaptiveWait(self.driver, timeout).until(condition, message)
+        except TimeoutException:
+            self._record(locator, start, False)
+            raise
+        self._record(locator, start, True)
+        return result
+
+    @contextmanager
+    def _script_timeout(self, timeout):
+        """
+        Поднимает таймаут асинхронных скриптов драйвера, если ожидание длиннее него,
+        и возвращает значение по умолчанию после вызова.
+        """
+        raised = timeout + 1 > _DEFAULT_SCRIPT_TIMEOUT
+        if raised:
+            self.driver.set_script_timeout(timeout + 5)
+        try:
+            yield
+        finally:
+            if raised:
+                self.driver.set_script_timeout(_DEFAULT_SCRIPT_TIMEOUT)
+
+    def _observe(self, locator, condition, timeout, fallback, action=None):
+        start = time.monotonic()
+        try:
+            with self._script_timeout(timeout), profiler.span(f"wait {condition}", WAIT, format_locator(locator)):
+                args = (to_js_locator(locator), condition, int(timeout * 1000)) + ((action,) if action else ())
+                element = self.driver.execute_async_script(OBSERVE_SCRIPT, *args)
+        except (JavascriptException, ValueError):
+            # Скрипт не смог выполниться на странице или локатор не переводится в CSS/XPath:
+            # опрос получает только остаток таймаута, а ожидание учитывается целиком
+            remaining = max(0.0, timeout - (time.monotonic() - start))
+            return self._poll(fallback, remaining, locator, "", start)
+        if element is None:
+            self._record(locator, start, False)
+            raise TimeoutException(f"Элемент {locator} не стал {condition} за {timeout} сек")
+        self._record(locator, start, True)
+        return element
+
+    def _record(self, locator, start, success):
+        if locator is not None:
+            self.stats.record(self.owner, locator, time.monotonic() - start, success)
@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+
+from utils.stats import describe
+
+
+def locator_key(owner, locator):
+    """
+    Возвращает ключ локатора для статистики и профилей таймаутов.
+    :param owner: имя класса страницы
+    :param locator: кортеж (By, 'selector')
+    :return: строка вида "InventoryPage class name=title"
+    """
+    return f"{owner} {locator[0]}={locator[1]}"
+
+
+class TimeoutProfile:
+    """
+    Переопределения таймаутов, загружаемые из JSON без правки кода страниц.
+    Формат: {"InventoryPage": 5, "InventoryPage class name=title": 2} — таймаут
+    для всей страницы или для конкретного локатора на странице.
+    """
+
+    def __init__(self, overrides=None):
+        self.overrides = dict(overrides or {})
+
+    def load(self, path):
+        """
+        Загружает переопределения таймаутов из JSON-файла.
+        :param path: путь к файлу профиля
+        """
+        with open(path, encoding="utf-8") as f:
+            self.overrides = {key: float(value) for key, value in json.load(f).items()}
+
+    def resolve(self, owner, locator, page_default, locator_defaults):
+        """
+        Выбирает таймаут: профиль для локатора, профиль для страницы,
+        таймаут локатора из кода страницы, таймаут страницы из кода.
+        :param owner: имя класса страницы
+        :param locator: кортеж (By, 'selector') или None
+        :param page_default: DEFAULT_TIMEOUT страницы
+        :param locator_defaults: словарь TIMEOUTS страницы
+        :return: таймаут в секундах
+        """
+        if locator is not None:
+            key = locator_key(owner, locator)
+            if key in self.overrides:
+                return self.overrides[key]
+        if owner in self.overrides:
+            return self.overrides[owner]
+        if locator is not None and locator in locator_defaults:
+            return locator_defaults[locator]
+        return page_default
+
+
+timeout_profile = TimeoutProfile()
+
+
+class WaitStats:
+    """
+    Фактическое время появления элементов по локаторам. По этим данным подбираются таймауты.
+    """
+
+    def __init__(self):
+        self._samples = {}
+        self._timeouts = {}
+        self._lock = threading.Lock()
+
+    def record(self, owner, locator, elapsed, success):
+        """
+        Сохраняет результат одного ожидания.
+        :param owner: имя класса страницы
+        :param locator: кортеж (By, 'selector')
+        :param elapsed: длительность ожидания в секундах
+        :param success: False, если ожидание завершилось таймаутом
+        """
+        key = locator_key(owner, locator)
+        with self._lock:
+            if success:
+                self._samples.setdefault(key, []).append(elapsed)
+            else:
+                self._timeouts[key] = self._timeouts.get(key, 0) + 1
+
+    def merge(self, data):
+        """
+        Добавляет данные, выгруженные другим процессом через to_dict().
+        :param data: словарь в формате to_dict()
+        """
+        with self._lock:
+            for key, samples in data.get("samples", {}).items():
+                self._samples.setdefault(key, []).extend(samples)
+            for key, count in data.get("timeouts", {}).items():
+                self._timeouts[key] = self._timeouts.get(key, 0) + count
+
+    def to_dict(self):
+        with self._lock:
+            return {"samples": {key: list(values) for key, values in self._samples.items()},
+                    "timeouts": dict(self._timeouts)}
+
+    def summary(self):
+        """
+        Возвращает сводку по локаторам, отсортированную по убыванию p95.
+        :return: список словарей с ключами locator, count, timeouts, p50, p95, max
+        """
+        with self._lock:
+            keys = set(self._samples) | set(self._timeouts)
+            rows = [dict(describe(self._samples.get(key, [])), locator=key, timeouts=self._timeouts.get(key, 0))
+                    for key in keys]
+        return sorted(rows, key=lambda row: (-row["p95"], row["locator"]))
+
+    def export_json(self, path):
+        """
+        Сохраняет сырые замеры и сводку в JSON.
+        :param path: путь к файлу
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(dict(self.to_dict(), summary=self.summary()), f, indent=2, ensure_ascii=False)
+
+
+wait_stats = WaitStats()
@@ -0,0 +1,33 @@
+import os
+
+MASTER_WORKER_ID = "master"
+
+
+def get_worker_id():
+    """
+    Возвращает идентификатор текущего воркера pytest-xdist ("gw0", "gw1", ...)
+    или "master", если тесты запущены без распараллеливания.
+    :return: идентификатор воркера
+    """
+    return os.getenv("PYTEST_XDIST_WORKER", MASTER_WORKER_ID)
+
+
+def is_xdist_worker():
+    """
+    Проверяет, выполняется ли код внутри воркера pytest-xdist.
+    :return: True, если текущий процесс является воркером
+    """
+    return get_worker_id() != MASTER_WORKER_ID
+
+
+def worker_file_name(file_name):
+    """
+    Добавляет идентификатор воркера к имени файла, чтобы процессы не писали в один файл.
+    Без распараллеливания имя файла не меняется.
+    :param file_name: исходное имя файла, например "test_run.log"
+    :return: имя файла для текущего воркера, например "test_run_gw0.log"
+    """
+    if not is_xdist_worker():
+        return file_name
+    root, ext = os.path.splitext(file_name)
+    return f"{root}_{get_worker_id()}{ext}"